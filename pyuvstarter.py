@@ -38,7 +38,7 @@ Key Actions:
 6. Performs a pre-flight check for unused imports using `ruff` and warns the user.
 7. Discovers packages imported in project source code:
    - **For `.py` files:** Uses `pipreqs` to find imports.
-   - **For `.ipynb` files:** Uses a primary strategy of converting notebooks to Python scripts and analyzing with `pipreqs`. If that fails (e.g., `jupyter` not found), it uses a robust fallback strategy of parsing notebook JSON with `ast` (for imports) and `regex` (for `!pip install` commands).
+   - **For `.ipynb` files:** Uses a primary strategy of parsing notebook JSON in-process with `ast` (for imports) and `regex` (for `!pip install` commands). Notebooks with cells that cannot be parsed as Python (e.g., `%%bash` cells) additionally have their valid code cells exported to a temporary script and analyzed with `pipreqs`. No `jupyter` installation is required.
 8. Intelligently manages dependencies:
    - Reads existing dependencies from `pyproject.toml`.
    - Processes `requirements.txt` (if present) and all discovered dependencies based on the `--dependency-migration` mode:
@@ -253,10 +253,15 @@ import tempfile
 import shlex
 import traceback
 import functools
+import builtins
 import atexit
+import concurrent.futures
+import threading
+import hashlib
+import fnmatch
 
 from pathlib import Path
-from typing import Set, Tuple, List, Union, Dict, Optional, Any, Type
+from typing import Set, Tuple, List, Union, Dict, Optional, Any, Type, Iterator, Sequence, Iterable
 
 # --- Python Version Check ---
 # Check Python version early to provide helpful error messages for incompatible versions
@@ -412,6 +417,20 @@ except ImportError:
     GitWildMatchPattern = None
     PathSpec = None
 
+# ijson is optional: when installed, large notebooks are stream-parsed so that embedded
+# outputs (e.g. base64 images) are never materialized. json.load is used otherwise.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# orjson is optional: when installed, notebook JSON is parsed and the JSON log is written with it
+# (several times faster than json).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 try:
     import typer
@@ -552,23 +571,23 @@ def safe_print(message: str = "", **kwargs) -> None:
 # project, merged from community standards (e.g., GitHub's templates).
 # The dictionary keys are used as section comments when CREATING a new
 # .gitignore file from scratch, ensuring a well-organized result.
-GITIGNORE_DEFAULT_ENTRIES: Dict[str, List[str]] = {
-    "Python Virtual Environments": ["/.venv/", "/venv/", "/ENV/", "/env/"],
-    "Python Cache, Compiled Files & Extensions": ["__pycache__/", "*.py[cod]", "*$py.class", "*.so", "*.pyd"],
-    "Distribution & Packaging": [".Python", "build/", "develop-eggs/", "dist/", "downloads/", "eggs/", ".eggs/", "lib/", "lib64/", "parts/", "sdist/", "var/", "wheels/", "pip-wheel-metadata/", "share/python-wheels/", "*.egg-info/", ".installed.cfg", "*.egg", "MANIFEST"],
-    "Test, Coverage & Linter Reports": ["htmlcov/", ".tox/", ".nox/", ".coverage", ".coverage.*", "nosetests.xml", "coverage.xml", ".cache", ".pytest_cache/", ".hypothesis/", "*.cover", "*.log"],
-    "Installer Logs": ["pip-log.txt", "pip-delete-this-directory.txt"],
-    "IDE & Editor Specific": [".vscode/*", "!/.vscode/settings.json", "!/.vscode/tasks.json", "!/.vscode/launch.json", "!/.vscode/extensions.json", ".history/", ".idea/"],
-    "OS Specific": [".DS_Store", "Thumbs.db"],
-    "Notebooks": [".ipynb_checkpoints"],
+GITIGNORE_DEFAULT_ENTRIES: Dict[str, Tuple[str, ...]] = {
+    "Python Virtual Environments": ("/.venv/", "/venv/", "/ENV/", "/env/"),
+    "Python Cache, Compiled Files & Extensions": ("__pycache__/", "*.py[cod]", "*$py.class", "*.so", "*.pyd"),
+    "Distribution & Packaging": (".Python", "build/", "develop-eggs/", "dist/", "downloads/", "eggs/", ".eggs/", "lib/", "lib64/", "parts/", "sdist/", "var/", "wheels/", "pip-wheel-metadata/", "share/python-wheels/", "*.egg-info/", ".installed.cfg", "*.egg", "MANIFEST"),
+    "Test, Coverage & Linter Reports": ("htmlcov/", ".tox/", ".nox/", ".coverage", ".coverage.*", "nosetests.xml", "coverage.xml", ".cache", ".pytest_cache/", ".hypothesis/", "*.cover", "*.log"),
+    "Installer Logs": ("pip-log.txt", "pip-delete-this-directory.txt"),
+    "IDE & Editor Specific": (".vscode/*", "!/.vscode/settings.json", "!/.vscode/tasks.json", "!/.vscode/launch.json", "!/.vscode/extensions.json", ".history/", ".idea/"),
+    "OS Specific": (".DS_Store", "Thumbs.db"),
+    "Notebooks": (".ipynb_checkpoints",),
 }
 
 # This dictionary contains a minimal, essential set of patterns. It is used when
 # UPDATING an existing .gitignore file to be non-intrusive and avoid
 # deleting user-added rules.
-ESSENTIAL_PATTERNS_TO_ENSURE: Dict[str, List[str]] = {
-    "Python Virtual Environments": ["/.venv/", "/venv/"],
-    "Python Cache & Compiled Files": ["__pycache__/"],
+ESSENTIAL_PATTERNS_TO_ENSURE: Dict[str, Tuple[str, ...]] = {
+    "Python Virtual Environments": ("venv/", ".venv/"),
+    "Python Cache & Compiled Files": ("__pycache__/",),
 }
 
 # Constants still used by deprecated functions - remove after deprecated code is deleted
@@ -607,34 +626,16 @@ _NOTEBOOK_SYSTEM_DEPENDENCIES = {
 
 
 
-_DYNAMIC_IGNORE_SET = {
-    "python", "pip", "conda", "mamba", "poetry", "uv", "sh", "bash",
-    "os", "sys", "json", "re", "pathlib", "tempfile", "ast", "collections",
-    "subprocess", "warnings", "typing", "time"
-}
-
-DEFAULT_IGNORE_DIRS = {
+# Frozen so the derived walk filter (_IGNORE_DIR_GLOB_RE) can't go stale.
+DEFAULT_IGNORE_DIRS = frozenset({
     ".venv", "venv", ".env", "env", "node_modules", ".git", "__pycache__",
     ".tox", ".pytest_cache", ".hypothesis", "build", "dist", "*.egg-info"
-}
+})
 
 # ==============================================================================
 # DEFINITIVE pyuvstarter FUNCTION REFACTORING
 # ==============================================================================
 
-# Constants defining the desired patterns, for clarity and maintainability.
-COMPREHENSIVE_PYTHON_GITIGNORE: Dict[str, List[str]] = {
-    "Python Virtual Environments": ["venv/", ".venv/", "ENV/", "env/"],
-    "Python Cache & Compiled Files": ["__pycache__/", "*.py[cod]", "*.so"],
-    "Distribution & Packaging": ["build/", "dist/", "*.egg-info/"],
-    "Test & Coverage Reports": [".coverage", "htmlcov/", ".pytest_cache/"],
-    "IDE & OS Specific": [".vscode/", ".idea/", ".DS_Store", "Thumbs.db"],
-}
-ESSENTIAL_PATTERNS_TO_ENSURE: Dict[str, List[str]] = {
-    "Python Virtual Environments": ["venv/", ".venv/"],
-    "Python Cache & Compiled Files": ["__pycache__/"],
-}
-
 
 # This section has been removed as part of the consolidation of the GitIgnore class.
 # The IgnoreManager class has been deprecated and its functionality for handling
@@ -753,6 +754,9 @@ class GitIgnore(GitIgnoreSpec):
             raise NotADirectoryError(f"The specified root_dir is not a directory: {self.root_dir}")
         self._manual_patterns = manual_patterns or []
         self.read_gitignore_files = read_gitignore_files
+        # Maps a root-relative POSIX directory path to whether it or any ancestor is excluded.
+        self._excluded_dir_cache: Dict[str, bool] = {}
+        self._root_prefix = os.path.join(os.fspath(self.root_dir), "")
 
     @functools.cached_property
     def patterns(self) -> List:
@@ -776,6 +780,19 @@ class GitIgnore(GitIgnoreSpec):
                 patterns.append(pattern_factory(line))
         return patterns
 
+    @functools.cached_property
+    def _backend(self):
+        """The matching backend for pathspec >= 1.0, compiled lazily from `patterns`.
+
+        pathspec 1.x matches through a backend that `PathSpec.__init__` builds eagerly.
+        This class never calls that initializer, so the backend is built here on the first
+        match instead, and pattern compilation is still deferred until a match is requested.
+        Older pathspec versions match against `patterns` directly and never read this.
+        """
+        return self._make_backend(self._backend_name, self.patterns)
+
+    _backend_name = "best"
+
     def invalidate_cache(self) -> None:
         """Invalidate the cached patterns after a write operation.
 
@@ -783,8 +800,9 @@ class GitIgnore(GitIgnoreSpec):
         the .gitignore files and reflect any changes made by save().
         """
         # Use the proper way to clear a cached_property
-        if 'patterns' in self.__dict__:
-            del self.__dict__['patterns']
+        self.__dict__.pop('patterns', None)
+        self.__dict__.pop('_backend', None)
+        self._excluded_dir_cache.clear()
 
     def _collect_pattern_lines(self) -> List[str]:
         """A helper to find, read, and normalize all .gitignore patterns."""
@@ -801,7 +819,7 @@ class GitIgnore(GitIgnoreSpec):
             )
 
             for path in sorted_ignore_files:
-                relative_dir = path.parent.relative_to(self.root_dir)
+                relative_dir = path.parent.relative_to(self.root_dir).as_posix()
                 try:
                     # Use `errors='ignore'` for resilience against malformed files.
                     with path.open(encoding='utf-8', errors='ignore') as f:
@@ -809,17 +827,7 @@ class GitIgnore(GitIgnoreSpec):
                             pattern = line.strip()
                             if not pattern or pattern.startswith('#'):
                                 continue
-
-                            # Per the spec, a pattern with a slash is relative to its
-                            # own .gitignore file. We must normalize it to be
-                            # relative to the project root for the unified spec.
-                            if '/' in pattern.strip('/'):
-                                pattern_path = (relative_dir / pattern).as_posix()
-                                # Prepending '/' anchors the pattern to the `root_dir`.
-                                lines.append(f'/{pattern_path}')
-                            else:
-                                # Patterns without a '/' are global and can match anywhere.
-                                lines.append(pattern)
+                            lines.append(self._scope_pattern(pattern, relative_dir))
                 except IOError:
                     # Silently skip files that cannot be read (e.g., due to permissions).
                     continue
@@ -828,7 +836,31 @@ class GitIgnore(GitIgnoreSpec):
         lines.extend(self._manual_patterns)
         return lines
 
-    def is_ignored(self, path: Union[Path, str]) -> bool:
+    @staticmethod
+    def _scope_pattern(pattern: str, relative_dir: str) -> str:
+        """Rewrites a pattern from the .gitignore in `relative_dir` so it applies from the project root.
+
+        Per the spec, patterns in a nested .gitignore only apply beneath its own directory.
+        A pattern with a leading or middle slash is anchored to that directory; any other
+        pattern may match at any depth below it. Both are rewritten as root-anchored
+        patterns for the unified spec, keeping a leading '!' negation in front.
+
+        Args:
+            pattern: A stripped, non-comment line from the .gitignore file.
+            relative_dir: The .gitignore's directory relative to `root_dir`, in POSIX form.
+
+        Returns:
+            The pattern, unchanged for the root .gitignore, otherwise scoped to `relative_dir`.
+        """
+        if relative_dir == '.':
+            return pattern
+        negation = '!' if pattern.startswith('!') else ''
+        body = pattern[len(negation):]
+        if '/' in body.rstrip('/'):
+            return f'{negation}/{relative_dir}/{body.lstrip("/")}'
+        return f'{negation}/{relative_dir}/**/{body}'
+
+    def is_ignored(self, path: Union[Path, str], is_dir: Optional[bool] = None) -> bool:
         """Checks if a single file path is ignored, respecting all spec rules.
 
         This method correctly implements the full gitignore specification,
@@ -836,31 +868,155 @@ class GitIgnore(GitIgnoreSpec):
 
         Args:
             path: The file or directory path to check.
+            is_dir: Whether `path` is a directory, if the caller already knows (e.g. from
+                    `os.scandir`). If None, the filesystem is checked, but only when the
+                    path doesn't already match as a file.
 
         Returns:
             True if the path is ignored, False otherwise.
         """
-        try:
-            # All matching logic is done on POSIX-style, root-relative paths.
-            path_rel_to_root = Path(path).resolve().relative_to(self.root_dir).as_posix()
-        except ValueError:
+        if not self.patterns:
+            return False  # No rules, so there is nothing to match or resolve.
+
+        # All matching logic is done on POSIX-style, root-relative paths.
+        path_rel_to_root = self._relative_posix(path)
+        if path_rel_to_root is None:
             # The path is not within the project root, so it is not subject to these rules.
             return False
 
-        # This loop correctly implements the parent directory exclusion rule:
+        # This check correctly implements the parent directory exclusion rule:
         # "It is not possible to re-include a file if a parent directory of that file is excluded."
-        current_parent = Path(path_rel_to_root).parent
-        while current_parent and str(current_parent) != '.':
-            # `self.match_file()` is inherited and returns True if a path is
-            # *included* (i.e., NOT ignored). If any parent is not included,
-            # this path is definitively ignored.
-            if not self.match_file(str(current_parent)):
-                return True
-            current_parent = current_parent.parent
+        if self._is_dir_excluded(path_rel_to_root.rpartition('/')[0]):
+            return True
+
+        # If no parents were ignored, check the path itself. `self.match_file()` is
+        # inherited and returns True if the path is ignored. Directory-only patterns
+        # such as "build/" match only when the path ends in a slash, so a directory is
+        # checked again with that marker (memoized like its ancestors).
+        if self.match_file(path_rel_to_root):
+            return True
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+        return is_dir and self._is_dir_excluded(path_rel_to_root)
+
+    def _relative_posix(self, path: Union[Path, str]) -> Optional[str]:
+        """Returns `path` relative to `root_dir` in POSIX form, or None if it lies outside the root.
+
+        Absolute, already-normalized paths under `root_dir` (such as those produced by a
+        walk) are sliced as strings. Anything else (relative paths, '..' segments, paths
+        reaching the root through a symlink) falls back to `Path.resolve()`.
+        """
+        path_str = os.fspath(path)
+        if path_str.startswith(self._root_prefix) and os.path.normpath(path_str) == path_str:
+            rel_path = path_str[len(self._root_prefix):]
+            return rel_path.replace(os.sep, "/") if os.sep != "/" else rel_path
+        try:
+            return Path(path_str).resolve().relative_to(self.root_dir).as_posix()
+        except ValueError:
+            return None
+
+    def _is_dir_excluded(self, rel_dir: str) -> bool:
+        """Returns True if the root-relative directory `rel_dir`, or any of its ancestors, is excluded.
+
+        Results are memoized per directory, so checking many files in the same directory
+        matches each ancestor against the spec only once. The memo is cleared by
+        `invalidate_cache()`.
+        """
+        if not rel_dir:
+            return False  # The project root itself is never excluded.
+        excluded = self._excluded_dir_cache.get(rel_dir)
+        if excluded is None:
+            # The trailing slash marks the path as a directory so that directory-only
+            # patterns match. If any ancestor is ignored, every path beneath it is too.
+            excluded = self.match_file(f"{rel_dir}/") or self._is_dir_excluded(rel_dir.rpartition('/')[0])
+            self._excluded_dir_cache[rel_dir] = excluded
+        return excluded
+
+    def filter_dirs(self, dirpath: Union[Path, str], dirnames: List[str]) -> None:
+        """Removes ignored directories from `dirnames` in place, for use inside an `os.walk` loop.
+
+        A directory is ignored when the spec matches its root-relative path with a trailing
+        slash. Because a file can't be re-included once its parent directory is excluded,
+        pruning here gives the same result as filtering every file beneath it, without
+        listing or stat()ing the subtree.
+
+        Args:
+            dirpath: The directory currently being walked; must be within `root_dir`.
+            dirnames: The subdirectory names `os.walk` yielded for `dirpath`.
+        """
+        prefix = self._rel_dir_prefix(os.fspath(dirpath))
+        dirnames[:] = [d for d in dirnames if not self.match_file(f"{prefix}{d}/")]
+
+    def _rel_dir_prefix(self, dirpath: str) -> str:
+        """Returns `dirpath` relative to `root_dir` in POSIX form with a trailing slash ("" for the root).
+
+        Uses string slicing rather than `Path.relative_to`, since it runs once per directory
+        visited by a walk.
+
+        Raises:
+            ValueError: If `dirpath` is not `root_dir` or a path beneath it.
+        """
+        if os.path.join(dirpath, "") == self._root_prefix:
+            return ""
+        if not dirpath.startswith(self._root_prefix):
+            raise ValueError(f"'{dirpath}' is not within '{self.root_dir}'")
+        rel_dir = dirpath[len(self._root_prefix):]
+        if os.sep != "/":
+            rel_dir = rel_dir.replace(os.sep, "/")
+        return f"{rel_dir}/"
+
+    def iter_unignored_files(self, start_dir: Union[Path, str, None] = None, suffixes: Tuple[str, ...] = ()) -> Iterator[Path]:
+        """Walks `start_dir` (default: `root_dir`), yielding files that are not ignored.
+
+        Unlike `get_unignored_files`, ignored directories are pruned during the walk as in
+        `filter_dirs`, and only the requested subtree is visited. Root-relative paths are
+        built with string operations, so a Path is created only for each file yielded.
 
-        # If no parents were ignored, check the file itself. The result is the
-        # logical opposite of inclusion.
-        return not self.match_file(path_rel_to_root)
+        Args:
+            start_dir: Directory within `root_dir` to walk. Defaults to `root_dir`.
+            suffixes: If given, only files whose names end in one of these are yielded.
+
+        Yields:
+            Absolute Path objects for files that are NOT ignored.
+        """
+        start = self.root_dir if start_dir is None else Path(start_dir).resolve()
+        if not self.patterns:
+            # No .gitignore rules at all: nothing can be ignored, so skip matching entirely.
+            for dirpath, _, filenames in os.walk(start):
+                for filename in filenames:
+                    if not suffixes or filename.endswith(suffixes):
+                        yield Path(os.path.join(dirpath, filename))
+            return
+        for dirpath, dirnames, filenames in os.walk(start):
+            prefix = self._rel_dir_prefix(dirpath)
+            dirnames[:] = [d for d in dirnames if not self.match_file(f"{prefix}{d}/")]
+            candidates = [prefix + f for f in filenames if not suffixes or f.endswith(suffixes)]
+            for rel_path in self.match_files(candidates, negate=True):
+                yield Path(os.path.join(dirpath, rel_path[len(prefix):]))
+
+    def filter_paths(self, paths: Iterable[Union[Path, str]]) -> List[Path]:
+        """Returns the given file paths that are not ignored, in their original order.
+
+        The batch counterpart of `is_ignored`: every path is made root-relative once,
+        files under an excluded directory are dropped via the per-directory memo, and the
+        rest are matched in a single `match_files` pass. Paths outside `root_dir` are kept,
+        as `is_ignored` reports them as not ignored.
+
+        Args:
+            paths: The file paths to filter.
+
+        Returns:
+            Path objects for the paths that are NOT ignored.
+        """
+        if not self.patterns:
+            return [Path(path) for path in paths]
+        candidates: List[Tuple[Path, Optional[str]]] = []
+        for path in paths:
+            rel_path = self._relative_posix(path)
+            if rel_path is None or not self._is_dir_excluded(rel_path.rpartition('/')[0]):
+                candidates.append((Path(path), rel_path))
+        ignored = set(self.match_files({rel_path for _, rel_path in candidates if rel_path is not None}))
+        return [path for path, rel_path in candidates if rel_path not in ignored]
 
     def get_ignored_files(self) -> List[Path]:
         """Scans the project and returns a list of all IGNORED files using
@@ -883,7 +1039,7 @@ class GitIgnore(GitIgnoreSpec):
         # match the final spec, which is exactly what we want.
         return [self.root_dir / p for p in self.match_tree_files(self.root_dir, negate=True)]
 
-    def save(self, patterns: List[str], comment: str = "Patterns added by tool"):
+    def save(self, patterns: Sequence[str], comment: str = "Patterns added by tool"):
         """Safely and idempotently appends a commented block of patterns.
 
         This method is non-destructive. It reads the existing file, checks which
@@ -895,12 +1051,30 @@ class GitIgnore(GitIgnoreSpec):
             patterns: List of gitignore patterns to add.
             comment: Comment text to describe this block of patterns.
 
+        Raises:
+            IOError: If the file cannot be read or written.
+        """
+        self.save_sections({comment: patterns})
+
+    def save_sections(self, sections: Dict[str, Sequence[str]]):
+        """Appends several commented blocks of patterns with a single read and write.
+
+        Equivalent to calling `save(patterns, comment)` for each section in order, but
+        the file is read, split into lines, and written only once. A pattern that is
+        already active, or was added by an earlier section, is skipped; a section with
+        no new patterns is omitted entirely.
+
+        Args:
+            sections: Mapping of comment text to the gitignore patterns for that block.
+
         Raises:
             IOError: If the file cannot be read or written.
         """
         target_path = self.root_dir / '.gitignore'
         try:
-            content = target_path.read_text(encoding='utf-8') if target_path.exists() else ""
+            content = target_path.read_text(encoding='utf-8')
+        except FileNotFoundError:
+            content = ""
         except IOError as e:
             raise IOError(f"Could not read .gitignore file at {target_path}: {e}")
 
@@ -908,22 +1082,34 @@ class GitIgnore(GitIgnoreSpec):
         # lines, we can check for a pattern's existence in O(1) time on average.
         existing_lines = {line.strip() for line in content.splitlines()}
         active_patterns = {p for p in existing_lines if p and not p.startswith('#')}
-        patterns_to_add = [p for p in patterns if p.strip() and p.strip() not in active_patterns]
 
-        if not patterns_to_add:
+        blocks: List[str] = []
+        for comment, patterns in sections.items():
+            patterns_to_add = []
+            for pattern in patterns:
+                stripped = pattern.strip()
+                if stripped and stripped not in active_patterns:
+                    active_patterns.add(stripped)
+                    patterns_to_add.append(pattern)
+            if patterns_to_add:
+                blocks.append(f"# {comment}\n" + '\n'.join(patterns_to_add) + '\n')
+
+        if not blocks:
             return  # All patterns already exist; do nothing to preserve the file.
 
-        # Build the new content block, ensuring proper spacing for readability.
-        if content and not content.endswith('\n'):
-            content += '\n'
-        if content and not content.endswith('\n\n'):
-            content += '\n'
-
-        content += f"# {comment}\n"
-        content += '\n'.join(patterns_to_add) + '\n'
+        # Build the new content, ensuring proper spacing between blocks for readability.
+        updated = content
+        for block in blocks:
+            if updated and not updated.endswith('\n'):
+                updated += '\n'
+            if updated and not updated.endswith('\n\n'):
+                updated += '\n'
+            updated += block
 
+        # The existing content is left as is; only the new blocks are appended.
         try:
-            target_path.write_text(content, encoding='utf-8')
+            with target_path.open('a', encoding='utf-8') as f:
+                f.write(updated[len(content):])
         except IOError as e:
             raise IOError(f"Could not write to .gitignore file at {target_path}: {e}")
 
@@ -979,9 +1165,8 @@ class GitIgnore(GitIgnoreSpec):
             True if the file matches the pattern AND is not ignored; False otherwise.
         """
         # First, ensure the file is within the root_dir and get its relative path.
-        try:
-            path_rel_to_root = Path(path).resolve().relative_to(self.root_dir).as_posix()
-        except ValueError:
+        path_rel_to_root = self._relative_posix(path)
+        if path_rel_to_root is None:
             # Path is not within the project root, so it cannot be "allowed" by project rules.
             return False
 
@@ -1024,8 +1209,8 @@ def test():
         deps_a = {dep[0] for dep in result_a.all_unique_dependencies}
         assert deps_a == {"fastapi", "uvicorn", "scipy", "pandas", "scikit-learn"}
         assert result_a.notebooks_found_count == 2
-        assert result_a.notebooks_converted_count == 1
-        assert result_a.notebooks_fallback_count == 1
+        assert result_a.notebooks_parsed_count == 2
+        assert result_a.notebooks_fallback_count == 0
 
         print("\n\n--- 2. ACTION: Scanning 'service_b' scope (notebooks disabled) ---")
         result_b = discover_dependencies_in_scope(scan_path=service_b, scan_notebooks=False)
@@ -1097,7 +1282,49 @@ ignored_*.ipynb
 
 
 
+# --- pyproject.toml Reading ---
+# Parsed pyproject.toml files keyed by resolved path, stored with the (mtime_ns, size) they were parsed at.
+_PYPROJECT_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
+def _load_pyproject_toml(pyproject_path: Path) -> Dict[str, Any]:
+    """Parses a pyproject.toml with the module-level `tomllib`, reusing the result while the file is unchanged.
+
+    The file is read by several steps of a run (version, declared dependencies, project structure,
+    script suggestions). It is only re-parsed when its modification time or size changes, e.g. after
+    `uv add` rewrites it. The returned dict is shared between callers and must not be modified.
+
+    Raises:
+        ImportError: If neither `tomllib` nor `toml` is available.
+        OSError, ValueError: If the file can't be read or isn't valid TOML.
+    """
+    if tomllib is None:
+        raise ImportError("Cannot parse TOML: `tomllib` (Python 3.11+) or the `toml` package is required.")
+    stat = pyproject_path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cache_key = str(pyproject_path.resolve())
+    cached = _PYPROJECT_CACHE.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(pyproject_path, "rb") as f:
+        data = tomllib.load(f)
+    _PYPROJECT_CACHE[cache_key] = (stamp, data)
+    return data
+
+
 # --- Project Version Extraction ---
+@functools.lru_cache(maxsize=8)
+def _installed_distribution_version(project_name: str) -> Optional[str]:
+    """Returns the installed version of a distribution, or None if it isn't installed.
+
+    `importlib.metadata.version` scans every sys.path entry for distribution metadata, and the
+    installed set doesn't change during a run, so each name is looked up once.
+    """
+    try:
+        return importlib.metadata.version(project_name)
+    except Exception:
+        return None
+
+
 def _get_project_version(pyproject_path: Path = Path(__file__), project_name: str = "pyuvstarter") -> str:
     """
     Robustly reads the version from the [project] section of a pyproject.toml.
@@ -1108,23 +1335,13 @@ def _get_project_version(pyproject_path: Path = Path(__file__), project_name: st
     """
     # Try importlib.metadata.version if project_name is given
     if project_name and HAS_IMPORTLIB_METADATA:
-        try:
-            return importlib.metadata.version(project_name)
-        except Exception:
-            pass
+        installed_version = _installed_distribution_version(project_name)
+        if installed_version is not None:
+            return installed_version
     # Fallback: try to read pyproject.toml
     if pyproject_path is not None and pyproject_path.exists():
         try:
-            # Use module-level tomllib if available (Python 3.11+)
-            # Otherwise dynamically import toml package
-            # Different file modes: tomllib needs binary, toml needs text
-            if tomllib is not None:
-                with open(pyproject_path, "rb") as f:
-                    data = tomllib.load(f)
-            else:
-                import toml
-                with open(pyproject_path, "r", encoding="utf-8") as f:
-                    data = toml.load(f)
+            data = _load_pyproject_toml(pyproject_path)
             project = data.get("project", {})
             if project_name and project.get("name") != project_name:
                 return "unknown"
@@ -1163,8 +1380,7 @@ def get_uv_run_command(pyproject_path="pyproject.toml", script_not_found_message
     try:
         if not pyproject_path.exists():
             return script_not_found_message
-        with open(pyproject_path, "rb") as f:
-            data = tomllib.load(f)
+        data = _load_pyproject_toml(pyproject_path)
         scripts = data.get("project", {}).get("scripts", {})
 
         def prefer_main_candidates(names):
@@ -1261,6 +1477,9 @@ def get_uv_run_command(pyproject_path="pyproject.toml", script_not_found_message
 
 # --- JSON Logging Utilities ---
 _log_data_global = {}
+# Serializes _log_action calls made from worker threads (notebook parsing, the background ruff check).
+# Reentrant because the progress output it drives can itself log.
+_log_lock = threading.RLock()
 
 # --- Intelligent Output System Global State ---
 # Global state for intelligent output system
@@ -1571,7 +1790,7 @@ class ProgressTracker:
             self.init_progress_bar()
         elif status == "ERROR":
             self.write_intelligent_error(message)
-        elif self.should_show_progress(action_name) and status in ["SUCCESS", "WARN"]:
+        elif self.should_show_progress(action_name) and status in _PROGRESS_STATUSES:
             self.update_progress_with_auto_intelligence(action_name)
             # Show summary after script_end progress update
             if action_name == "script_end":
@@ -1632,10 +1851,10 @@ class ProgressTracker:
         ]
         files_created = set(self._auto_intelligence.get("files_created", []))
         for file_path, icon, desc in summary_files:
-            # file_path may be Path or str
-            path_obj = Path(file_path) if not isinstance(file_path, Path) else file_path
+            # Names are relative to the project, not the working directory pyuvstarter was started from.
+            path_obj = project_dir / file_path
             exists = path_obj.exists()
-            created = str(file_path) in files_created or (isinstance(file_path, Path) and str(file_path) in files_created)
+            created = str(file_path) in files_created
             marker = "[created]" if created else "[existing]" if exists else ""
             if exists:
                 safe_print(f"   {icon} {file_path} — {desc} {marker}")
@@ -1667,7 +1886,7 @@ class ProgressTracker:
         safe_print(f"   2. \U0001f680 Run your Python code:\n      {uv_run_cmd}")  # 🚀
         safe_print("   3. \U0001f527 Open in VS Code (optional):")  # 🔧
         print("      code .")
-        if Path(".git").exists():
+        if (project_dir / ".git").exists():
             safe_print("   4. \U0001f4dd Commit your changes:")  # 📝
             print("      git add . && git commit -m 'Set up Python project with uv'")
         else:
@@ -1710,7 +1929,13 @@ def _init_log(project_root: Path, config=None, original_cwd: Path = None):
     """
     global _log_data_global
     pyproject_path = project_root / PYPROJECT_TOML_NAME
+    script_pyproject_path = Path(__file__).parent / PYPROJECT_TOML_NAME
     project_version = _get_project_version(pyproject_path)
+    # When pyuvstarter is run on its own checkout, both versions come from the same file; read it once.
+    if pyproject_path.resolve() == script_pyproject_path.resolve():
+        pyuvstarter_version = project_version
+    else:
+        pyuvstarter_version = _get_project_version(script_pyproject_path, "pyuvstarter")
 
     # Capture environment variables relevant for debugging (only non-None values)
     env_vars = {}
@@ -1744,25 +1969,29 @@ def _init_log(project_root: Path, config=None, original_cwd: Path = None):
             # If model_dump fails, log what we can
             invocation_context["cli_parameters_error"] = str(e)
 
+    # A single uname() call; platform caches the result, unlike separate system()/release()/... lookups.
+    uname = platform.uname()
+
     _log_data_global = {
         "script_name": Path(__file__).name,
-        "pyuvstarter_version": _get_project_version(Path(__file__).parent / "pyproject.toml", "pyuvstarter"),
+        "pyuvstarter_version": pyuvstarter_version,
         "project_version": project_version,
         "start_time_utc": datetime.datetime.now(datetime.timezone.utc).isoformat(),
         "end_time_utc": None,
         "overall_status": "IN_PROGRESS",
         "invocation_context": invocation_context,  # Enhanced tracing information
         "platform_info": {
-            "system": platform.system(),
-            "release": platform.release(),
-            "version": platform.version(),
-            "machine": platform.machine(),
+            "system": uname.system,
+            "release": uname.release,
+            "version": uname.version,
+            "machine": uname.machine,
             "python_version_script_host": sys.version
         },
         "project_root": str(project_root),
         "actions": [],
         "final_summary": "",
-        "errors_encountered_summary": []
+        "errors_encountered_summary": [],
+        "error_warn_count": 0
     }
     _log_action("script_bootstrap", "INFO", f"Script execution initiated for project at {project_root}.")
 
@@ -1771,6 +2000,13 @@ def _init_log(project_root: Path, config=None, original_cwd: Path = None):
 CHECKPOINT_SAVE = True   # Quick save on errors (no status updates)
 FINAL_SAVE = False       # Complete save with status updates (default)
 
+# Overall statuses meaning the script made progress, so next steps are worth showing.
+_TERMINAL_STATUSES = frozenset({"SUCCESS", "COMPLETED_WITH_ERRORS", "HALTED_BY_SCRIPT_LOGIC"})
+# Action statuses that advance the progress bar.
+_PROGRESS_STATUSES = frozenset({"SUCCESS", "WARN"})
+# Action statuses counted in the log's "error_warn_count", which decides the final warning.
+_ATTENTION_STATUSES = frozenset({"ERROR", "WARN", "FAILED"})
+
 
 def _write_log_to_disk(log_file_path: Path, log_data: dict) -> bool:
     """Write log data to disk with proper flushing for crash safety.
@@ -1784,10 +2020,29 @@ def _write_log_to_disk(log_file_path: Path, log_data: dict) -> bool:
 
     Uses explicit flush() and fsync() to ensure data reaches disk even if
     process crashes immediately after. This is critical for debugging.
+    Serializes with orjson when it is installed.
     """
+    if orjson is not None:
+        # _log_action only appends to the in-memory log, so each checkpoint rewrites the whole
+        # document; orjson serializes it in one native call. Anything it rejects falls back to json.
+        try:
+            payload = orjson.dumps(log_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            payload = None
+        if payload is not None:
+            try:
+                with open(log_file_path, "wb") as f:
+                    f.write(payload)
+                    f.flush()  # Flush Python buffer
+                    os.fsync(f.fileno())  # Force OS to write to disk
+                return True
+            except Exception:
+                return False
     try:
         with open(log_file_path, "w", encoding="utf-8") as f:
-            json.dump(log_data, f, indent=2)
+            # ensure_ascii=False writes UTF-8 paths/messages directly instead of escaping them,
+            # and the log is a plain tree of dicts/lists so the circular-reference check is unnecessary.
+            json.dump(log_data, f, indent=2, ensure_ascii=False, check_circular=False)
             f.flush()  # Flush Python buffer
             os.fsync(f.fileno())  # Force OS to write to disk
         return True
@@ -1844,33 +2099,35 @@ def _log_action(action_name: str, status: str, message: str = "", details: dict
 
     Always print to console and log to JSON. Never split a single event across multiple calls.
     """
-    global _log_data_global
-    if "actions" not in _log_data_global:
-        _log_data_global["actions"] = []
-    entry = {
-        "timestamp_utc": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-        "action": action_name,
-        "status": status.upper(),
-        "message": message,
-        "details": details or {},
-    }
-    _log_data_global["actions"].append(entry)
-
-    if status.upper() == "ERROR":
-        if "errors_encountered_summary" not in _log_data_global:
-            _log_data_global["errors_encountered_summary"] = []
-        error_summary = f"Action: {action_name}, Message: {message}"
-        if details and "exception" in details:
-            error_summary += f", Exception: {details['exception']}"
-        if details and "command" in details:
-            error_summary += f", Command: {details['command']}"
-        _log_data_global["errors_encountered_summary"].append(error_summary)
-
-    # === AUTOMATIC INTELLIGENCE EXTRACTION & PROGRESS TRACKING ===
-    global _progress_tracker
-    if _progress_tracker:
-        _progress_tracker.extract_intelligence_automatically(action_name, status, message, details)
-        _progress_tracker.handle_intelligent_output(action_name, status, message, details)
+    global _log_data_global, _progress_tracker
+    with _log_lock:
+        if "actions" not in _log_data_global:
+            _log_data_global["actions"] = []
+        entry = {
+            "timestamp_utc": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "action": action_name,
+            "status": status.upper(),
+            "message": message,
+            "details": details or {},
+        }
+        _log_data_global["actions"].append(entry)
+        if entry["status"] in _ATTENTION_STATUSES:
+            _log_data_global["error_warn_count"] = _log_data_global.get("error_warn_count", 0) + 1
+
+        if status.upper() == "ERROR":
+            if "errors_encountered_summary" not in _log_data_global:
+                _log_data_global["errors_encountered_summary"] = []
+            error_summary = f"Action: {action_name}, Message: {message}"
+            if details and "exception" in details:
+                error_summary += f", Exception: {details['exception']}"
+            if details and "command" in details:
+                error_summary += f", Command: {details['command']}"
+            _log_data_global["errors_encountered_summary"].append(error_summary)
+
+        # === AUTOMATIC INTELLIGENCE EXTRACTION & PROGRESS TRACKING ===
+        if _progress_tracker:
+            _progress_tracker.extract_intelligence_automatically(action_name, status, message, details)
+            _progress_tracker.handle_intelligent_output(action_name, status, message, details)
 
 
 def _get_next_steps_text(config: 'CLICommand') -> str:
@@ -1933,7 +2190,7 @@ def _save_log(config: 'CLICommand', checkpoint: bool = False):
             _log_data_global["final_summary"] = f"Script execution concluded. Status: {current_overall_status}"
 
         # Always add next steps if the script made progress
-        if _log_data_global["overall_status"] in ["SUCCESS", "COMPLETED_WITH_ERRORS", "HALTED_BY_SCRIPT_LOGIC"]:
+        if _log_data_global["overall_status"] in _TERMINAL_STATUSES:
             next_steps_text = _get_next_steps_text(config)
             # Ensure there's a newline before appending next steps if there's already a summary
             if _log_data_global.get("final_summary"):
@@ -1996,12 +2253,13 @@ def _run_command(command_list: list[str], action_log_name: str, work_dir: Path =
     Args:
         env: Optional environment variables dict. If None, inherits parent environment.
 
-    Note: Since the main() function changes the CWD to project_root, work_dir defaults to
-    the project root directory, making command execution safe and consistent.
+    Note: The workflow does not change the process CWD, so commands whose working directory
+    matters must pass work_dir (normally the project root); otherwise the current CWD is used.
     """
     if work_dir is None:
-        work_dir = Path.cwd()  # This is now the project_root directory
-    cmd_str = ' '.join(command_list) if isinstance(command_list, list) else command_list
+        work_dir = Path.cwd()
+    # shlex.join quotes arguments containing spaces, so the logged command can be copy-pasted to reproduce it.
+    cmd_str = shlex.join(command_list) if isinstance(command_list, list) else command_list
 
     if dry_run:
         _log_action(action_log_name, "INFO", f"DRY RUN: Would execute: \"{cmd_str}\" in \"{work_dir}\" (Logged as action: {action_log_name})")
@@ -2010,7 +2268,7 @@ def _run_command(command_list: list[str], action_log_name: str, work_dir: Path =
     _log_action(action_log_name, "INFO", f"EXEC: \"{cmd_str}\" in \"{work_dir}\" (Logged as action: {action_log_name})")
 
     log_details = {
-        "command": cmd_str,  # Human-readable space-joined string
+        "command": cmd_str,  # Human-readable, shell-quoted string
         "command_list": command_list if isinstance(command_list, list) else [command_list],  # Exact list for reproduction
         "working_directory": str(work_dir),
         "shell_used": shell,
@@ -2018,8 +2276,14 @@ def _run_command(command_list: list[str], action_log_name: str, work_dir: Path =
         "environment": _get_env_diagnostics(env)
     }
 
+    # Launch previously verified executables (e.g. `uv`) by absolute path so the OS doesn't re-search PATH.
+    # The logged command keeps the bare name for readability and reproducibility.
+    exec_list = command_list
+    if not shell and isinstance(command_list, list) and command_list and command_list[0] in _resolved_executables:
+        exec_list = [_resolved_executables[command_list[0]], *command_list[1:]]
+
     try:
-        process = subprocess.run(command_list, cwd=work_dir, capture_output=capture_output, text=True, shell=shell, check=True, env=env)
+        process = subprocess.run(exec_list, cwd=work_dir, capture_output=capture_output, text=True, shell=shell, check=True, env=env)
         stdout = process.stdout.strip() if process.stdout and capture_output else ""
         stderr = process.stderr.strip() if process.stderr and capture_output else ""
         log_details.update({"return_code": process.returncode,
@@ -2054,9 +2318,31 @@ def _run_command(command_list: list[str], action_log_name: str, work_dir: Path =
         _log_action(action_log_name, "ERROR", f"Unexpected error executing command: {cmd_str}", details=log_details)
         raise
 
+# Absolute paths of executables verified during this run, keyed by command name.
+# Populated by _remember_executable_path and consumed by _command_exists and _run_command.
+_resolved_executables: Dict[str, str] = {}
+
 def _command_exists(command_name):
-    """Checks if a command-line tool is available in the system's PATH."""
-    return shutil.which(command_name) is not None
+    """Checks if a command-line tool is available in the system's PATH.
+
+    Found commands are remembered, so repeated probes don't rescan PATH. Missing commands are
+    not, because callers re-check after installing a tool (e.g. `uv`) during the same run.
+    """
+    return command_name in _resolved_executables or _remember_executable_path(command_name) is not None
+
+def _remember_executable_path(command_name: str) -> Optional[str]:
+    """Resolves a command on PATH once and caches its absolute path for later `_run_command` calls.
+
+    On Windows especially, every PATH lookup walks PATH x PATHEXT with several stats per
+    directory; resolving `uv` once avoids repeating that for each of the many `uv` invocations.
+
+    Returns:
+        The absolute path, or None if the command isn't on PATH (nothing is cached).
+    """
+    resolved = shutil.which(command_name)
+    if resolved:
+        _resolved_executables[command_name] = resolved
+    return resolved
 
 # --- UV & Tool Installation ---
 def _install_uv_brew(dry_run: bool):
@@ -2132,6 +2418,8 @@ def _ensure_uv_installed(dry_run: bool):
             version_out, _ = _run_command(["uv", "--version"], f"{action_name}_version_check", suppress_console_output_on_success=True, dry_run=dry_run)
             if not dry_run:
                 _log_action(action_name, "SUCCESS", f"`uv` is already installed. Version: {version_out}")
+                _remember_executable_path("uv")
+                _remember_executable_path("uvx")
             return True
         except Exception as e:
             _log_action(f"{action_name}_version_check", "WARN", "`uv --version` failed, though `uv` command seems to exist. Will attempt to reinstall.", details={"exception": str(e)})
@@ -2163,6 +2451,8 @@ def _ensure_uv_installed(dry_run: bool):
                 # Stage 4: Final version verification
                 version_out, _ = _run_command(["uv", "--version"], f"{action_name}_post_install_version_check")
                 _log_action(action_name, "SUCCESS", f"`uv` successfully installed/ensured via {' -> '.join(methods)}. Version: {version_out}")
+                _remember_executable_path("uv")
+                _remember_executable_path("uvx")
                 return True
             except Exception:
                 _log_action(action_name, "ERROR", "Installation successful, but 'uv --version' still fails.\n      ACTION: This may indicate a problem with the `uv` binary or PATH. Please restart your terminal.")
@@ -2208,11 +2498,14 @@ def _ensure_tool_available(tool_name: str, major_action_results: list, dry_run:
 # dependencies from all source files, including Jupyter Notebooks.
 ######################################################################
 
-def _get_dynamic_ignore_set():
+@functools.cache
+def _get_dynamic_ignore_set() -> frozenset:
     """
     Dynamically generate a set of standard library and built-in names to ignore for dependency detection.
     This is critical for not treating 'sys' or 'os' as a PyPI dependency.
     It uses sys.stdlib_module_names (Python 3.10+) or falls back to the `stdlib-list` package if available.
+
+    Built on first use and cached, so importing pyuvstarter (e.g. just for `--help`) doesn't pay for it.
     """
     stdlib_modules = set()
     # Best case: Python 3.10+ has this built-in.
@@ -2230,13 +2523,27 @@ def _get_dynamic_ignore_set():
             # We still filter builtins, which is better than nothing.
             _log_action("get_stdlib", "WARN", "Could not determine Python's standard library list. 'stdlib-list' package not found and not on Python 3.10+. Standard library modules might be incorrectly identified as dependencies.")
             stdlib_modules = set()
-    # Also include built-in names.
-    builtin_names = set(dir(__builtins__))
+    # Also include built-in names. The `builtins` module is used rather than `__builtins__`,
+    # which is a dict instead of a module when this file is imported rather than run directly.
+    builtin_names = set(vars(builtins))
     # The final set is the union of both, lowercased for case-insensitive comparison.
-    return {name.lower() for name in stdlib_modules | builtin_names}
+    # Frozen because it is shared module-wide and only ever used for membership tests.
+    return frozenset(name.lower() for name in stdlib_modules | builtin_names)
+
+# Leading distribution name of a requirement specifier (stops at extras, version operators, markers, spaces).
+_BASE_NAME_RE = re.compile(r"^\s*([A-Za-z0-9_\-\.]+)")
+
+
+def _base_pkg(spec: str) -> str:
+    """Returns the lowercase base package name of a specifier in a single regex match.
+
+    Examples:
+        'requests[security]>=2.25' -> 'requests'
+        'Django ~= 4.2' -> 'django'
+    """
+    match = _BASE_NAME_RE.match(spec)
+    return match.group(1).lower() if match else ""
 
-# Initialize the ignore set once at script startup for efficiency.
-_DYNAMIC_IGNORE_SET = _get_dynamic_ignore_set()
 
 def _extract_package_name_from_specifier(specifier: str) -> str:
     """Extract the base package name from a PEP 508 specifier.
@@ -2257,8 +2564,7 @@ def _extract_package_name_from_specifier(specifier: str) -> str:
         return req.name.lower()
     except Exception:
         # Fallback to simple parsing if packaging fails
-        base_name = specifier.split('[')[0].split('=')[0].split('>')[0].split('<')[0].split('~')[0].split('!')[0].strip()
-        return base_name.lower() if base_name else ""
+        return _base_pkg(specifier)
 
 
 def _categorize_uv_add_error(stderr: str) -> str:
@@ -2547,104 +2853,109 @@ def _try_packages_individually(
     return successful_packages, failed_packages_with_reasons
 
 
+# Comprehensive mapping of common import-to-package name discrepancies, used by _canonicalize_pkg_name.
+_IMPORT_TO_PACKAGE_NAME: Dict[str, str] = {
+    # Machine Learning & Data Science
+    "sklearn": "scikit-learn",
+    "cv2": "opencv-python",
+    "cv": "opencv-python",  # Some old code uses cv
+    "skimage": "scikit-image",
+
+    # Image Processing
+    "pil": "pillow",
+    "PIL": "pillow",
+
+    # Configuration & Serialization
+    "yaml": "pyyaml",
+    "toml": "toml",  # Keep this - even though names match, good documentation
+
+    # Web & APIs
+    "requests_oauthlib": "requests-oauthlib",
+    "google.cloud": "google-cloud",
+    "bs4": "beautifulsoup4",
+    "flask_cors": "flask-cors",
+    "flask_sqlalchemy": "flask-sqlalchemy",
+    "flask_migrate": "flask-migrate",
+    "flask_login": "flask-login",
+    "flask_wtf": "flask-wtforms",
+    "rest_framework": "djangorestframework",
+
+    # Database & ORM
+    "psycopg2": "psycopg2-binary",
+    "MySQLdb": "mysqlclient",
+    "mysqldb": "mysqlclient",
+    "_mysql": "mysqlclient",
+
+    # Development Tools
+    "dotenv": "python-dotenv",
+    "dateutil": "python-dateutil",
+    "jose": "python-jose",
+    "magic": "python-magic",
+    "dns": "dnspython",
+
+    # GUI & Graphics
+    "tkinter": "",  # Built-in, should be filtered out elsewhere
+    "PyQt5": "pyqt5",
+    "PyQt6": "pyqt6",
+    "wx": "wxpython",
+
+    # System & OS
+    "win32api": "pywin32",
+    "win32com": "pywin32",
+    "pywintypes": "pywin32",
+    "pythoncom": "pywin32",
+
+    # Testing & Mocking
+    "mock": "mock",  # Built into unittest in Python 3.3+
+    "_pytest": "pytest",  # Internal pytest imports
+
+    # Async & Concurrency
+    "asyncio": "",  # Built-in
+
+    # Typing
+    "typing_extensions": "typing-extensions",
+
+    # Additional common mismatches
+    "Crypto": "pycryptodome",  # Or pycrypto
+    "Cryptodome": "pycryptodomex",
+    "jwt": "pyjwt",
+    "git": "gitpython",
+    "serial": "pyserial",
+    "usb": "pyusb",
+    "docx": "python-docx",
+    "pptx": "python-pptx",
+    "fitz": "pymupdf",
+    "PyPDF2": "pypdf2",
+    "websocket": "websocket-client",  # Different from 'websockets'
+    "Levenshtein": "python-levenshtein",
+    "slugify": "python-slugify",
+    "multipart": "python-multipart",
+    "memcache": "python-memcached",
+    "ldap": "python-ldap",
+    "nacl": "pynacl",
+    "etree": "lxml",  # ElementTree from lxml
+    "_cffi_backend": "cffi",
+    "googleapiclient": "google-api-python-client",
+    "apiclient": "google-api-python-client",
+}
+
+
+@functools.cache
 def _canonicalize_pkg_name(name: str) -> str:
     """
     Canonicalize package import names to their PyPI package names for consistency.
     This is crucial because `import` names often differ from installable package names.
     (e.g., you `import sklearn` but `uv add scikit-learn`).
 
-    Comprehensive mapping of common import-to-package name discrepancies.
+    Results are memoized: the same handful of names recur across every cell, script, and
+    requirements entry, and the function is pure. The cache is unbounded because a run only
+    ever sees a project's worth of distinct names, so an LRU's bookkeeping buys nothing.
     """
-    mapping = {
-        # Machine Learning & Data Science
-        "sklearn": "scikit-learn",
-        "cv2": "opencv-python",
-        "cv": "opencv-python",  # Some old code uses cv
-        "skimage": "scikit-image",
-
-        # Image Processing
-        "pil": "pillow",
-        "PIL": "pillow",
-
-        # Configuration & Serialization
-        "yaml": "pyyaml",
-        "toml": "toml",  # Keep this - even though names match, good documentation
-
-        # Web & APIs
-        "requests_oauthlib": "requests-oauthlib",
-        "google.cloud": "google-cloud",
-        "bs4": "beautifulsoup4",
-        "flask_cors": "flask-cors",
-        "flask_sqlalchemy": "flask-sqlalchemy",
-        "flask_migrate": "flask-migrate",
-        "flask_login": "flask-login",
-        "flask_wtf": "flask-wtforms",
-        "rest_framework": "djangorestframework",
-
-        # Database & ORM
-        "psycopg2": "psycopg2-binary",
-        "MySQLdb": "mysqlclient",
-        "mysqldb": "mysqlclient",
-        "_mysql": "mysqlclient",
-
-        # Development Tools
-        "dotenv": "python-dotenv",
-        "dateutil": "python-dateutil",
-        "jose": "python-jose",
-        "magic": "python-magic",
-        "dns": "dnspython",
-
-        # GUI & Graphics
-        "tkinter": "",  # Built-in, should be filtered out elsewhere
-        "PyQt5": "pyqt5",
-        "PyQt6": "pyqt6",
-        "wx": "wxpython",
-
-        # System & OS
-        "win32api": "pywin32",
-        "win32com": "pywin32",
-        "pywintypes": "pywin32",
-        "pythoncom": "pywin32",
-
-        # Testing & Mocking
-        "mock": "mock",  # Built into unittest in Python 3.3+
-        "_pytest": "pytest",  # Internal pytest imports
-
-        # Async & Concurrency
-        "asyncio": "",  # Built-in
-
-        # Typing
-        "typing_extensions": "typing-extensions",
-
-        # Additional common mismatches
-        "Crypto": "pycryptodome",  # Or pycrypto
-        "Cryptodome": "pycryptodomex",
-        "jwt": "pyjwt",
-        "git": "gitpython",
-        "serial": "pyserial",
-        "usb": "pyusb",
-        "docx": "python-docx",
-        "pptx": "python-pptx",
-        "fitz": "pymupdf",
-        "PyPDF2": "pypdf2",
-        "websocket": "websocket-client",  # Different from 'websockets'
-        "Levenshtein": "python-levenshtein",
-        "slugify": "python-slugify",
-        "multipart": "python-multipart",
-        "memcache": "python-memcached",
-        "ldap": "python-ldap",
-        "nacl": "pynacl",
-        "etree": "lxml",  # ElementTree from lxml
-        "_cffi_backend": "cffi",
-        "googleapiclient": "google-api-python-client",
-        "apiclient": "google-api-python-client",
-    }
-
     name_lower = name.lower()
 
     # Step 1: Check our curated mapping for known discrepancies
-    if name_lower in mapping:
-        canonical = mapping[name_lower]
+    if name_lower in _IMPORT_TO_PACKAGE_NAME:
+        canonical = _IMPORT_TO_PACKAGE_NAME[name_lower]
         # Empty string means built-in module that shouldn't be installed
         return canonical if canonical else name_lower
 
@@ -2708,34 +3019,217 @@ def _extract_package_name_from_dependency_tuple(dependency_tuple) -> str:
         return ""
 
 
-def _find_all_notebooks(scan_path: Path, ignore_manager: Optional[GitIgnore]) -> List[Path]:
+# Glob entries in DEFAULT_IGNORE_DIRS (e.g. "*.egg-info") can't match by set membership, so they
+# are combined into one regex compiled at import and tried only for names the set lookup misses.
+_IGNORE_DIR_GLOB_RE = re.compile("|".join(
+    fnmatch.translate(d) for d in sorted(DEFAULT_IGNORE_DIRS) if any(c in d for c in "*?[")
+) or r"(?!)")
+
+
+def _source_walk_skip_dirs(venv_name: str = VENV_NAME) -> frozenset:
+    """Returns the directory names pruned when walking sources without a GitIgnore.
+
+    The configured virtual environment is included alongside DEFAULT_IGNORE_DIRS, so a custom
+    `--venv-name` is pruned as well as the default one.
+    """
+    return DEFAULT_IGNORE_DIRS | {venv_name, ".ipynb_checkpoints"}
+
+
+def _is_skipped_dir_name(name: str, skip_dirs: frozenset) -> bool:
+    """Returns True if a directory named `name` is pruned from source walks.
+
+    Literal names are checked against `skip_dirs` with one set lookup; glob entries such as
+    "*.egg-info" are checked with the precompiled `_IGNORE_DIR_GLOB_RE`.
+    """
+    return name in skip_dirs or _IGNORE_DIR_GLOB_RE.match(name) is not None
+
+
+def _walk_source_files(root: Path, suffixes: Tuple[str, ...], venv_name: str = VENV_NAME) -> Iterator[Path]:
+    """Yields every file under root ending in one of suffixes, pruning `_source_walk_skip_dirs(venv_name)` at the directory level.
+
+    Uses `os.scandir` so the entry type comes from the directory listing; pruned subtrees and
+    non-matching files are never stat()ed. Symlinked directories are not followed, matching `rglob`.
+    Unreadable directories are skipped.
+    """
+    skip_dirs = _source_walk_skip_dirs(venv_name)
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not _is_skipped_dir_name(entry.name, skip_dirs):
+                            stack.append(entry.path)
+                    elif entry.name.endswith(suffixes) and entry.is_file():
+                        yield Path(entry.path)
+                except OSError:
+                    continue
+
+
+def _find_all_notebooks(scan_path: Path, ignore_manager: Optional[GitIgnore], venv_name: str = VENV_NAME) -> List[Path]:
     """Finds all .ipynb files within a scope, efficiently respecting ignore patterns.
 
-    This function leverages the GitIgnore class's `get_allowed_files_by_pattern` method
-    to efficiently retrieve only those .ipynb files that are not excluded by any
-    .gitignore rule. This ensures full compliance with .gitignore specifications
-    (including negation and directory precedence) while optimizing file system traversal.
+    With an ignore_manager, the GitIgnore walks only `scan_path`, pruning excluded directories
+    as it goes (`GitIgnore.iter_unignored_files`), so ignored subtrees are never listed. This
+    respects the full .gitignore specification, including negation and directory precedence.
 
     Args:
         scan_path: The root directory to scan for notebooks.
         ignore_manager: An optional GitIgnore object containing patterns.
-                        If None, all .ipynb files are returned.
+                        If None, all .ipynb files outside virtual environments,
+                        VCS metadata and build/cache directories are returned.
+        venv_name: The virtual environment directory pruned when there is no ignore_manager.
 
     Returns:
         A list of Path objects for .ipynb files (filtered by ignore patterns if provided).
     """
     if ignore_manager:
-        # Use the GitIgnore's specialized method to get files matching '.ipynb'
-        # that are also not ignored by any .gitignore rule.
-        notebook_paths = ignore_manager.get_allowed_files_by_pattern("*.ipynb")
-
-        # Filter to ensure paths are within the original scan_path, as get_allowed_files_by_pattern
-        # operates on the GitIgnore's root_dir, which might be broader.
-        # This also ensures we return only files, not directories that might match a pattern.
-        return [p for p in notebook_paths if p.is_file() and p.is_relative_to(scan_path)]
+        return list(ignore_manager.iter_unignored_files(scan_path, (".ipynb",)))
     else:
-        # No ignore manager, return all .ipynb files
-        return [p for p in scan_path.rglob("*.ipynb") if p.is_file()]
+        # No ignore manager: walk the tree, pruning directories that never hold project notebooks.
+        return list(_walk_source_files(scan_path, (".ipynb",), venv_name))
+
+
+def _iter_notebook_code_cells(cells: list) -> Iterator[List[str]]:
+    """Yields the source lines of each code cell in a notebook's `cells` list.
+
+    Notebook JSON stores a cell's source either as one string or as a list of lines;
+    both are normalized to a list here. Markdown/raw cells and malformed entries are skipped.
+    """
+    for cell in cells:
+        if not isinstance(cell, dict) or cell.get("cell_type") != "code":
+            continue
+
+        source_block = cell.get("source", [])
+        if isinstance(source_block, str):
+            yield source_block.splitlines()
+        elif isinstance(source_block, list):
+            yield source_block
+
+
+# Notebooks smaller than this are read with json.load, which is faster than streaming for small files.
+_NOTEBOOK_STREAM_MIN_BYTES = 1024 * 1024
+
+
+def _stream_notebook_cells(nb_path: Path) -> Optional[list]:
+    """Stream-parses a notebook with ijson, keeping only each cell's `cell_type` and `source`.
+
+    Cell outputs and metadata are skipped as parse events rather than being built into objects.
+
+    Returns:
+        The notebook's cells as `{"cell_type": ..., "source": ...}` dicts ([] if there is no
+        `cells` key), or None if the notebook isn't a JSON object or `cells` isn't a list.
+
+    Raises:
+        OSError, ijson.JSONError: If the file can't be read or isn't valid JSON.
+    """
+    cells: Optional[list] = None
+    cells_valid = True
+    cell: Optional[dict] = None
+    with open(nb_path, "rb") as f:
+        for prefix, event, value in ijson.parse(f):
+            if prefix == "":
+                if event not in ("start_map", "map_key", "end_map"):
+                    return None
+            elif prefix == "cells":
+                if event == "start_array":
+                    cells = []
+                elif event != "end_array":
+                    cells, cells_valid = None, False
+            elif cells is None:
+                continue
+            elif prefix == "cells.item":
+                if event == "start_map":
+                    cell = {}
+                    cells.append(cell)
+                elif event == "end_map":
+                    cell = None
+            elif cell is None:
+                continue
+            elif prefix == "cells.item.cell_type":
+                cell["cell_type"] = value
+            elif prefix == "cells.item.source":
+                if event == "string":
+                    cell["source"] = value
+                elif event == "start_array":
+                    cell["source"] = []
+            elif prefix == "cells.item.source.item" and isinstance(cell.get("source"), list):
+                cell["source"].append(value)
+    if not cells_valid:
+        return None
+    return cells if cells is not None else []
+
+
+def _load_notebook_json(nb_path: Path) -> Any:
+    """Parses a notebook file's JSON, with orjson when it is installed.
+
+    Raises:
+        OSError, ValueError: If the notebook can't be read or isn't valid JSON.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(nb_path.read_bytes())
+        except orjson.JSONDecodeError:
+            # orjson rejects invalid UTF-8; json.load below decodes leniently (errors='ignore')
+            # and reports the definitive error.
+            pass
+    with open(nb_path, "r", encoding="utf-8", errors='ignore') as f:
+        return json.load(f)
+
+
+def _load_notebook_cells(nb_path: Path) -> Optional[list]:
+    """Reads the `cells` list of a notebook, stream-parsing large files when ijson is installed.
+
+    Returns:
+        The notebook's cells ([] if there is no `cells` key), or None if the notebook isn't a
+        JSON object or `cells` isn't a list.
+
+    Raises:
+        OSError, ValueError: If the notebook can't be read or isn't valid JSON.
+    """
+    if ijson is not None and os.path.getsize(nb_path) >= _NOTEBOOK_STREAM_MIN_BYTES:
+        try:
+            return _stream_notebook_cells(nb_path)
+        except ijson.JSONError:
+            # _load_notebook_json decodes leniently (errors='ignore') and reports the definitive error.
+            pass
+    nb_content = _load_notebook_json(nb_path)
+    if not isinstance(nb_content, dict):
+        return None
+    cells = nb_content.get("cells", [])
+    return cells if isinstance(cells, list) else None
+
+
+def _notebook_code_source(nb_path: Path) -> str:
+    """Extracts a notebook's code cells as a single Python script, without running `jupyter`.
+
+    IPython magics and shell escapes (lines starting with `%` or `!`) are commented out, much like
+    `jupyter nbconvert --to script` neutralizes them. A cell that still isn't valid Python (e.g. a
+    `%%bash` cell body) is commented out entirely, so one bad cell can't make the whole script
+    unparseable for downstream tools like `pipreqs`.
+
+    Raises:
+        OSError, ValueError: If the notebook can't be read or isn't valid notebook JSON.
+    """
+    cells = _load_notebook_cells(nb_path)
+    if cells is None:
+        raise ValueError(f"Notebook '{nb_path.name}' has no valid 'cells' list.")
+
+    cell_sources: List[str] = []
+    for lines in _iter_notebook_code_cells(cells):
+        code_lines = [line.rstrip("\r\n") for line in lines if isinstance(line, str)]
+        code_lines = [f"# {line}" if line.lstrip().startswith(("%", "!")) else line for line in code_lines]
+        cell_source = "\n".join(code_lines)
+        try:
+            ast.parse(cell_source)
+        except SyntaxError:
+            cell_source = "\n".join(f"# {line}" for line in code_lines)
+        cell_sources.append(cell_source)
+    return "\n\n".join(cell_sources) + "\n"
 
 
 def _convert_notebooks_to_py(notebook_paths: list[Path], temp_dir: Path, project_root: Path, dry_run: bool) -> dict[Path, Path]:
@@ -2745,95 +3239,141 @@ def _convert_notebooks_to_py(notebook_paths: list[Path], temp_dir: Path, project
     This function's return type is critical for the deterministic fallback logic. By returning a dictionary,
     it allows the calling function to know exactly which notebooks were processed successfully.
 
+    Code cells are extracted in-process by `_notebook_code_source`, so neither `jupyter` nor a
+    subprocess per notebook is needed.
+
     Args:
         notebook_paths: A list of Path objects for the notebooks to convert.
         temp_dir: The temporary directory to store the converted Python scripts.
-        dry_run: If True, simulates the action without running commands.
+        dry_run: If True, simulates the action without writing files.
 
     Returns:
         A dictionary mapping the original notebook Path to its successful temporary script Path.
     """
     successful_conversions: dict[Path, Path] = {}
-    # This tool-based method can only run if `jupyter` is available.
-    if not _command_exists("jupyter"):
-        _log_action("nbconvert_check", "WARN", "'jupyter' command not found. Cannot convert notebooks to scripts for tool-based dependency analysis. Will use fallback manual parsing.")
-        return successful_conversions
-
-    for nb_path in notebook_paths:
-        # Create a corresponding python file path in the temp directory.
-        py_path = temp_dir / (nb_path.stem + ".py")
+    for index, nb_path in enumerate(notebook_paths):
+        # Create a corresponding python file path in the temp directory. The index keeps
+        # same-named notebooks from different folders from overwriting each other.
+        py_path = temp_dir / f"{nb_path.stem}_{index}.py"
         if dry_run:
-            _log_action("nbconvert_dry_run", "INFO", f"DRY RUN: Would convert {nb_path.name} to a temporary script for analysis.")
+            _log_action("notebook_export_dry_run", "INFO", f"DRY RUN: Would export {nb_path.name} to a temporary script for analysis.")
             successful_conversions[nb_path] = py_path
             continue
         try:
-            # Execute the conversion.
-            _run_command([
-                "jupyter", "nbconvert", "--to", "script", str(nb_path),
-                "--output", py_path.stem, # nbconvert adds the extension
-                "--output-dir", str(temp_dir)
-            ], f"nbconvert_{nb_path.stem}", suppress_console_output_on_success=True)
-            if py_path.exists():
-                successful_conversions[nb_path] = py_path
-        except subprocess.CalledProcessError as e:
-            # If a single notebook fails to convert, log it and continue with others.
-            _log_action("nbconvert_error", "WARN", f"Failed to convert notebook '{nb_path.name}'. It may be corrupt or have invalid syntax. It will be parsed manually as a fallback.", details={"notebook": str(nb_path), "exception": str(e)})
+            py_path.write_text(_notebook_code_source(nb_path), encoding="utf-8")
+            successful_conversions[nb_path] = py_path
         except Exception as e:
-            # Catch any other unexpected errors during conversion
-            _log_action("nbconvert_error", "WARN", f"Unexpected error converting notebook '{nb_path.name}': {e}. It will be parsed manually as a fallback.", details={"notebook": str(nb_path), "exception": str(e)})
+            # If a single notebook fails to convert, log it and continue with others.
+            _log_action("notebook_export_error", "WARN", f"Failed to export notebook '{nb_path.name}' to a script. It may be corrupt. Only the directly parsed dependencies will be used.", details={"notebook": str(nb_path), "exception": str(e)})
     return successful_conversions
 
 
-def _parse_notebook_manually(nb_path: Path) -> set[tuple[str, str]]:
+def _mirror_sources_for_pipreqs(scan_path: Path, ignore_manager: Optional[GitIgnore], mirror_dir: Path, venv_name: str = VENV_NAME) -> int:
+    """Links the in-scope .py and .ipynb files into mirror_dir, keeping their paths relative to scan_path.
+
+    This lets a single `pipreqs` run cover the project's sources and the exported fallback notebooks
+    together. Files are hard-linked where possible and copied otherwise (e.g. across filesystems).
+    With an ignore_manager the full .gitignore rules decide which files are mirrored; without one,
+    virtual environments (including venv_name), VCS metadata and build/cache directories are pruned.
+
+    Returns:
+        The number of files mirrored.
     """
-    Fallback dependency discovery: Parses a notebook file's JSON directly.
+    if ignore_manager:
+        sources = list(ignore_manager.iter_unignored_files(scan_path, (".py", ".ipynb")))
+    else:
+        sources = list(_walk_source_files(scan_path, (".py", ".ipynb"), venv_name))
+
+    mirrored = 0
+    for src in sources:
+        dest = mirror_dir / src.relative_to(scan_path)
+        try:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(src, dest)
+            except OSError:
+                shutil.copy2(src, dest)
+            mirrored += 1
+        except OSError as e:
+            _log_action("pipreqs_mirror_sources", "WARN", f"Could not include '{src}' in the pipreqs scan.", details={"exception": str(e)})
+    return mirrored
+
+
+# Patterns used while scanning notebook cells, compiled once at import rather than per notebook/token.
+# Heuristic to quickly identify lines that are probably shell commands or IPython magics.
+# MULTILINE so that one `search` over a whole cell can tell whether any of its lines is a shell/magic line.
+_SHELL_COMMAND_RE = re.compile(r"^\s*[!%]", re.MULTILINE)
+# Comprehensive pattern to match various install commands (applied after the leading `!`/`%` is stripped).
+_INSTALL_COMMAND_RE = re.compile(
+    r"^(?:(?:pip3?|python\s+-m\s+pip|uv\s+pip|conda|mamba)\s+install|uv\s+add|poetry\s+add)\s*(.*)",
+    re.IGNORECASE)
+# A basic filter for valid-looking package names/specifiers in install command arguments.
+_VALID_SPEC_RE = re.compile(r"^[\w\-\.]+(?:\[.*\])?(?:[=<>!~]=?.*)?$")
+
+
+def _iter_import_nodes(tree: ast.AST) -> Iterator[Union[ast.Import, ast.ImportFrom]]:
+    """Yields every Import/ImportFrom node in a parsed module, visiting only statement-level nodes.
+
+    Imports are statements and expressions can never contain statements, so expression subtrees
+    (the bulk of any AST) are skipped rather than visited node-by-node as `ast.walk` would.
+    Imports nested in functions, classes, `try`, `if`, `with`, and `match` blocks are still found.
+    """
+    stack: List[ast.AST] = [tree]
+    while stack:
+        node = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.Import, ast.ImportFrom)):
+                yield child
+            elif isinstance(child, (ast.stmt, ast.excepthandler, ast.match_case)):
+                stack.append(child)
+
+
+def _parse_notebook_manually(nb_path: Path) -> tuple[set[tuple[str, str]], bool]:
+    """
+    Primary notebook dependency discovery: Parses a notebook file's JSON directly.
     It uses the Abstract Syntax Tree (AST) for reliable `import` parsing and
     regular expressions for finding shell/magic install commands (e.g., `!pip install`).
-    Returns a set of (canonical_base_name, full_specifier) tuples.
+    This runs in-process, so no `jupyter` subprocess or temporary script is needed.
+
+    Returns:
+        A tuple of (packages, fully_parsed). `packages` is a set of
+        (canonical_base_name, full_specifier) tuples. `fully_parsed` is False when
+        any code cell could not be parsed as Python (e.g., `%%` cell magics), signalling
+        that the caller should fall back to exporting the notebook for `pipreqs` analysis.
     """
     action_name = f"notebook_manual_parse_{nb_path.stem}"
-    _log_action(action_name, "INFO", f"Using hardened fallback parser for '{nb_path.name}'.")
+    _log_action(action_name, "INFO", f"Parsing notebook JSON for '{nb_path.name}'.")
 
     try:
-        with open(nb_path, "r", encoding="utf-8", errors='ignore') as f:
-            nb_content = json.load(f)
+        cells = _load_notebook_cells(nb_path)
     except (FileNotFoundError, IOError, json.JSONDecodeError, Exception) as e:
+        # An unreadable notebook cannot be exported for the fallback either, so don't request one.
         _log_action(action_name, "ERROR", f"Cannot read or parse file '{nb_path.name}'.", details={"type": type(e).__name__, "exception": str(e)})
-        return set()
-
-    # Heuristic to quickly identify lines that are probably shell commands.
-    shell_command_pattern = re.compile(r"^\s*[!%]")
-    # Comprehensive pattern to match various install commands.
-    install_pattern = re.compile(
-        r"^(?:(?:pip3?|python\s+-m\s+pip|uv\s+pip|conda|mamba)\s+install|uv\s+add|poetry\s+add)\s*(.*)",
-        re.IGNORECASE)
+        return set(), True
 
     discovered_packages: Set[Tuple[str, str]] = set()
-    python_code_block: List[str] = []
-    shell_line_buffer = ""
+    fully_parsed = True
+    ignore_set = _get_dynamic_ignore_set()
 
-    cells = nb_content.get("cells", [])
-    if not isinstance(cells, list):
+    if cells is None:
         _log_action(action_name, "WARN", f"Notebook '{nb_path.name}' has malformed 'cells' key (not a list). Skipping.")
-        return set()
-
-    for cell in cells:
-        if not isinstance(cell, dict) or cell.get("cell_type") != "code":
-            continue
-
-        source_block = cell.get("source", [])
-        if isinstance(source_block, str):
-            lines = source_block.splitlines()
-        elif isinstance(source_block, list):
-            lines = source_block
-        else:
-            continue
-
-        for line in lines:
+        return set(), True
+
+    for lines in _iter_notebook_code_cells(cells):
+        # Each cell is parsed in isolation so that a syntax error in one cell (or a
+        # multi-line construct stitched across cell boundaries) doesn't hide the imports in the others.
+        # Lines from a list-style source keep their own newlines; strip them so joining doesn't double-space.
+        cell_code = "\n".join(line.rstrip("\r\n") for line in lines if isinstance(line, str))
+        python_code_block: List[str] = []
+        shell_line_buffer = ""
+        # Most cells contain no shell/magic lines; one regex scan of the cell lets those skip the per-line loop.
+        has_shell_lines = _SHELL_COMMAND_RE.search(cell_code) is not None
+        for line in lines if has_shell_lines else ():
             if not isinstance(line, str):
                 continue
 
-            if shell_command_pattern.match(line):
+            # A line following a `\`-continued shell line belongs to that command, whatever its prefix.
+            if shell_line_buffer or _SHELL_COMMAND_RE.match(line):
                 line_no_comment = line.split('#', 1)[0]
                 stripped_line = line_no_comment.rstrip()
 
@@ -2848,7 +3388,7 @@ def _parse_notebook_manually(nb_path: Path) -> set[tuple[str, str]]:
                 # Strip the leading `!` or `%` before matching the install command.
                 command_body = logical_shell_line.lstrip('!% \t')
 
-                install_match = install_pattern.match(command_body)
+                install_match = _INSTALL_COMMAND_RE.match(command_body)
                 if install_match:
                     # *** CORRECTED LOGIC ***
                     # 1. Get the arguments from the successful match.
@@ -2873,25 +3413,32 @@ def _parse_notebook_manually(nb_path: Path) -> set[tuple[str, str]]:
                 # This is a Python-like line. Append it raw to preserve indentation.
                 python_code_block.append(line)
 
-    if python_code_block:
-        pure_python_code = "\n".join(python_code_block)
-        if pure_python_code.strip():
-            try:
-                tree = ast.parse(pure_python_code)
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            base_pkg = alias.name.split('.')[0].lower()
-                            if base_pkg and base_pkg not in _DYNAMIC_IGNORE_SET:
-                                discovered_packages.add((_canonicalize_pkg_name(base_pkg), base_pkg))
-                    elif isinstance(node, ast.ImportFrom) and node.module:
-                        base_pkg = node.module.split('.')[0].lower()
-                        if base_pkg and base_pkg not in _DYNAMIC_IGNORE_SET:
-                            discovered_packages.add((_canonicalize_pkg_name(base_pkg), base_pkg))
-            except SyntaxError as e:
-                _log_action(action_name, "INFO", "Skipping AST parse due to non-Python syntax.", details={"error": str(e)})
-
-    return discovered_packages
+        if has_shell_lines:
+            pure_python_code = "\n".join(code_line.rstrip("\r\n") for code_line in python_code_block)
+        else:
+            pure_python_code = cell_code
+        if not pure_python_code.strip():
+            continue
+        try:
+            tree = ast.parse(pure_python_code)
+        except SyntaxError as e:
+            _log_action(action_name, "WARN", "Skipping a cell with non-Python syntax; notebook will also be analyzed with the pipreqs fallback.", details={"error": str(e)})
+            fully_parsed = False
+            continue
+        for node in _iter_import_nodes(tree):
+            if isinstance(node, ast.Import):
+                module_names = [alias.name for alias in node.names]
+            elif node.module and not node.level:
+                # Relative imports (`from .utils import x`) refer to local modules, not packages.
+                module_names = [node.module]
+            else:
+                continue
+            for module_name in module_names:
+                base_pkg = module_name.split('.')[0].lower()
+                if base_pkg and base_pkg not in ignore_set:
+                    discovered_packages.add((_canonicalize_pkg_name(base_pkg), base_pkg))
+
+    return discovered_packages, fully_parsed
 
 def _parse_install_tokens(tokens: list[str]) -> set[tuple[str, str]]:
     """
@@ -2908,6 +3455,7 @@ def _parse_install_tokens(tokens: list[str]) -> set[tuple[str, str]]:
         A set of (canonical_base_name, full_specifier) tuples found in the tokens.
     """
     discovered: set[tuple[str, str]] = set()
+    ignore_set = _get_dynamic_ignore_set()
     for part in tokens:
         if not part:
             continue
@@ -2918,9 +3466,10 @@ def _parse_install_tokens(tokens: list[str]) -> set[tuple[str, str]]:
                 _log_action("parse_install_tokens", "WARN", f"Unsupported '-r' flag found in install command and ignored: '{part}'")
             continue
         # A basic filter for valid-looking package names/specifiers.
-        if re.match(r"^[\w\-\.]+(?:\[.*\])?(?:[=<>!~]=?.*)?$", part):
-            base_pkg = _extract_package_name_from_specifier(part)
-            if base_pkg and base_pkg not in _DYNAMIC_IGNORE_SET:
+        if _VALID_SPEC_RE.match(part):
+            # The filter above guarantees a leading name, so a single regex match suffices here.
+            base_pkg = _base_pkg(part)
+            if base_pkg and base_pkg not in ignore_set:
                 canonical_name = _canonicalize_pkg_name(base_pkg)
                 # Add the full specifier as found (e.g., 'pandas==1.2.3').
                 discovered.add((canonical_name, part))
@@ -2934,28 +3483,147 @@ def _parse_install_tokens(tokens: list[str]) -> set[tuple[str, str]]:
 class DiscoveryResult:
     """A structured container for dependency discovery results."""
     def __init__(self):
+        # Also holds the dependencies of notebooks exported for the pipreqs fallback, which are
+        # analyzed together with the scripts in one pipreqs run and can't be told apart.
         self.from_scripts: Set[Tuple[str, str]] = set()
-        self.from_converted_notebooks: Set[Tuple[str, str]] = set()
         self.from_manual_notebooks: Set[Tuple[str, str]] = set()
         self.scan_path: Optional[Path] = None
         self.notebooks_found_count: int = 0
+        self.notebooks_parsed_count: int = 0
         self.notebooks_converted_count: int = 0
         self.notebooks_fallback_count: int = 0
+        # Failures (e.g. a pipreqs crash) that may have left the results incomplete.
+        self.errors: List[str] = []
 
     @property
     def all_unique_dependencies(self) -> Set[Tuple[str, str]]:
-        return self.from_scripts | self.from_converted_notebooks | self.from_manual_notebooks
+        return self.from_scripts | self.from_manual_notebooks
+
+    _SET_FIELDS = ("from_scripts", "from_manual_notebooks")
+    _COUNT_FIELDS = ("notebooks_found_count", "notebooks_parsed_count", "notebooks_converted_count", "notebooks_fallback_count")
+
+    def to_cache_dict(self) -> Dict[str, Any]:
+        """Returns the dependency sets and counts as JSON-serializable data."""
+        data: Dict[str, Any] = {name: sorted(getattr(self, name)) for name in self._SET_FIELDS}
+        data.update({name: getattr(self, name) for name in self._COUNT_FIELDS})
+        return data
+
+    def load_cache_dict(self, data: Dict[str, Any]) -> bool:
+        """Restores the dependency sets and counts from `to_cache_dict` data. Returns False if it is malformed."""
+        try:
+            sets = {name: {(str(canonical), str(spec)) for canonical, spec in data[name]} for name in self._SET_FIELDS}
+            counts = {name: int(data[name]) for name in self._COUNT_FIELDS}
+        except (KeyError, TypeError, ValueError):
+            return False
+        for name, value in {**sets, **counts}.items():
+            setattr(self, name, value)
+        return True
+
+    def _scripts_label(self) -> str:
+        """Describes what `from_scripts` covers: .py scripts, plus any notebooks exported for pipreqs."""
+        if self.notebooks_converted_count:
+            return f".py scripts + {self.notebooks_converted_count} exported notebook(s)"
+        return ".py scripts"
 
     def __str__(self):
         header = f"DiscoveryResult for scope: '{self.scan_path}'"
         return (f"{header}\n{'-' * len(header)}\n"
-                f"  - From .py scripts: {len(self.from_scripts)}\n"
-                f"  - From Converted Notebooks: {len(self.from_converted_notebooks)}\n"
+                f"  - From {self._scripts_label()}: {len(self.from_scripts)}\n"
                 f"  - From Manual-Parse Notebooks: {len(self.from_manual_notebooks)}\n"
                 f"  - Total Unique Dependencies: {len(self.all_unique_dependencies)}")
 
 
-def discover_dependencies_in_scope(scan_path: Path, ignore_manager: Optional[GitIgnore] = None, scan_notebooks: bool = True, dry_run: bool = False, pipreqs_mode: Optional[str] = None) -> DiscoveryResult:
+# Upper bound on threads used to read and parse notebooks concurrently.
+_NOTEBOOK_SCAN_MAX_WORKERS = 8
+
+
+def _parse_notebooks_in_scope(notebook_paths: List[Path], result: DiscoveryResult, action_name: str) -> List[Path]:
+    """Parses notebooks in-process, recording their dependencies and counts on result.
+
+    Parsing notebook JSON directly avoids spawning `jupyter` (a heavy import) and writing
+    temporary scripts for every notebook.
+
+    Returns:
+        The notebooks that could not be fully parsed and need the pipreqs fallback.
+    """
+    def parse_one(nb_path: Path) -> Optional[Tuple[Set[Tuple[str, str]], bool]]:
+        try:
+            return _parse_notebook_manually(nb_path)
+        except Exception as e:
+            _log_action(action_name, "CRITICAL", f"Unrecoverable error parsing '{nb_path.name}'.", details={"exception": str(e)})
+            return None
+
+    # Notebooks are independent, so file reads and parses are spread over a small thread pool.
+    # Threads are used rather than a process pool: worker processes would drop their _log_action
+    # entries (warnings about malformed cells, install commands) from this process's log, and the
+    # parsed results would have to be pickled back. map() preserves input order.
+    max_workers = min(_NOTEBOOK_SCAN_MAX_WORKERS, len(notebook_paths), os.cpu_count() or 1)
+    if max_workers <= 1:
+        # Not worth starting a pool for a single notebook or a single CPU.
+        parse_results = [parse_one(nb_path) for nb_path in notebook_paths]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            parse_results = list(executor.map(parse_one, notebook_paths))
+
+    needs_fallback: List[Path] = []
+    for nb_path, parse_result in zip(notebook_paths, parse_results):
+        if parse_result is None:
+            continue
+        nb_packages, fully_parsed = parse_result
+        result.from_manual_notebooks.update(nb_packages)
+        if fully_parsed:
+            result.notebooks_parsed_count += 1
+        else:
+            needs_fallback.append(nb_path)
+    result.notebooks_fallback_count = len(needs_fallback)
+    return needs_fallback
+
+
+# Bump when discovery logic changes in a way that makes previously cached results stale.
+_DISCOVERY_CACHE_VERSION = 2
+
+
+def _discover_in_scope(result: DiscoveryResult, scan_path: Path, ignore_manager: Optional[GitIgnore], scan_notebooks: bool, dry_run: bool, pipreqs_mode: Optional[str], action_name: str, venv_name: str = VENV_NAME) -> None:
+    """Runs notebook parsing and pipreqs for `discover_dependencies_in_scope`, recording everything on result."""
+    # Notebooks are parsed first so that, if any need the pipreqs fallback, the project's scripts and the
+    # exported notebooks can be analyzed by one pipreqs run rather than paying `uvx` startup twice.
+    notebook_paths = _find_all_notebooks(scan_path, ignore_manager, venv_name) if scan_notebooks else []
+    result.notebooks_found_count = len(notebook_paths)
+    needs_fallback: List[Path] = []
+    if not scan_notebooks:
+        _log_action(action_name, "INFO", "Notebook scanning is disabled.")
+    elif not notebook_paths:
+        _log_action(action_name, "INFO", "No notebooks found in scope.")
+    else:
+        _log_action(action_name, "INFO", f"Phase 1: Analyzing {len(notebook_paths)} notebook(s)...")
+        needs_fallback = _parse_notebooks_in_scope(notebook_paths, result, action_name)
+
+    if not needs_fallback:
+        _log_action(action_name, "INFO", "Phase 2: Analyzing Python scripts...")
+        result.from_scripts = _get_packages_from_pipreqs(scan_path, ignore_manager, dry_run, pipreqs_mode, failures=result.errors, venv_name=venv_name)
+    else:
+        # Fallback: notebooks with non-Python cells (e.g., `%%bash`) have their valid code cells exported
+        # to temporary scripts in-process. The in-scope sources are mirrored next to them so pipreqs
+        # analyzes both in a single run.
+        _log_action(action_name, "INFO", f"Phase 2: Analyzing Python scripts, with the pipreqs fallback for {len(needs_fallback)} notebook(s) that could not be fully parsed directly...")
+        conversion_map: Dict[Path, Path] = {}
+        with tempfile.TemporaryDirectory(prefix="pyuvstarter_") as temp_dir_str:
+            temp_dir = Path(temp_dir_str)
+            notebooks_dir = temp_dir / "notebooks"
+            notebooks_dir.mkdir()
+            conversion_map = _convert_notebooks_to_py(needs_fallback, notebooks_dir, scan_path, dry_run)
+            if dry_run or not conversion_map:
+                result.from_scripts = _get_packages_from_pipreqs(scan_path, ignore_manager, dry_run, pipreqs_mode, failures=result.errors, venv_name=venv_name)
+            else:
+                mirrored = _mirror_sources_for_pipreqs(scan_path, ignore_manager, temp_dir / "scripts", venv_name)
+                _log_action(action_name, "INFO", f"Analyzing {mirrored} project source file(s) and {len(conversion_map)} converted notebook(s) in one pipreqs run...")
+                # The mirror is already filtered by the ignore rules, so no ignore manager is passed. pipreqs
+                # reports one combined list, so these dependencies can't be split between scripts and notebooks.
+                result.from_scripts = _get_packages_from_pipreqs(temp_dir, None, dry_run, pipreqs_mode, failures=result.errors)
+        result.notebooks_converted_count = len(conversion_map)
+
+
+def discover_dependencies_in_scope(scan_path: Path, ignore_manager: Optional[GitIgnore] = None, scan_notebooks: bool = True, dry_run: bool = False, pipreqs_mode: Optional[str] = None, cache_root: Optional[Path] = None, source_files: Optional[Sequence[str]] = None, venv_name: str = VENV_NAME) -> DiscoveryResult:
     """The primary, user-facing function to discover all dependencies within a specific scope.
 
     Args:
@@ -2964,6 +3632,11 @@ def discover_dependencies_in_scope(scan_path: Path, ignore_manager: Optional[Git
         scan_notebooks: Whether to scan Jupyter notebooks
         dry_run: If True, log commands without executing
         pipreqs_mode: Optional mode for pipreqs ('no-pin', 'gt', 'compat')
+        cache_root: If given, results are cached under this project directory and reused while
+                    the sources, .gitignore files, and discovery options are unchanged.
+        source_files: Optional `_list_source_tree_files(scan_path)` listing for the cache key,
+                      to avoid walking the tree again.
+        venv_name: The project's virtual environment directory, which is never scanned.
     """
     action_name = f"discover_deps_{scan_path.name}"
     _log_action(action_name, "INFO", f"Starting scope-aware discovery in '{scan_path}'.")
@@ -2976,42 +3649,25 @@ def discover_dependencies_in_scope(scan_path: Path, ignore_manager: Optional[Git
     else:
         _log_action(action_name, "INFO", "GitIgnore support not provided - will scan all files")
 
-    _log_action(action_name, "INFO", "Phase 1: Analyzing Python scripts...")
-    result.from_scripts = _get_packages_from_pipreqs(scan_path, ignore_manager, dry_run, pipreqs_mode)
-
-    if not scan_notebooks:
-        _log_action(action_name, "INFO", "Phase 2 skipped: notebook scanning is disabled.")
-        return result
-
-    notebook_paths = _find_all_notebooks(scan_path, ignore_manager)
-    result.notebooks_found_count = len(notebook_paths)
-    if not notebook_paths:
-        _log_action(action_name, "INFO", "Phase 2 complete: no notebooks found in scope.")
-        return result
-
-    _log_action(action_name, "INFO", f"Phase 2: Analyzing {len(notebook_paths)} notebook(s)...")
-
-    conversion_map: Dict[Path, Path] = {}
-    with tempfile.TemporaryDirectory(prefix="pyuvstarter_") as temp_dir_str:
-        temp_dir = Path(temp_dir_str)
-        # Convert notebooks to Python scripts for analysis
-        conversion_map = _convert_notebooks_to_py(notebook_paths, temp_dir, scan_path, dry_run)
-        if conversion_map:
-             _log_action(action_name, "INFO", f"Analyzing {len(conversion_map)} converted notebook(s)...")
-             # For temp directory scanning, we don't need gitignore support since these are already filtered converted files
-             result.from_converted_notebooks = _get_packages_from_pipreqs(temp_dir, None, dry_run, pipreqs_mode)
-
-    result.notebooks_converted_count = len(conversion_map)
-    failed_primary_notebooks = set(notebook_paths) - set(conversion_map.keys())
-    result.notebooks_fallback_count = len(failed_primary_notebooks)
-
-    if failed_primary_notebooks:
-        _log_action(action_name, "INFO", f"Using fallback manual parser for {len(failed_primary_notebooks)} notebook(s).")
-        for nb_path in failed_primary_notebooks:
-            try:
-                result.from_manual_notebooks.update(_parse_notebook_manually(nb_path))
-            except Exception as e:
-                _log_action(action_name, "CRITICAL", f"Unrecoverable error parsing '{nb_path.name}'.", details={"exception": str(e)})
+    # Reuse the previous run's results when no source, notebook, or .gitignore changed. pyproject.toml
+    # is deliberately not part of the key: discovery doesn't read it, and `uv add` rewrites it every run.
+    cache_name = f"discovery_{pipreqs_mode or 'pinned'}.json"
+    cache_key = None
+    cache_hit = False
+    if cache_root is not None and not dry_run:
+        manual_patterns = sorted(ignore_manager._manual_patterns) if ignore_manager else None
+        salt = json.dumps([_DISCOVERY_CACHE_VERSION, str(scan_path.resolve()), scan_notebooks, pipreqs_mode, ignore_manager is not None, manual_patterns])
+        cache_key = _compute_source_tree_key(scan_path, salt=salt, config_files=frozenset({GITIGNORE_NAME}), files=source_files, venv_name=venv_name)
+        cached = _load_cache(cache_root, cache_name)
+        cache_hit = cached.get("key") == cache_key and result.load_cache_dict(cached.get("result", {}))
+
+    if cache_hit:
+        _log_action(action_name, "INFO", "Sources are unchanged since the last run; reusing the cached discovery results.")
+    else:
+        _discover_in_scope(result, scan_path, ignore_manager, scan_notebooks, dry_run, pipreqs_mode, action_name, venv_name)
+        # Results from a failed pipreqs run may be incomplete, so they are recomputed next time.
+        if cache_key is not None and not result.errors:
+            _save_cache(cache_root, cache_name, {"key": cache_key, "result": result.to_cache_dict()})
 
     # Update progress tracker intelligence with final comprehensive count
     global _progress_tracker
@@ -3034,12 +3690,11 @@ def generate_discovery_summary(result: DiscoveryResult) -> str:
     ]
 
     if result.from_scripts:
-        summary_lines.append(f"  - Found {len(result.from_scripts)} dependencies in .py scripts.")
+        summary_lines.append(f"  - Found {len(result.from_scripts)} dependencies in {result._scripts_label()}.")
     if result.notebooks_found_count > 0:
-        nb_deps_count = len(result.from_converted_notebooks | result.from_manual_notebooks)
-        summary_lines.append(f"  - Found {nb_deps_count} dependencies in {result.notebooks_found_count} notebook(s).")
-        if result.notebooks_converted_count > 0 or result.notebooks_fallback_count > 0:
-             summary_lines.append(f"    ({result.notebooks_converted_count} analyzed with primary tools, {result.notebooks_fallback_count} with fallback parser)")
+        summary_lines.append(f"  - Found {len(result.from_manual_notebooks)} dependencies in {result.notebooks_parsed_count} directly parsed notebook(s) of {result.notebooks_found_count}.")
+        if result.notebooks_parsed_count > 0 or result.notebooks_fallback_count > 0:
+             summary_lines.append(f"    ({result.notebooks_parsed_count} parsed directly, {result.notebooks_fallback_count} needed pipreqs fallback, {result.notebooks_converted_count} exported)")
 
     total_deps = len(result.all_unique_dependencies)
     if total_deps > 0:
@@ -3052,7 +3707,7 @@ def generate_discovery_summary(result: DiscoveryResult) -> str:
 
 # --- Project and Dependency Handling ---
 
-def _ensure_project_initialized(project_root: Path, dry_run: bool):
+def _ensure_project_initialized(project_root: Path, dry_run: bool, venv_name: str = VENV_NAME):
     """
     Ensures a pyproject.toml exists. If not, runs `uv init` and then checks
     if `main.py` should be removed.
@@ -3067,14 +3722,9 @@ def _ensure_project_initialized(project_root: Path, dry_run: bool):
 
     _log_action(action_name, "INFO", f"'{PYPROJECT_TOML_NAME}' not found. Running `uv init`...")
 
-    # Check for existing Python files before running uv init
-    existing_py_files = list(project_root.rglob("*.py"))
-    # Exclude this script itself if it's in the project root
-    # script_path_in_project = project_root / Path(__file__).name
-    # if script_path_in_project in existing_py_files:
-    #     existing_py_files.remove(script_path_in_project)
-
-    project_had_py_files_before_init = bool(existing_py_files)
+    # Check for existing Python files before running uv init; the walk stops at the first one found
+    # and skips virtual environments and caches, whose .py files aren't project code.
+    project_had_py_files_before_init = next(_walk_source_files(project_root, (".py",), venv_name), None) is not None
     main_py_existed_before_init = main_py_path.exists()
 
     try:
@@ -3121,32 +3771,16 @@ def _get_declared_dependencies(pyproject_path: Path) -> set[str]:
         _log_action(action_name, "WARN", f"'{pyproject_path.name}' not found when trying to read declared dependencies. Assuming none declared yet.")
         return dependencies
 
-    # Dynamic import is necessary here because:
-    # 1. We need to check if tomllib is available (Python 3.11+)
-    # 2. If not, we fall back to the third-party 'toml' package
-    # 3. This function needs to work even if neither is available
-    # We use importlib.import_module to avoid syntax errors on older Python
-    tomllib_module = None
-    tomllib_source = "None"
-    if sys.version_info >= (3, 11):
-        try:
-            tomllib_module = importlib.import_module("tomllib")
-            tomllib_source = "tomllib (Python 3.11+ built-in)"
-        except ImportError:
-            pass
-    if not tomllib_module:
-        try:
-            tomllib_module = importlib.import_module("toml")
-            tomllib_source = "toml (third-party package)"
-        except ImportError:
-            msg = "Cannot parse `pyproject.toml` to read existing dependencies: `tomllib` (Python 3.11+) or `toml` package not available in the environment running this script. Dependency checking against `pyproject.toml` might be incomplete."
-            _log_action(action_name, "WARN", msg + " Script best run with Python 3.11+ or with 'toml' installed in its execution environment.")
-            return dependencies
+    if tomllib is None:
+        msg = "Cannot parse `pyproject.toml` to read existing dependencies: `tomllib` (Python 3.11+) or `toml` package not available in the environment running this script. Dependency checking against `pyproject.toml` might be incomplete."
+        _log_action(action_name, "WARN", msg + " Script best run with Python 3.11+ or with 'toml' installed in its execution environment.")
+        return dependencies
+    # Mirrors the module-level selection: the built-in tomllib on 3.11+, the `toml` package otherwise.
+    tomllib_source = "tomllib (Python 3.11+ built-in)" if sys.version_info >= (3, 11) else "toml (third-party package)"
 
     _log_action(action_name, "INFO", f"Attempting to parse '{pyproject_path.name}' for existing dependencies using {tomllib_source}.")
     try:
-        with open(pyproject_path, "rb") as f:
-            data = tomllib_module.load(f)
+        data = _load_pyproject_toml(pyproject_path)
         project_data = data.get("project", {})
         for dep_section_key in ["dependencies", "optional-dependencies"]:
             deps_source = project_data.get(dep_section_key, [])
@@ -3163,7 +3797,7 @@ def _get_declared_dependencies(pyproject_path: Path) -> set[str]:
                     if pkg_name:
                         dependencies.add(pkg_name)
 
-        _log_action(action_name, "SUCCESS", f"Parsed '{pyproject_path.name}'. Found {len(dependencies)} unique base dependency names declared.", details={"source": tomllib_source, "count": len(dependencies), "found_names": sorted(list(dependencies)) if dependencies else "None"})
+        _log_action(action_name, "SUCCESS", f"Parsed '{pyproject_path.name}'. Found {len(dependencies)} unique base dependency names declared.", details={"source": tomllib_source, "count": len(dependencies), "found_names": sorted(dependencies) if dependencies else "None"})
         return dependencies
     except Exception as e:
         msg = f"Failed to parse '{pyproject_path.name}' using {tomllib_source} to get dependency list. Check its TOML syntax. Dependency list might be incomplete for subsequent checks. Exception: {e}"
@@ -3293,7 +3927,15 @@ def _translate_gitignore_to_pipreqs_ignores(ignore_manager: GitIgnore) -> Tuple[
     return pipreqs_ignores, unsupported_patterns
 
 
-def _get_packages_from_pipreqs(scan_path: Path, ignore_manager: Optional[GitIgnore], dry_run: bool, mode: Optional[str] = None) -> Set[Tuple[str, str]]:
+# Matches each non-blank, non-comment line of requirements-style output; group 1 starts at its first non-space.
+_REQUIREMENT_LINE_RE = re.compile(r"^[^\S\r\n]*([^\s#][^\r\n]*)", re.MULTILINE)
+
+
+# Static prefix of every pipreqs invocation; mode, ignores and the scan path are appended per call.
+_PIPREQS_BASE_ARGS = ("uvx", "pipreqs", "--print", "--scan-notebooks")
+
+
+def _get_packages_from_pipreqs(scan_path: Path, ignore_manager: Optional[GitIgnore], dry_run: bool, mode: Optional[str] = None, failures: Optional[List[str]] = None, venv_name: str = VENV_NAME) -> Set[Tuple[str, str]]:
     """
     Runs the `pipreqs` tool safely and parses its output. This function represents
     the synthesis of the best features from multiple versions.
@@ -3304,6 +3946,10 @@ def _get_packages_from_pipreqs(scan_path: Path, ignore_manager: Optional[GitIgno
                         (from .gitignore, defaults, and CLI).
         dry_run: If True, the command will be logged but not executed.
         mode: Optional pipreqs mode ('no-pin', 'gt', 'compat'). If None, uses default pinned versions.
+        failures: If given, a description of any failure is appended to it, so callers can tell
+                  a failed run from one that found no dependencies.
+        venv_name: The virtual environment directory skipped when counting sources for the
+                   "no dependencies found" warning.
 
     Returns:
         A set of (canonical_base_name, full_specifier) tuples, or an empty set on failure.
@@ -3320,7 +3966,7 @@ def _get_packages_from_pipreqs(scan_path: Path, ignore_manager: Optional[GitIgno
         _log_action(action_name, "INFO", "Running pipreqs with system default Python (UV_PYTHON not set).")
 
     # uvx respects UV_PYTHON environment variable automatically - no --python flag needed
-    pipreqs_args = ["uvx", "pipreqs", "--print", "--scan-notebooks"]
+    pipreqs_args = [*_PIPREQS_BASE_ARGS]
 
     # Add mode if specified (for fallback strategy)
     if mode:
@@ -3345,7 +3991,7 @@ def _get_packages_from_pipreqs(scan_path: Path, ignore_manager: Optional[GitIgno
             pipreqs_args.extend(["--ignore", ",".join(sorted(full_path_ignores))])
 
     # Standard CLI practice: the main subject of the command is the last argument.
-    pipreqs_args.append(str(scan_path))
+    pipreqs_args.append(os.fspath(scan_path))
 
     # Let uvx choose best Python version for external tools
     # Unset UV_PYTHON via env copy so subprocess doesn't inherit project's Python version
@@ -3357,27 +4003,25 @@ def _get_packages_from_pipreqs(scan_path: Path, ignore_manager: Optional[GitIgno
         _log_action(action_name, "INFO", "Unsetting UV_PYTHON for uvx subprocess to allow compatible Python version selection")
 
     try:
-        stdout, _ = _run_command(pipreqs_args, f"{action_name}_exec", dry_run=dry_run, env=uvx_env)
+        stdout, _ = _run_command(pipreqs_args, f"{action_name}_exec", work_dir=scan_path, dry_run=dry_run, env=uvx_env)
 
         # In a dry run, the mock command returns an empty string. Handle this cleanly.
         if not stdout:
             return set()
 
         packages_specs = set()
-        for line in stdout.splitlines():
-            line = line.strip()
-            # Ignore comments and empty lines in the requirements output.
-            if not line or line.startswith("#"):
-                continue
+        # Comments and empty lines in the requirements output are skipped by the regex itself,
+        # so no list of all output lines is built.
+        for line_match in _REQUIREMENT_LINE_RE.finditer(stdout):
+            line = line_match.group(1).rstrip()
 
-            # Use a regex to robustly extract the package name from a PEP 508 string.
+            # Extract the package name from the PEP 508 string with the shared precompiled regex.
             # This correctly handles specifiers like 'package[extra]>=1.0.0' or 'package~=2.2'.
-            match = re.match(r"^([\w\.-]+)", line)
-            if not match:
+            base_name = _base_pkg(line)
+            if not base_name:
                 _log_action(action_name, "WARN", f"Could not parse requirement line from pipreqs output: '{line}'")
                 continue
 
-            base_name = match.group(1).lower()
             packages_specs.add((_canonicalize_pkg_name(base_name), line))
 
         # ENHANCEMENT (from va): Provide more nuanced feedback to the user.
@@ -3385,10 +4029,11 @@ def _get_packages_from_pipreqs(scan_path: Path, ignore_manager: Optional[GitIgno
             _log_action(action_name, "SUCCESS", f"Discovered {len(packages_specs)} unique package(s).")
         else:
             # Check if there are .py or .ipynb files that should have dependencies
-            py_files = list(scan_path.rglob("*.py"))
-            ipynb_files = list(scan_path.rglob("*.ipynb"))
-            if py_files or ipynb_files:
-                warning_msg = f"`pipreqs` found no import-based dependencies despite {len(py_files)} .py and {len(ipynb_files)} .ipynb files present."
+            source_files = list(_walk_source_files(scan_path, (".py", ".ipynb"), venv_name))
+            ipynb_count = sum(1 for p in source_files if p.suffix == ".ipynb")
+            py_count = len(source_files) - ipynb_count
+            if source_files:
+                warning_msg = f"`pipreqs` found no import-based dependencies despite {py_count} .py and {ipynb_count} .ipynb files present."
                 warning_msg += f"\nCommand executed: {' '.join(pipreqs_args)}"
                 warning_msg += f"\nWorking directory: {scan_path.resolve()}"
                 if uv_python:
@@ -3402,8 +4047,8 @@ def _get_packages_from_pipreqs(scan_path: Path, ignore_manager: Optional[GitIgno
                     "command_list": pipreqs_args,  # Exact list for reproduction
                     "working_directory": str(scan_path.resolve()),
                     "environment": _get_env_diagnostics(uvx_env),
-                    "py_files_count": len(py_files),
-                    "ipynb_files_count": len(ipynb_files)
+                    "py_files_count": py_count,
+                    "ipynb_files_count": ipynb_count
                 }
                 _log_action(action_name, "WARN", warning_msg, details=warning_details)
             else:
@@ -3417,13 +4062,202 @@ def _get_packages_from_pipreqs(scan_path: Path, ignore_manager: Optional[GitIgno
         if e.stderr:
             error_details += f"\nStderr: {e.stderr}"
         _log_action(action_name, "ERROR", f"`uvx pipreqs` command failed. Check pyuvstarter_setup_log.json for details.{error_details}\nTry running `uvx pipreqs --help` to verify pipreqs is available.")
+        if failures is not None:
+            failures.append(f"pipreqs exited with code {e.returncode}")
     except Exception as e:
         _log_action(action_name, "ERROR", f"An unexpected error occurred while running `pipreqs`: {e}", details={"exception": str(e)})
+        if failures is not None:
+            failures.append(f"pipreqs failed: {e}")
 
     # Return an empty set on any failure to allow the calling process to continue.
     return set()
 
-def _run_ruff_unused_import_check(project_root: Path, major_action_results: list, dry_run: bool):
+# --- Run-to-Run Caching ---
+# Results of expensive steps are stored under CACHE_DIR_NAME in the project, keyed on a hash of the
+# source tree, so unchanged re-runs can skip subprocesses. Caches are best-effort: any read or write
+# problem is treated as a cache miss and never fails the run.
+
+CACHE_DIR_NAME = ".pyuvstarter_cache"
+# File names (besides *.py/*.ipynb) whose changes must invalidate cached analysis results.
+_CACHE_KEY_CONFIG_FILES = frozenset({PYPROJECT_TOML_NAME, "ruff.toml", ".ruff.toml", GITIGNORE_NAME})
+
+
+def _load_cache(project_root: Path, cache_name: str) -> Dict[str, Any]:
+    """Loads a JSON cache file from the project's cache directory, returning {} if missing or unreadable."""
+    cache_path = project_root / CACHE_DIR_NAME / cache_name
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_cache(project_root: Path, cache_name: str, data: Dict[str, Any]) -> None:
+    """Writes a JSON cache file to the project's cache directory. Failures are logged and ignored."""
+    cache_dir = project_root / CACHE_DIR_NAME
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        with open(cache_dir / cache_name, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+    except (OSError, TypeError, ValueError) as e:
+        _log_action("save_cache", "DEBUG", f"Could not write cache '{cache_name}': {e}")
+
+
+def _list_source_tree_files(project_root: Path, config_files: frozenset = _CACHE_KEY_CONFIG_FILES, venv_name: str = VENV_NAME) -> List[str]:
+    """Lists the files `_compute_source_tree_key` hashes: Python sources, notebooks, and config files.
+
+    Directories in DEFAULT_IGNORE_DIRS (virtual environments, caches, build output) and the configured
+    venv_name are pruned during the walk, so the cost is one directory listing per project directory
+    and installing packages into the environment doesn't change the key.
+
+    The workflow takes this listing once and passes it to the cache-key computations that run
+    back to back (ruff check, dependency discovery) so the tree is walked a single time.
+    """
+    skip_dirs = DEFAULT_IGNORE_DIRS | {venv_name, CACHE_DIR_NAME}
+    files: List[str] = []
+    for dirpath, dirnames, filenames in os.walk(project_root):
+        dirnames[:] = [d for d in dirnames if not _is_skipped_dir_name(d, skip_dirs)]
+        for filename in filenames:
+            if filename.endswith((".py", ".ipynb")) or filename in config_files:
+                files.append(os.path.join(dirpath, filename))
+    return files
+
+
+def _compute_source_tree_key(project_root: Path, salt: str = "", config_files: frozenset = _CACHE_KEY_CONFIG_FILES, files: Optional[Sequence[str]] = None, venv_name: str = VENV_NAME) -> str:
+    """Hashes the paths, modification times, and sizes of all Python sources, notebooks, and config files.
+
+    The cost is one stat per matching file, plus the walk from `_list_source_tree_files`
+    unless a listing is passed in.
+
+    Args:
+        project_root: The directory to walk.
+        salt: Extra text mixed into the key, e.g. the command-line arguments of the cached tool,
+              so that changing how a tool is invoked invalidates its cached results.
+        config_files: File names, besides *.py/*.ipynb, whose changes invalidate the key.
+        files: A listing of project_root from `_list_source_tree_files` whose config files include
+               config_files. The files are still stat()ed here, so edits made since the listing
+               are seen; files created since then are not.
+        venv_name: The virtual environment directory pruned from the walk when files is None.
+
+    Returns:
+        A hex digest that changes whenever a relevant file is added, removed, or modified.
+    """
+    if files is None:
+        files = _list_source_tree_files(project_root, config_files, venv_name)
+    entries: List[Tuple[str, int, int]] = []
+    for file_path in files:
+        if not (file_path.endswith((".py", ".ipynb")) or os.path.basename(file_path) in config_files):
+            continue
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        entries.append((file_path, stat.st_mtime_ns, stat.st_size))
+    hasher = hashlib.blake2b(salt.encode("utf-8"), digest_size=16)
+    for file_path, mtime_ns, size in sorted(entries):
+        hasher.update(f"{file_path}\0{mtime_ns}\0{size}\n".encode("utf-8", errors="surrogateescape"))
+    return hasher.hexdigest()
+
+
+_UV_SYNC_CACHE_NAME = "uv_sync.json"
+
+
+def _compute_uv_lock_inputs_hash(project_root: Path, pyproject_path: Path) -> Optional[str]:
+    """Hashes the contents of pyproject.toml and uv.lock, or returns None if either is missing.
+
+    If this matches the value saved after the last successful `uv sync`, the lock is known to
+    be up to date with pyproject.toml, so the environment can be installed with `--frozen`.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    try:
+        hasher.update(pyproject_path.read_bytes())
+        hasher.update(b"\0")
+        hasher.update((project_root / "uv.lock").read_bytes())
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+
+def _compute_uv_sync_stamp(project_root: Path, pyproject_path: Path, venv_dir: Path) -> Optional[str]:
+    """Hashes everything that decides whether `uv sync` would change the environment.
+
+    Covers `_compute_uv_lock_inputs_hash` plus the stat of the venv's pyvenv.cfg and
+    site-packages directories, which change when the venv is recreated or packages are installed
+    or removed. Comparing the stamp with the one saved after the last successful sync lets an
+    unchanged project skip the sync.
+
+    Returns:
+        A hex digest, or None if pyproject.toml, uv.lock, or the venv is missing (sync is needed).
+    """
+    inputs_hash = _compute_uv_lock_inputs_hash(project_root, pyproject_path)
+    if inputs_hash is None:
+        return None
+    hasher = hashlib.blake2b(inputs_hash.encode("ascii"), digest_size=16)
+    try:
+        venv_markers = [venv_dir / "pyvenv.cfg", *venv_dir.glob("lib/python*/site-packages"), *venv_dir.glob("Lib/site-packages")]
+        for marker in venv_markers:
+            stat = marker.stat()
+            hasher.update(f"\0{marker}\0{stat.st_mtime_ns}\0{stat.st_size}".encode("utf-8", errors="surrogateescape"))
+    except OSError:
+        return None
+    return hasher.hexdigest()
+
+
+# ENHANCED Ruff CLI arguments to check both unused imports and relative imports; the project root is appended per call.
+# uvx respects UV_PYTHON environment variable automatically - no --python flag needed
+_RUFF_CHECK_ARGS = (
+    "uvx",
+    "ruff",
+    "check",
+    # One line per diagnostic; only the path, line, code and message are needed, so
+    # there's no JSON document to build and discard
+    "--output-format=concise",
+    # Check for both unused imports (F401) and relative import issues (TID252)
+    "--select=F401,TID252",
+    "--exit-zero",
+)
+
+# One diagnostic per line of `ruff check --output-format=concise`, e.g.
+# "pkg/mod.py:3:8: F401 [*] `os` imported but unused". Summary lines such as "Found 2 errors." don't match.
+_RUFF_CONCISE_LINE_RE = re.compile(r"^(.*?):(\d+):\d+: (F401|TID252) (?:\[\*\] )?(.*)$", re.MULTILINE)
+
+
+def _get_ruff_check_output(project_root: Path, dry_run: bool, source_files: Optional[Sequence[str]] = None, venv_name: str = VENV_NAME) -> str:
+    """Returns the output of the read-only `ruff check` over project_root, reusing the cached run when possible.
+
+    This only reads the sources, so the workflow starts it in the background while dependency
+    discovery (another read-only `uvx` subprocess) runs; see `_run_ruff_unused_import_check`.
+    source_files is an optional `_list_source_tree_files(project_root)` listing for the cache key;
+    without it, the tree is walked here with venv_name pruned.
+
+    Raises:
+        subprocess.CalledProcessError: If the ruff command fails.
+    """
+    action_name = "ruff_import_analysis"
+    ruff_args = [*_RUFF_CHECK_ARGS, str(project_root)]
+    # Reuse the previous run's ruff output when no source or config file changed since then.
+    # Auto-fixes modify files, which changes the key, so a fixed tree is always re-checked.
+    ruff_cache = _load_cache(project_root, "ruff.json")
+    source_tree_key = _compute_source_tree_key(project_root, salt=" ".join(_RUFF_CHECK_ARGS), files=source_files, venv_name=venv_name)
+    if ruff_cache.get("key") == source_tree_key and isinstance(ruff_cache.get("stdout"), str):
+        _log_action(action_name, "INFO", "No Python sources changed since the last ruff check; reusing its results.")
+        return ruff_cache["stdout"]
+    # Ruff analysis should run even in dry run mode to detect import issues
+    # Only the actual fixing operations should be prevented in dry run mode
+    result_stdout, _ = _run_command(
+        ruff_args,
+        f"{action_name}_exec",
+        work_dir=project_root,  # Reported paths are relative to the working directory
+        suppress_console_output_on_success=True,
+        dry_run=False  # Always run ruff analysis to detect issues
+    )
+    if not dry_run:
+        _save_cache(project_root, "ruff.json", {"key": source_tree_key, "stdout": result_stdout})
+    return result_stdout
+
+
+def _run_ruff_unused_import_check(project_root: Path, major_action_results: list, dry_run: bool, ruff_output: Optional[concurrent.futures.Future] = None, venv_name: str = VENV_NAME):
     """
     Runs ruff via uvx to detect unused imports (F401) and relative import issues (TID252),
     then automatically fixes them for package projects.
@@ -3436,6 +4270,9 @@ def _run_ruff_unused_import_check(project_root: Path, major_action_results: list
         project_root (Path): The root directory of the project to check.
         major_action_results (list): List to append action results for summary.
         dry_run (bool): If True, simulates the check without executing.
+        ruff_output (Future, optional): A future for `_get_ruff_check_output` that the caller
+            started earlier. If None, the check runs here.
+        venv_name (str): The virtual environment directory left out of the check's cache key.
 
     Returns:
         None. Logs results and warnings as appropriate.
@@ -3444,26 +4281,8 @@ def _run_ruff_unused_import_check(project_root: Path, major_action_results: list
     _log_action(action_name, "INFO", "Running ruff to analyze imports (unused imports + relative imports).")
 
     try:
-        # ENHANCED Ruff CLI arguments to check both unused imports and relative imports
-        # uvx respects UV_PYTHON environment variable automatically - no --python flag needed
-        ruff_args = [
-            "uvx",
-            "ruff",
-            "check",
-            "--output-format=json",  # Use --output-format instead of --format for clarity
-            # Check for both unused imports (F401) and relative import issues (TID252)
-            "--select=F401,TID252",
-            "--exit-zero",
-            str(project_root),
-        ]
-        # Ruff analysis should run even in dry run mode to detect import issues
-        # Only the actual fixing operations should be prevented in dry run mode
-        result_stdout, _ = _run_command(
-            ruff_args,
-            f"{action_name}_exec",
-            suppress_console_output_on_success=True,
-            dry_run=False  # Always run ruff analysis to detect issues
-        )
+        # A failed background check re-raises here, so both paths share the error handling below.
+        result_stdout = ruff_output.result() if ruff_output is not None else _get_ruff_check_output(project_root, dry_run, venv_name=venv_name)
         # print the stdout for debugging purposes
         if result_stdout:
             _log_action(action_name, "DEBUG", f"Ruff output:\n{result_stdout.strip()}")
@@ -3475,37 +4294,22 @@ def _run_ruff_unused_import_check(project_root: Path, major_action_results: list
         relative_imports = []
         if result_stdout:
             try:
-                # Parse JSON output from Ruff
-                issues = json.loads(result_stdout)
-
-                for issue in issues:
-                    code = issue.get("code")
-                    filename = issue.get("filename")
-                    line_no = issue.get("location", {}).get("row")
-                    message = issue.get("message")
+                # Ruff runs from project_root, so paths are normally already relative; absolute ones
+                # under the root are trimmed with a string prefix check rather than Path.relative_to.
+                root_prefix = os.path.join(os.fspath(project_root), "")
+                for match in _RUFF_CONCISE_LINE_RE.finditer(result_stdout):
+                    filename, line_no, code, message = match.groups()
+                    message = message.rstrip()
 
-                    # Try to get path relative to project_root, fallback to full path
-                    display_path = filename
-                    try:
-                        display_path = Path(filename).relative_to(project_root).as_posix()
-                    except ValueError:
-                        pass
+                    display_path = filename[len(root_prefix):] if filename.startswith(root_prefix) else filename
+                    display_path = display_path.replace(os.sep, "/")
 
                     if code == "F401":
                         # Unused import
-                        unused.append((display_path, line_no, message))
-                    elif code == "TID252":
-                        # Relative import issue
-                        relative_imports.append((display_path, line_no, message))
-            except json.JSONDecodeError as e:
-                _log_action(
-                    action_name,
-                    "ERROR",
-                    "Failed to parse ruff output (invalid JSON).",
-                    details={"exception": str(e), "ruff_raw_output": result_stdout}
-                )
-                major_action_results.append((action_name, "FAILED_PARSE_OUTPUT"))
-                return
+                        unused.append((display_path, int(line_no), message))
+                    else:
+                        # Relative import issue (TID252)
+                        relative_imports.append((display_path, int(line_no), message))
             except Exception as e:
                 _log_action(
                     action_name,
@@ -3672,7 +4476,6 @@ def _manage_project_dependencies(
     # --- Step 1: Collect all requirements with context ---
     req_path = project_root / LEGACY_REQUIREMENTS_TXT
     req_pkgs_from_file = _get_packages_from_legacy_req_txt(req_path)
-    imported_pkgs_canonical_names = {canonical_name for canonical_name, _ in project_imported_packages}
 
     # This data structure is key. It gathers all "requests" for a package.
     # Key: canonical_name (e.g., "pillow" for PIL imports), Value: list of specifier strings found.
@@ -3682,12 +4485,12 @@ def _manage_project_dependencies(
         # Skip empty canonical names (built-in modules)
         if not canonical_name:
             return
-        if canonical_name not in all_requests:
-            all_requests[canonical_name] = []
-        all_requests[canonical_name].append(specifier)
+        all_requests.setdefault(canonical_name, []).append(specifier)
 
-    # Collect from code imports.
+    # Collect from code imports, recording the imported names in the same pass for the requirements.txt filter.
+    imported_pkgs_canonical_names: set[str] = set()
     for canonical_name, original_spec in project_imported_packages:
+        imported_pkgs_canonical_names.add(canonical_name)
         if canonical_name not in declared_deps_before_management:
             add_request(canonical_name, original_spec)
 
@@ -3709,43 +4512,34 @@ def _manage_project_dependencies(
                 packages_to_skip_due_to_mode.add(full_spec)
 
     # --- Step 2: Intelligently merge requests using safe heuristics ---
-    final_candidates: list[str] = []
+    final_candidates: set[str] = set()
 
     def is_versioned(spec: str) -> bool:
         """Checks if a specifier contains a version constraint."""
         return any(op in spec for op in ["==", ">=", "<=", ">", "<", "~="])
 
     for canonical_name, specs in all_requests.items():
-        if len(specs) == 1:
-            # For single requests, use the canonical name if the spec is unversioned,
-            # or the specific versioned spec if it contains version constraints
-            spec = specs[0]
-            if is_versioned(spec):
-                final_candidates.append(spec)
-            else:
-                final_candidates.append(canonical_name)  # Use canonical name for unversioned packages
-            continue
-
-        # More than one request for this package. Time for heuristics.
+        # Partition the requests in a single pass; unversioned requests all collapse to the canonical name.
         # Rule: A more specific (versioned) specifier wins over a less specific one.
         versioned_specs = {s for s in specs if is_versioned(s)}
-        unversioned_specs = {s for s in specs if not is_versioned(s)}
-
-        if len(versioned_specs) == 1:
-            # The ideal case: one clear version pin was found among generic requests.
-            chosen_spec = list(versioned_specs)[0]
-            _log_action(action_name, "INFO", f"For package '{canonical_name}', multiple requests found. Prioritizing the specific version constraint: '{chosen_spec}'.")
-            final_candidates.append(chosen_spec)
-        elif len(versioned_specs) > 1:
+
+        if not versioned_specs:
+            # Only generic, unversioned requests. Use the canonical name.
+            final_candidates.add(canonical_name)
+        elif len(versioned_specs) == 1:
+            # One clear version pin, possibly found among generic requests.
+            chosen_spec = next(iter(versioned_specs))
+            if len(specs) > 1:
+                _log_action(action_name, "INFO", f"For package '{canonical_name}', multiple requests found. Prioritizing the specific version constraint: '{chosen_spec}'.")
+            final_candidates.add(chosen_spec)
+        else:
             # A true conflict: multiple *different* version constraints.
             # Delegate this impossible task to the expert (`uv`) to get a clear error.
-            _log_action(action_name, "WARN", f"For package '{canonical_name}', multiple conflicting version requests found: {sorted(list(versioned_specs))}. Passing all to `uv` to resolve.")
-            final_candidates.extend(versioned_specs)
-        elif unversioned_specs:
-            # Only generic, unversioned requests. Use the canonical name.
-            final_candidates.append(canonical_name)
+            _log_action(action_name, "WARN", f"For package '{canonical_name}', multiple conflicting version requests found: {sorted(versioned_specs)}. Passing all to `uv` to resolve.")
+            final_candidates.update(versioned_specs)
 
-    final_packages_to_add = sorted(list(set(final_candidates)))
+    # A single sorted, de-duplicated batch so `uv add` resolves and locks once for all packages.
+    final_packages_to_add = sorted(final_candidates)
 
     # --- Step 3: Transparently report the plan ---
     if not final_packages_to_add and not editable_install_needed:
@@ -3756,7 +4550,7 @@ def _manage_project_dependencies(
     if final_packages_to_add:
         _log_action(action_name, "INFO", f"Will ask `uv` to resolve these requirements: {final_packages_to_add}")
     if packages_to_skip_due_to_mode:
-         _log_action(action_name, "INFO", f"Skipping unused requirements.txt entries: {sorted(list(packages_to_skip_due_to_mode))}")
+         _log_action(action_name, "INFO", f"Skipping unused requirements.txt entries: {sorted(packages_to_skip_due_to_mode)}")
     if editable_install_needed:
         _log_action(action_name, "INFO", "An editable install (`-e .`) will be performed.")
     _log_action(action_name, "INFO", "---------------------------------")
@@ -3905,6 +4699,23 @@ def _manage_project_dependencies(
                         _log_action("uv_add_build_failure", "ERROR",
                                   "BUILD FAILURE: Package failed to build from source.\n"
                                   "ACTION: Install system dependencies (e.g., gcc, python-dev) or use pre-built wheels.")
+
+                    # One unbuildable package shouldn't block the rest of the batch.
+                    # Isolate the offender by adding the remaining packages one-by-one.
+                    if len(final_packages_to_add) > 1:
+                        successful_packages, failed_packages = _try_packages_individually(
+                            final_packages_to_add,
+                            project_root,
+                            action_prefix="uv_add_build_fallback"
+                        )
+                        if successful_packages:
+                            _log_action("uv_add_partial_success", "SUCCESS",
+                                      f"✅ Successfully installed {len(successful_packages)}/{len(final_packages_to_add)} packages despite the build failure.")
+                        if failed_packages:
+                            _log_action("uv_add_partial_failure", "WARN",
+                                      f"⚠️  Failed to install {len(failed_packages)}/{len(final_packages_to_add)} packages: " +
+                                      ", ".join(pkg for pkg, _ in failed_packages),
+                                      details={"failed_packages": [{"package": pkg, "reason": reason} for pkg, reason in failed_packages]})
                 else:
                     _log_action(action_name, "ERROR", "Failed to add dependencies. Check the error above.")
 
@@ -3940,7 +4751,7 @@ def _manage_project_dependencies(
         f"Total packages from code (scripts/notebooks) discovered: {len(project_imported_packages)}",
         f"Total packages declared in pyproject.toml initially: {len(declared_deps_before_management)}",
         f"Final requirements passed to `uv`: {final_packages_to_add if final_packages_to_add else 'None'}",
-        f"Skipped unused requirements.txt entries: {sorted(list(packages_to_skip_due_to_mode)) if packages_to_skip_due_to_mode else 'None'}",
+        f"Skipped unused requirements.txt entries: {sorted(packages_to_skip_due_to_mode) if packages_to_skip_due_to_mode else 'None'}",
     ]
     summary_table = "\n".join(summary_lines)
     _log_action(action_name + "_final_summary", "INFO", summary_table)
@@ -3960,6 +4771,21 @@ def _manage_project_dependencies(
     return None  # Success case - no retry needed
 
 
+def _write_text_atomic(path: Path, content: str) -> None:
+    """Writes content to a sibling temporary file, then renames it over path.
+
+    The rename is atomic, so an interrupted run leaves either the old file or the new one,
+    never a truncated file that the next run would have to back up and replace.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_text(content, encoding="utf-8")
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 def _configure_vscode_settings(project_root: Path, venv_python_executable: Path, dry_run: bool):
     """
     Ensure .vscode/settings.json exists and sets python.defaultInterpreterPath to the venv Python.
@@ -3978,23 +4804,25 @@ def _configure_vscode_settings(project_root: Path, venv_python_executable: Path,
         _log_action(action_name, "INFO", f"DRY RUN: Would set 'python.defaultInterpreterPath' to '{venv_python_executable}' in '{settings_file_path.name}'. No actual file changes made.")
         return
 
-    if settings_file_path.exists():
-        try:
-            with open(settings_file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                if content.strip():
-                    settings_data = json.loads(content) # Attempt to parse existing content
-        except json.JSONDecodeError:
-            # Backup invalid JSON before overwriting
-            backup_path = settings_file_path.with_suffix(f".bak_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}")
-            shutil.copy2(settings_file_path, backup_path)
-            backup_made = True
-            _log_action(action_name, "WARN", f"Existing '{settings_file_path.name}' is not valid JSON. Backed up before overwrite.", details={"backup": str(backup_path)})
-            settings_data = {} # Start with empty settings if original was invalid
-        except Exception as e:
-            _log_action(action_name, "WARN", f"Could not read existing '{settings_file_path.name}': {e}. It may be overwritten.", details={"exception": str(e)})
-            settings_data = {} # Start with empty settings if error reading
-
+    # The existing file is read once; its text is kept so an unchanged file isn't rewritten.
+    content = None
+    try:
+        with open(settings_file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        if content.strip():
+            settings_data = json.loads(content) # Attempt to parse existing content
+    except FileNotFoundError:
+        pass
+    except json.JSONDecodeError:
+        # Backup invalid JSON before overwriting
+        backup_path = settings_file_path.with_suffix(f".bak_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}")
+        shutil.copy2(settings_file_path, backup_path)
+        backup_made = True
+        _log_action(action_name, "WARN", f"Existing '{settings_file_path.name}' is not valid JSON. Backed up before overwrite.", details={"backup": str(backup_path)})
+        settings_data = {} # Start with empty settings if original was invalid
+    except Exception as e:
+        _log_action(action_name, "WARN", f"Could not read existing '{settings_file_path.name}': {e}. It may be overwritten.", details={"exception": str(e)})
+        settings_data = {} # Start with empty settings if error reading
 
     # Use ${workspaceFolder} (VSCode substitutes this automatically) with relative path
     # VSCode uses forward slashes even on Windows, so use as_posix()
@@ -4008,8 +4836,11 @@ def _configure_vscode_settings(project_root: Path, venv_python_executable: Path,
 
     final_file_content = json_content_str
 
-    with open(settings_file_path, 'w', encoding='utf-8') as f:
-        f.write(final_file_content)
+    if final_file_content == content:
+        _log_action(action_name, "SUCCESS", f"VS Code 'python.defaultInterpreterPath' already set.\n      Path: {interpreter_path}", details={"interpreter_path": interpreter_path})
+        return
+
+    _write_text_atomic(settings_file_path, final_file_content)
 
     msg = f"VS Code 'python.defaultInterpreterPath' set.{' (Backed up old file)' if backup_made else ''}\n      Path: {interpreter_path}\n      (Managed by pyuvstarter and uv)"
     _log_action(action_name, "SUCCESS", msg, details={"interpreter_path": interpreter_path})
@@ -4063,23 +4894,22 @@ def _ensure_vscode_launch_json(project_root: Path, venv_python_executable: Path,
                 configs = data.get("configurations", [])
 
                 # v7.3 Bug Fix: Check both name AND python interpreter path to prevent stale configurations
-                # Note: venv_python_executable might be relative to project_root, but VS Code usually resolves it
-                # For robustness, comparing against both original string and resolved path.
+                # The entry we write uses the ${workspaceFolder}-relative path; older entries may hold the
+                # original or resolved absolute path. Matching all three keeps reruns from rewriting the file.
                 venv_python_executable_str = str(venv_python_executable)
                 venv_python_executable_resolved_str = str(venv_python_executable.resolve())
 
                 already_present = any(
                     c.get("type") == "python" and
                     c.get("name") == default_config_entry["name"] and
-                    (c.get("python") == venv_python_executable_str or c.get("python") == venv_python_executable_resolved_str)
+                    c.get("python") in (vscode_python_path, venv_python_executable_str, venv_python_executable_resolved_str)
                     for c in configs
                 )
 
                 if not already_present:
                     configs.append(default_config_entry)
                     data["configurations"] = configs
-                    with open(launch_path, "w", encoding="utf-8") as f:
-                        json.dump(data, f, indent=4)
+                    _write_text_atomic(launch_path, json.dumps(data, indent=4))
                     _log_action(action_name, "SUCCESS", "Added launch config for current file to existing launch.json.")
                 else:
                     _log_action(action_name, "SUCCESS", "Launch config for current file and uv venv already present in launch.json.")
@@ -4087,18 +4917,19 @@ def _ensure_vscode_launch_json(project_root: Path, venv_python_executable: Path,
                 backup_path = launch_path.with_suffix(f".bak_{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}")
                 shutil.copy2(launch_path, backup_path)
                 _log_action(action_name, "WARN", f"Existing '{launch_path.name}' is not valid JSON. Backed up before overwrite.", details={"backup": str(backup_path)})
-                with open(launch_path, "w", encoding="utf-8") as f:
-                    json.dump(default_file_content, f, indent=4)
+                _write_text_atomic(launch_path, json.dumps(default_file_content, indent=4))
                 _log_action(action_name, "SUCCESS", "Created new launch.json for current file. (Backed up old file)")
             except Exception as e:
                 _log_action(action_name, "ERROR", f"Could not update existing launch.json: {e}")
         else:
-            with open(launch_path, "w", encoding="utf-8") as f:
-                json.dump(default_file_content, f, indent=4)
+            _write_text_atomic(launch_path, json.dumps(default_file_content, indent=4))
             _log_action(action_name, "SUCCESS", "Created new launch.json for current file.")
     except Exception as e:
         _log_action(action_name, "ERROR", f"Failed to create or update launch.json: {e}")
 
+# The systems that `_detect_notebook_systems` can infer from code cells (rather than metadata).
+_CELL_DETECTABLE_NOTEBOOK_SYSTEMS = frozenset({"jupyter", "polars-notebook"})
+
 def _detect_notebook_systems(nb_path: Path) -> set[str]:
     """
     Detects which notebook execution systems are referenced in a notebook's metadata.
@@ -4114,8 +4945,10 @@ def _detect_notebook_systems(nb_path: Path) -> set[str]:
     """
     systems = set()
     try:
-        with open(nb_path, "r", encoding="utf-8") as f:
-            nb = json.load(f)
+        # Parsed with orjson when it is installed; see _load_notebook_json.
+        nb = _load_notebook_json(nb_path)
+        if not isinstance(nb, dict):
+            raise ValueError("Notebook JSON is not an object.")
 
         # The metadata block is the primary source of truth for environment info.
         meta = nb.get("metadata", {})
@@ -4145,74 +4978,125 @@ def _detect_notebook_systems(nb_path: Path) -> set[str]:
              # VS Code also uses Jupyter kernels.
              systems.add("jupyter")
 
-        # Scan code cells for magics or imports that imply a system.
-        for cell in nb.get("cells", []):
-            if cell.get("cell_type") == "code":
-                for line in cell.get("source", []):
-                    line_lower = line.strip().lower()
-                    if "import polars_notebook" in line_lower:
-                        systems.add("polars-notebook")
-                    # Any common magic command often implies a jupyter-like environment.
-                    if line_lower.startswith("%") and any(x in line_lower for x in ["matplotlib", "pip", "sql"]):
-                        systems.add("jupyter")
-
-    except (json.JSONDecodeError, IOError) as e:
+        # Scan code cells for magics or imports that imply a system, stopping as soon as
+        # every system the cells can reveal has been found.
+        cells = nb.get("cells", [])
+        for lines in _iter_notebook_code_cells(cells if isinstance(cells, list) else []):
+            if systems >= _CELL_DETECTABLE_NOTEBOOK_SYSTEMS:
+                break
+            for line in lines:
+                # Cheap prefilter: only magics and imports can match, so most lines skip the lowercase copy.
+                if not isinstance(line, str) or ("%" not in line and "import" not in line):
+                    continue
+                line_lower = line.strip().lower()
+                if "import polars_notebook" in line_lower:
+                    systems.add("polars-notebook")
+                # Any common magic command often implies a jupyter-like environment.
+                if line_lower.startswith("%") and any(x in line_lower for x in ["matplotlib", "pip", "sql"]):
+                    systems.add("jupyter")
+
+    except (ValueError, IOError) as e:
+        # ValueError covers json.JSONDecodeError and orjson.JSONDecodeError.
         _log_action("notebook_system_detect", "WARN", f"Could not inspect metadata in '{nb_path.name}' due to a file read or JSON parse error.", details={"exception": str(e)})
 
     return systems
 
-def _ensure_notebook_execution_support(project_root: Path, ignore_manager: Optional[GitIgnore], dry_run: bool) -> bool:
+# Cache file (under CACHE_DIR_NAME) mapping each notebook to the systems detected in it.
+_NOTEBOOK_SYSTEMS_CACHE_NAME = "notebook_systems.json"
+
+def _ensure_notebook_execution_support(project_root: Path, ignore_manager: Optional[GitIgnore], dry_run: bool, sync: bool = True, venv_name: str = VENV_NAME) -> bool:
     """
     Ensures dependencies for running notebooks (like `ipykernel`) are installed.
     This is separate from code dependencies (like `pandas`). It detects the
     notebook "system" (e.g., Jupyter) and adds its required packages.
 
+    Args:
+        sync: If False, the packages are only added to pyproject.toml and uv.lock (`uv add --no-sync`);
+              use this when the caller runs `uv sync` afterwards, so the environment is installed once.
+        venv_name: The virtual environment directory skipped when there is no ignore_manager.
+
     Returns:
         True if successful or no action needed, False if errors occurred.
     """
     action_name = "ensure_notebook_execution_support"
-    notebook_paths = _find_all_notebooks(project_root, ignore_manager)
+    notebook_paths = _find_all_notebooks(project_root, ignore_manager, venv_name)
     if not notebook_paths:
         _log_action(action_name, "SUCCESS", "\u2705 No notebooks found - notebook execution support not needed.")  # ✅
         return True
 
     _log_action(action_name, "INFO", "Checking for notebook execution support dependencies (e.g., ipykernel).")
 
-    # Detect all unique systems required by all notebooks in the project.
+    # Detect all unique systems required by all notebooks in the project. Results are cached per
+    # notebook, keyed on its modification time and size, so unchanged notebooks aren't re-read.
+    cache = _load_cache(project_root, _NOTEBOOK_SYSTEMS_CACHE_NAME)
+    updated_cache: Dict[str, Dict[str, Any]] = {}
+    misses: List[Tuple[Path, str, str]] = []
     systems_needed = set()
     for nb_path in notebook_paths:
-        systems_needed.update(_detect_notebook_systems(nb_path))
+        try:
+            stat = nb_path.stat()
+        except OSError:
+            continue
+        cache_key = nb_path.relative_to(project_root).as_posix() if nb_path.is_relative_to(project_root) else str(nb_path)
+        stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+        entry = cache.get(cache_key)
+        if isinstance(entry, dict) and entry.get("stamp") == stamp and isinstance(entry.get("systems"), list):
+            updated_cache[cache_key] = entry
+            systems_needed.update(entry["systems"])
+        else:
+            misses.append((nb_path, cache_key, stamp))
+
+    # Inspecting a notebook is mostly file I/O and JSON parsing, so cache misses are spread over
+    # a small thread pool, as in dependency discovery. map() preserves input order.
+    max_workers = min(_NOTEBOOK_SCAN_MAX_WORKERS, len(misses), os.cpu_count() or 1)
+    miss_paths = [nb_path for nb_path, _, _ in misses]
+    if max_workers <= 1:
+        detected = [_detect_notebook_systems(nb_path) for nb_path in miss_paths]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            detected = list(executor.map(_detect_notebook_systems, miss_paths))
+    for (_, cache_key, stamp), nb_systems in zip(misses, detected):
+        updated_cache[cache_key] = {"stamp": stamp, "systems": sorted(nb_systems)}
+        systems_needed.update(nb_systems)
+    # Entries for deleted notebooks are dropped by rewriting the cache from this run's notebooks.
+    if updated_cache != cache and not dry_run:
+        _save_cache(project_root, _NOTEBOOK_SYSTEMS_CACHE_NAME, updated_cache)
 
     if not systems_needed:
         _log_action(action_name, "SUCCESS", "\u2705 No specific notebook execution system detected - support packages not needed.")  # ✅
         return True
 
-    _log_action(action_name, "INFO", f"Detected required notebook systems: {sorted(list(systems_needed))}.")
+    _log_action(action_name, "INFO", f"Detected required notebook systems: {sorted(systems_needed)}.")
 
     # Get dependencies already declared in pyproject.toml.
     pyproject_path = project_root / PYPROJECT_TOML_NAME
     declared_deps = _get_declared_dependencies(pyproject_path)
 
-    # Determine which required support packages are missing.
-    packages_to_add = set()
-    for system in systems_needed:
-        for pkg in _NOTEBOOK_SYSTEM_DEPENDENCIES.get(system, []):
-            if pkg.lower() not in declared_deps:
-                packages_to_add.add(pkg)
+    # Determine which required support packages are missing, sorted once for logging and `uv add`.
+    # Both sides are PEP 503-normalized once, so e.g. a declared 'polars_notebook' satisfies 'polars-notebook'.
+    from packaging.utils import canonicalize_name
+    declared_normalized = {canonicalize_name(dep) for dep in declared_deps}
+    packages_to_add = sorted({
+        pkg
+        for system in systems_needed
+        for pkg in _NOTEBOOK_SYSTEM_DEPENDENCIES.get(system, [])
+        if canonicalize_name(pkg) not in declared_normalized
+    })
 
     if packages_to_add:
-        _log_action(action_name, "INFO", f"Adding missing notebook execution packages: {sorted(list(packages_to_add))}")
+        _log_action(action_name, "INFO", f"Adding missing notebook execution packages: {packages_to_add}")
         if dry_run:
-            _log_action(action_name, "INFO", f"DRY RUN: Would add notebook execution packages: {sorted(list(packages_to_add))}")
+            _log_action(action_name, "INFO", f"DRY RUN: Would add notebook execution packages: {packages_to_add}")
             return True
         else:
             try:
                 # Use a single `uv add` command for efficiency.
-                _run_command(["uv", "add"] + sorted(list(packages_to_add)), f"{action_name}_uv_add", work_dir=project_root)
-                _log_action(action_name, "SUCCESS", f"Successfully added notebook execution packages: {sorted(list(packages_to_add))}")
+                uv_add_cmd = ["uv", "add"] if sync else ["uv", "add", "--no-sync"]
+                _run_command(uv_add_cmd + packages_to_add, f"{action_name}_uv_add", work_dir=project_root)
+                _log_action(action_name, "SUCCESS", f"Successfully added notebook execution packages: {packages_to_add}")
                 return True
             except Exception as e:
-                _log_action(action_name, "ERROR", f"Failed to add notebook support packages: {e}\n      ACTION: Please try adding them manually: uv add {' '.join(sorted(list(packages_to_add)))}")
+                _log_action(action_name, "ERROR", f"Failed to add notebook support packages: {e}\n      ACTION: Please try adding them manually: uv add {' '.join(packages_to_add)}")
                 return False
     else:
         _log_action(action_name, "SUCCESS", "\u2705 All required notebook execution support packages are already available.")  # ✅
@@ -4255,13 +5139,7 @@ def _detect_project_structure(project_root: Path) -> dict:
 
     # Parse pyproject.toml using existing tomllib implementation
     try:
-        if tomllib is not None:
-            with open(pyproject_path, "rb") as f:
-                config = tomllib.load(f)
-        else:
-            import toml
-            with open(pyproject_path, "r", encoding="utf-8") as f:
-                config = toml.load(f)
+        config = _load_pyproject_toml(pyproject_path)
     except Exception as e:
         _log_action(action_name, "WARN", f"Could not parse pyproject.toml: {e}")
         return result
@@ -4419,7 +5297,7 @@ def _fix_relative_imports(project_root: Path, project_info: dict, dry_run: bool)
             except ValueError:
                 files_affected.add(issue['filename'])
 
-    files_list = sorted(list(files_affected))
+    files_list = sorted(files_affected)
 
     if dry_run:
         _log_action(action_name, "INFO", f"DRY RUN: Would fix relative imports in {len(files_list)} file(s): {', '.join(files_list[:3])}{'...' if len(files_list) > 3 else ''}")
@@ -4542,28 +5420,28 @@ def _perform_gitignore_setup(config: 'CLICommand', ignore_manager: GitIgnore):
             # fresh state (an empty file, then the new patterns).
             ignore_manager.invalidate_cache()
 
-            # This is the FIX for the formatting regression. We iterate through
-            # the dictionary of default entries. For each section, we call
-            # `ignore_manager.save()`, passing the dictionary key as the
-            # comment. This recreates the beautifully structured, sectioned
-            # .gitignore file.
-            patterns_to_write_sections = GITIGNORE_DEFAULT_ENTRIES.copy()
-            patterns_to_write_sections["Python Virtual Environments"].insert(0, f"/{config.venv_name}/")
-            patterns_to_write_sections["Pyuvstarter Specific"] = [f"/{config.log_file_name}"]
-
-            for comment, patterns in patterns_to_write_sections.items():
-                ignore_manager.save(patterns, comment=comment)
+            # This is the FIX for the formatting regression. We pass the
+            # dictionary of default entries to `ignore_manager.save_sections()`,
+            # which writes each section under its dictionary key as the comment.
+            # This recreates the beautifully structured, sectioned .gitignore file.
+            patterns_to_write_sections: Dict[str, Sequence[str]] = dict(GITIGNORE_DEFAULT_ENTRIES)
+            patterns_to_write_sections["Python Virtual Environments"] = (f"/{config.venv_name}/", *GITIGNORE_DEFAULT_ENTRIES["Python Virtual Environments"])
+            patterns_to_write_sections["Pyuvstarter Specific"] = (f"/{config.log_file_name}", f"/{CACHE_DIR_NAME}/")
+
+            ignore_manager.save_sections(patterns_to_write_sections)
         else:
             # This branch handles updating an existing .gitignore file by
             # non-intrusively appending only essential, missing patterns.
             _log_action(action_name, "INFO", f"'{config.gitignore_name}' exists. Ensuring essential patterns are present.")
 
-            patterns_to_ensure_sections = ESSENTIAL_PATTERNS_TO_ENSURE.copy()
-            patterns_to_ensure_sections["Project Specific"] = [f"/{config.venv_name}/", f"/{config.log_file_name}"]
+            patterns_to_ensure_sections: Dict[str, Sequence[str]] = dict(ESSENTIAL_PATTERNS_TO_ENSURE)
+            patterns_to_ensure_sections["Project Specific"] = (f"/{config.venv_name}/", f"/{config.log_file_name}", f"/{CACHE_DIR_NAME}/")
 
-            # Iterate through the essential patterns and append them in sections.
-            for comment, patterns in patterns_to_ensure_sections.items():
-                ignore_manager.save(patterns, comment=f"Essential patterns by pyuvstarter: {comment}")
+            # Append the missing essential patterns in sections, reading and writing the file once.
+            ignore_manager.save_sections({
+                f"Essential patterns by pyuvstarter: {comment}": patterns
+                for comment, patterns in patterns_to_ensure_sections.items()
+            })
 
         _log_action(action_name, "SUCCESS", f"'{config.gitignore_name}' setup complete.")
     except IOError as e:
@@ -4592,6 +5470,48 @@ app = typer.Typer(
 )
 
 # CLICOMMAND: new functionality to repair and keep
+# Startup banner logged as the first action of a run; joined once at import and filled in with str.format.
+_STARTUP_BANNER_TEMPLATE = "\n".join([
+    "🚀 PYUVSTARTER - Modern Python Project Automation",
+    "─" * 60,
+    "Version: {version}",
+    "Project Directory: {project_dir}",
+    "Virtual Environment: {venv_name}",
+    "Dry Run: {dry_run}",
+    "GitIgnore Support: {gitignore}",
+    "Execution Log: {log_file_name}",
+    "─" * 60,
+    "Python Environment:",
+    "  Current Python: {python_version}",
+    "  UV_PYTHON env: {uv_python}",
+    "─" * 60,
+    "This tool will automate project setup using the modern `uv` ecosystem, performing:",
+    " ✓ Initialization: Ensure project structure and `uv` tool availability.",
+    " ✓ GitIgnore Management: Create/update `.gitignore` with best practices.",
+    " ✓ Virtual Environment Setup: Create/verify Python virtual environment.",
+    " ✓ Dependency Management: Discover and sync project dependencies.",
+    " ✓ IDE Configuration: Configure VS Code for a seamless developer experience.",
+    "─" * 60,
+])
+
+# Hints logged when a critical command fails, checked in order against the lowercased command string.
+# Each entry is (substrings, action_name, template); the first entry with a matching substring wins.
+_COMMAND_FAILURE_HINTS = (
+    (("uv pip install", "uv add", "uv sync"), "install_sync_hint",
+     "INSTALLATION/SYNC HINT: A package operation with `uv` failed.\n  - Review `uv`'s error output (logged as FAIL_STDOUT/FAIL_STDERR for the command) for specific package names or reasons.\n  - Ensure the package name is correct and exists on PyPI (https://pypi.org) or your configured index.\n  - Some packages require system-level (non-Python) libraries to be installed first. Check the package's documentation.\n  - You might need to manually edit 'pyproject.toml' and then run `uv sync --python {venv_python}`."),
+    (("pipreqs",), "pipreqs_hint",
+     "PIPReQS HINT: The 'pipreqs' command (run via 'uvx') failed.\n  - This could be due to syntax errors in your Python files that `pipreqs` cannot parse, an internal `pipreqs` issue, or `uvx` failing to execute `pipreqs`.\n  - Try running manually for debug: uvx pipreqs \"{project_dir}\" --ignore \"{venv_name}\" --debug"),
+    (("uv venv",), "uv_venv_hint",
+     "VIRTUAL ENV HINT: `uv venv` command failed.\n  - Ensure `uv` is correctly installed and functional. Check `uv --version`.\n  - Check for issues like insufficient disk space or permissions in the project directory '{project_dir}'."),
+    (("uv tool install",), "uv_tool_install_hint",
+     "UV TOOL INSTALL HINT: `uv tool install` (likely for pipreqs) failed.\n  - Check PyPI connection (https://pypi.org) or your configured package index\n  - Verify `uv` is working: `uv --version`\n  - Try running `uv tool install pipreqs` manually in your terminal"),
+    (("uv init",), "uv_init_hint",
+     "UV INIT HINT: `uv init` command failed.\n  - Ensure `uv` is correctly installed. Try running `uv init` manually in an empty directory to test.\n  - Check for permissions issues in the project directory '{project_dir}'."),
+    (("brew",), "brew_hint",
+     "Homebrew might be required for some installations. Ensure it's installed and working."),
+)
+
+
 class CLICommand(BaseSettings):
     """The Pydantic model defining the application's configuration schema.
 
@@ -4822,12 +5742,13 @@ class CLICommand(BaseSettings):
         The main orchestration logic for `pyuvstarter` resides here, wrapped
         in a robust error-handling block to provide detailed user feedback.
         """
-        # Save the original working directory to restore it in finally block
+        # Recorded in the log's invocation context.
         original_cwd = Path.cwd()
 
-        # Ensure project_dir is the current working directory for all subsequent operations.
-        # This is a critical safety measure for consistent path handling.
-        os.chdir(self.project_dir)
+        # Every path below is built from project_dir and every subprocess gets it as its working
+        # directory, so the process-wide CWD is left alone (safe for library use and worker threads).
+        # Resolving first keeps a relative project_dir meaning the same thing throughout.
+        self.project_dir = self.project_dir.resolve()
 
         # Initialize intelligent output system with config
         set_output_mode(self)
@@ -4851,33 +5772,17 @@ class CLICommand(BaseSettings):
 
         # --- RESTORED & ENHANCED: Detailed Startup Banner ---
         # Python environment diagnostics for troubleshooting version mismatches
-        import sys
-        current_python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
-        uv_python_env = os.environ.get("UV_PYTHON", "not set")
-
-        banner_lines = [
-            "🚀 PYUVSTARTER - Modern Python Project Automation",
-            "─" * 60,
-            f"Version: {_get_project_version()}",
-            f"Project Directory: {self.project_dir}",
-            f"Virtual Environment: {self.venv_name}",
-            f"Dry Run: {'Yes - Preview Only' if self.dry_run else 'No - Making Changes'}",
-            f"GitIgnore Support: {'Enabled' if self.use_gitignore else 'Disabled'}",
-            f"Execution Log: {self.log_file_name}",
-            "─" * 60,
-            "Python Environment:",
-            f"  Current Python: {current_python_version}",
-            f"  UV_PYTHON env: {uv_python_env}",
-            "─" * 60,
-            "This tool will automate project setup using the modern `uv` ecosystem, performing:",
-            " ✓ Initialization: Ensure project structure and `uv` tool availability.",
-            " ✓ GitIgnore Management: Create/update `.gitignore` with best practices.",
-            " ✓ Virtual Environment Setup: Create/verify Python virtual environment.",
-            " ✓ Dependency Management: Discover and sync project dependencies.",
-            " ✓ IDE Configuration: Configure VS Code for a seamless developer experience.",
-            "─" * 60
-        ]
-        _log_action("script_start", "INFO", "\n".join(banner_lines))
+        startup_banner = _STARTUP_BANNER_TEMPLATE.format(
+            version=_get_project_version(),
+            project_dir=self.project_dir,
+            venv_name=self.venv_name,
+            dry_run='Yes - Preview Only' if self.dry_run else 'No - Making Changes',
+            gitignore='Enabled' if self.use_gitignore else 'Disabled',
+            log_file_name=self.log_file_name,
+            python_version=f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
+            uv_python=os.environ.get("UV_PYTHON", "not set"),
+        )
+        _log_action("script_start", "INFO", startup_banner)
 
         # This list will track the status of major actions for the final summary.
         major_action_results: List[Tuple[str, str]] = []
@@ -4904,7 +5809,7 @@ class CLICommand(BaseSettings):
             major_action_results.append(("uv_installed", "SUCCESS"))
 
             # Step 2: Ensure pyproject.toml exists and project is initialized.
-            if not _ensure_project_initialized(self.project_dir, self.dry_run):
+            if not _ensure_project_initialized(self.project_dir, self.dry_run, self.venv_name):
                 error_msg = "Project could not be initialized with 'pyproject.toml'."
                 _log_action("project_init_critical_failure", "ERROR", error_msg)
                 _log_data_global["overall_status"] = "CRITICAL_FAILURE"
@@ -4965,18 +5870,27 @@ class CLICommand(BaseSettings):
             _ensure_tool_available("ruff", major_action_results, self.dry_run, website="https://docs.astral.sh/ruff/")
 
             # Step 6: Discover dependencies from all code sources BEFORE ruff auto-fixes imports.
-            declared_deps = _get_declared_dependencies(pyproject_file_path)
-            discovery_result = discover_dependencies_in_scope(
-                scan_path=self.project_dir,
-                ignore_manager=ignore_manager, # Pass the configured GitIgnore manager.
-                scan_notebooks=True, # Always scan notebooks for dependencies.
-                dry_run=self.dry_run
-            )
-            # Discovery result is logged by discover_dependencies_in_scope() function
-            major_action_results.append(("code_dep_discovery", "SUCCESS"))
+            # Both pipreqs and the ruff check only read the sources, so the ruff check runs in the
+            # background meanwhile; its fixes are applied in Step 7, after discovery has finished.
+            # One walk of the project feeds the cache keys of both.
+            source_files = _list_source_tree_files(self.project_dir, venv_name=self.venv_name)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as ruff_executor:
+                ruff_output = ruff_executor.submit(_get_ruff_check_output, self.project_dir, self.dry_run, source_files, self.venv_name)
+                declared_deps = _get_declared_dependencies(pyproject_file_path)
+                discovery_result = discover_dependencies_in_scope(
+                    scan_path=self.project_dir,
+                    ignore_manager=ignore_manager, # Pass the configured GitIgnore manager.
+                    scan_notebooks=True, # Always scan notebooks for dependencies.
+                    dry_run=self.dry_run,
+                    cache_root=self.project_dir,
+                    source_files=source_files,
+                    venv_name=self.venv_name
+                )
+                # Discovery result is logged by discover_dependencies_in_scope() function
+                major_action_results.append(("code_dep_discovery", "SUCCESS"))
 
-            # Step 7: Run import analysis and auto-fix (unused imports + relative imports) AFTER dependency discovery.
-            _run_ruff_unused_import_check(self.project_dir, major_action_results, self.dry_run)
+                # Step 7: Run import analysis and auto-fix (unused imports + relative imports) AFTER dependency discovery.
+                _run_ruff_unused_import_check(self.project_dir, major_action_results, self.dry_run, ruff_output=ruff_output)
 
             # Step 8: Manage project dependencies (add/remove from pyproject.toml, sync with venv).
             _log_action("manage_project_dependencies", "INFO", "Managing project dependencies via 'pyproject.toml'.")
@@ -5006,7 +5920,9 @@ class CLICommand(BaseSettings):
                     ignore_manager=ignore_manager,
                     scan_notebooks=True,
                     dry_run=self.dry_run,
-                    pipreqs_mode="no-pin"  # This is the key change
+                    pipreqs_mode="no-pin",  # This is the key change
+                    cache_root=self.project_dir,
+                    venv_name=self.venv_name
                 )
 
                 # Retry with unpinned packages
@@ -5265,14 +6181,34 @@ class CLICommand(BaseSettings):
 
             # Step 9: Ensure Jupyter notebook execution support is configured.
             _log_action("ensure_notebook_execution_support", "INFO", "Ensuring Jupyter notebook execution support.")
-            notebook_exec_success = _ensure_notebook_execution_support(self.project_dir, ignore_manager, self.dry_run)
+            # The packages are only locked here; the Step 10 `uv sync` installs them with everything else.
+            notebook_exec_success = _ensure_notebook_execution_support(self.project_dir, ignore_manager, self.dry_run, sync=False, venv_name=self.venv_name)
             major_action_results.append(("notebook_exec_support", "SUCCESS" if notebook_exec_success else "FAILED"))
 
             # Step 10: Perform final uv sync to ensure environment matches pyproject.toml.
             _log_action("uv_final_sync", "INFO", "Performing final sync of environment with 'pyproject.toml' and 'uv.lock'.")
+            venv_dir = self.project_dir / self.venv_name
+            sync_stamp = _compute_uv_sync_stamp(self.project_dir, pyproject_file_path, venv_dir)
+            lock_inputs_hash = _compute_uv_lock_inputs_hash(self.project_dir, pyproject_file_path)
+            sync_cache = {} if self.dry_run else _load_cache(self.project_dir, _UV_SYNC_CACHE_NAME)
             try:
-                _run_command(["uv", "sync", "--python", str(venv_python_executable)], "uv_sync_dependencies_cmd", work_dir=self.project_dir, dry_run=self.dry_run)
-                _log_action("uv_final_sync", "SUCCESS", "Environment synced successfully.")
+                if sync_stamp is not None and sync_cache.get("stamp") == sync_stamp:
+                    # Nothing was added and the venv is untouched since the last successful sync.
+                    _log_action("uv_final_sync", "SUCCESS", "Environment already in sync: 'pyproject.toml', 'uv.lock' and the venv are unchanged since the last sync.")
+                else:
+                    sync_cmd = ["uv", "sync", "--python", str(venv_python_executable)]
+                    if lock_inputs_hash is not None and sync_cache.get("inputs") == lock_inputs_hash:
+                        # Only the venv changed (e.g. it was recreated): uv.lock is known to match
+                        # pyproject.toml, so install it as-is instead of re-resolving.
+                        sync_cmd.insert(2, "--frozen")
+                    _run_command(sync_cmd, "uv_sync_dependencies_cmd", work_dir=self.project_dir, dry_run=self.dry_run)
+                    if not self.dry_run:
+                        # Stamped after the sync, which may rewrite uv.lock and always touches the venv.
+                        _save_cache(self.project_dir, _UV_SYNC_CACHE_NAME, {
+                            "stamp": _compute_uv_sync_stamp(self.project_dir, pyproject_file_path, venv_dir),
+                            "inputs": _compute_uv_lock_inputs_hash(self.project_dir, pyproject_file_path),
+                        })
+                    _log_action("uv_final_sync", "SUCCESS", "Environment synced successfully.")
                 major_action_results.append(("uv_final_sync", "SUCCESS"))
             except subprocess.CalledProcessError:
                 # Sync failed - log the error but don't crash the entire script
@@ -5286,10 +6222,8 @@ class CLICommand(BaseSettings):
                 # Read requires-python from pyproject.toml for guidance
                 requires_python_str = "not specified"
                 try:
-                    if tomllib is not None:
-                        with open(pyproject_file_path, "rb") as f:
-                            pyproject_data = tomllib.load(f)
-                        requires_python_str = pyproject_data.get('project', {}).get('requires-python', 'not specified')
+                    pyproject_data = _load_pyproject_toml(pyproject_file_path)
+                    requires_python_str = pyproject_data.get('project', {}).get('requires-python', 'not specified')
                 except Exception:
                     pass  # If we can't read it, just use default
 
@@ -5367,11 +6301,7 @@ class CLICommand(BaseSettings):
             _log_action("final_summary_table", "INFO", "\n".join(summary_lines))
 
             # Check for any warnings or errors that occurred during the run.
-            errors_or_warnings = any(
-                a.get("status", "").upper() in ("ERROR", "WARN", "FAILED")
-                for a in _log_data_global.get("actions", [])
-            )
-            if errors_or_warnings:
+            if _log_data_global.get("error_warn_count", 0) > 0:
                 warn_msg = f"\n\u26a0\ufe0f  Some warnings/errors occurred during setup. See '{log_file_path.name}' for details."  # ⚠️
                 _log_action("final_warning", "WARN", warn_msg)
                 # Indicate overall status as WARNING if not already ERROR.
@@ -5409,18 +6339,12 @@ class CLICommand(BaseSettings):
             # Provide specific, actionable hints based on the failed command.
             safe_typer_secho(f"\n💥 CRITICAL ERROR: {error_message}", fg=typer.colors.RED, bold=True, err=True)
             cmd_str_lower = failed_cmd_str.lower()
-            if "uv pip install" in cmd_str_lower or "uv add" in cmd_str_lower or "uv sync" in cmd_str_lower:
-                _log_action("install_sync_hint", "WARN", f"INSTALLATION/SYNC HINT: A package operation with `uv` failed.\n  - Review `uv`'s error output (logged as FAIL_STDOUT/FAIL_STDERR for the command) for specific package names or reasons.\n  - Ensure the package name is correct and exists on PyPI (https://pypi.org) or your configured index.\n  - Some packages require system-level (non-Python) libraries to be installed first. Check the package's documentation.\n  - You might need to manually edit 'pyproject.toml' and then run `uv sync --python {venv_python_executable}`.")
-            elif "pipreqs" in cmd_str_lower:
-                _log_action("pipreqs_hint", "WARN", f"PIPReQS HINT: The 'pipreqs' command (run via 'uvx') failed.\n  - This could be due to syntax errors in your Python files that `pipreqs` cannot parse, an internal `pipreqs` issue, or `uvx` failing to execute `pipreqs`.\n  - Try running manually for debug: uvx pipreqs \"{self.project_dir}\" --ignore \"{self.venv_name}\" --debug")
-            elif "uv venv" in cmd_str_lower:
-                _log_action("uv_venv_hint", "WARN", f"VIRTUAL ENV HINT: `uv venv` command failed.\n  - Ensure `uv` is correctly installed and functional. Check `uv --version`.\n  - Check for issues like insufficient disk space or permissions in the project directory '{self.project_dir}'.")
-            elif "uv tool install" in cmd_str_lower:
-                _log_action("uv_tool_install_hint", "WARN", "UV TOOL INSTALL HINT: `uv tool install` (likely for pipreqs) failed.\n  - Check PyPI connection (https://pypi.org) or your configured package index\n  - Verify `uv` is working: `uv --version`\n  - Try running `uv tool install pipreqs` manually in your terminal")
-            elif "uv init" in cmd_str_lower:
-                _log_action("uv_init_hint", "WARN", f"UV INIT HINT: `uv init` command failed.\n  - Ensure `uv` is correctly installed. Try running `uv init` manually in an empty directory to test.\n  - Check for permissions issues in the project directory '{self.project_dir}'.")
-            elif "brew" in cmd_str_lower:
-                _log_action("brew_hint", "WARN", "Homebrew might be required for some installations. Ensure it's installed and working.")
+            for substrings, hint_action, hint_template in _COMMAND_FAILURE_HINTS:
+                if any(sub in cmd_str_lower for sub in substrings):
+                    venv_python = self.project_dir / self.venv_name / ("Scripts" if sys.platform == "win32" else "bin") / ("python.exe" if sys.platform == "win32" else "python")
+                    _log_action(hint_action, "WARN", hint_template.format(
+                        project_dir=self.project_dir, venv_name=self.venv_name, venv_python=venv_python))
+                    break
 
             _save_log(self, checkpoint=CHECKPOINT_SAVE)  # Immediate error checkpoint
             safe_typer_secho("\nSetup aborted due to a critical command failure. See log for details.", fg=typer.colors.RED, err=True)
@@ -5474,13 +6398,6 @@ class CLICommand(BaseSettings):
                 _log_data_global["vscode_launch_json_status"] = vscode_launch_status
                 _save_log(self, checkpoint=FINAL_SAVE)  # Complete final save
 
-            # Restore the original working directory
-            try:
-                os.chdir(original_cwd)
-            except Exception:
-                # If we can't restore the directory, at least don't crash in the finally block
-                pass
-
 # main with app.callback: new functionality to repair and keep
 
 # The `@app.callback(cls=CLICommand)` decorator is the core of the advanced
@@ -265,6 +265,12 @@ PYTHON_TESTS=(
     "test_configuration.py"
     "test_cross_platform.py"
     "test_error_handling.py"
+    "test_notebook_parsing.py"
+    "test_logging.py"
+    "test_run_command.py"
+    "test_caching.py"
+    "test_gitignore.py"
+    "test_vscode.py"
 )
 
 FAILED_TESTS=()
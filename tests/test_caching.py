@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Unit tests for pyuvstarter's caches.
+
+These tests verify that cached results are reused only while the project's sources are
+unchanged. External tools are mocked, so the tests work whether or not `uv` is installed.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Import the functions we're testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pyuvstarter import (
+    CACHE_DIR_NAME,
+    _compute_source_tree_key,
+    _compute_uv_lock_inputs_hash,
+    _compute_uv_sync_stamp,
+    _list_source_tree_files,
+    _ensure_notebook_execution_support,
+    discover_dependencies_in_scope,
+    _get_declared_dependencies,
+    _get_project_version,
+    _installed_distribution_version,
+    _load_cache,
+    _load_pyproject_toml,
+    _run_ruff_unused_import_check,
+    _save_cache,
+)
+
+
+def _bump_mtime(path: Path) -> None:
+    """Moves a file's mtime forward so the change is visible even on coarse-grained filesystems."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestSourceTreeKey(unittest.TestCase):
+    """Test the hash used to detect source changes between runs."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        (self.root / "main.py").write_text("import requests\n")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_key_is_stable_for_unchanged_tree(self):
+        """Test that the key is identical when nothing changed."""
+        self.assertEqual(_compute_source_tree_key(self.root), _compute_source_tree_key(self.root))
+
+    def test_key_changes_when_source_modified(self):
+        """Test that touching a Python file changes the key."""
+        before = _compute_source_tree_key(self.root)
+        _bump_mtime(self.root / "main.py")
+        self.assertNotEqual(before, _compute_source_tree_key(self.root))
+
+    def test_key_changes_when_source_added(self):
+        """Test that adding a notebook changes the key."""
+        before = _compute_source_tree_key(self.root)
+        (self.root / "analysis.ipynb").write_text('{"cells": []}')
+        self.assertNotEqual(before, _compute_source_tree_key(self.root))
+
+    def test_ignored_directories_do_not_affect_key(self):
+        """Test that files inside the virtual environment are not part of the key."""
+        before = _compute_source_tree_key(self.root)
+        venv_dir = self.root / ".venv" / "lib"
+        venv_dir.mkdir(parents=True)
+        (venv_dir / "site.py").write_text("")
+        self.assertEqual(before, _compute_source_tree_key(self.root))
+
+    def test_glob_ignored_directories_are_pruned(self):
+        """Test that directories matching a glob entry such as "*.egg-info" are skipped."""
+        egg_info = self.root / "mypkg.egg-info"
+        egg_info.mkdir()
+        (egg_info / "setup.py").write_text("")
+        (self.root / "main.py").write_text("")
+
+        self.assertEqual(_list_source_tree_files(self.root), [str(self.root / "main.py")])
+
+    def test_custom_venv_is_pruned(self):
+        """Test that installing into a virtual environment with a configured name leaves the key unchanged."""
+        site_packages = self.root / "myenv" / "lib"
+        site_packages.mkdir(parents=True)
+        (self.root / "main.py").write_text("")
+
+        self.assertEqual(_list_source_tree_files(self.root, venv_name="myenv"), [str(self.root / "main.py")])
+        before = _compute_source_tree_key(self.root, venv_name="myenv")
+        (site_packages / "installed.py").write_text("x = 1\n")
+        self.assertEqual(before, _compute_source_tree_key(self.root, venv_name="myenv"))
+
+    def test_shared_listing_gives_same_key(self):
+        """Test that keys computed from one shared listing match keys computed with their own walk."""
+        (self.root / "pyproject.toml").write_text("[project]\n")
+        (self.root / ".gitignore").write_text("build/\n")
+        listing = _list_source_tree_files(self.root)
+        gitignore_only = frozenset({".gitignore"})
+
+        self.assertEqual(_compute_source_tree_key(self.root, files=listing), _compute_source_tree_key(self.root))
+        self.assertEqual(
+            _compute_source_tree_key(self.root, config_files=gitignore_only, files=listing),
+            _compute_source_tree_key(self.root, config_files=gitignore_only),
+        )
+
+    def test_salt_changes_key(self):
+        """Test that different tool arguments produce different keys."""
+        self.assertNotEqual(_compute_source_tree_key(self.root, salt="a"), _compute_source_tree_key(self.root, salt="b"))
+
+
+class TestCacheFiles(unittest.TestCase):
+    """Test loading and saving cache files."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_round_trip(self):
+        """Test that saved data is loaded back unchanged."""
+        _save_cache(self.root, "example.json", {"key": "abc", "values": [1, 2]})
+        self.assertEqual(_load_cache(self.root, "example.json"), {"key": "abc", "values": [1, 2]})
+
+    def test_missing_or_corrupt_cache_is_empty(self):
+        """Test that a missing or corrupt cache behaves like an empty one."""
+        self.assertEqual(_load_cache(self.root, "missing.json"), {})
+        (self.root / CACHE_DIR_NAME).mkdir()
+        (self.root / CACHE_DIR_NAME / "corrupt.json").write_text("{not json")
+        self.assertEqual(_load_cache(self.root, "corrupt.json"), {})
+
+
+# What `ruff check --output-format=concise` prints for the "import os" in setUp's main.py.
+_RUFF_CONCISE_OUTPUT = "main.py:1:8: F401 [*] `os` imported but unused\nFound 1 error.\n"
+
+
+class TestRuffResultCache(unittest.TestCase):
+    """Test that the ruff pre-flight check is skipped for unchanged sources."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        (self.root / "main.py").write_text("import os\n")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._detect_project_structure", return_value={"is_package": False})
+    @patch("pyuvstarter._run_command", return_value=(_RUFF_CONCISE_OUTPUT, ""))
+    def test_second_run_reuses_results(self, mock_run, mock_structure, mock_log):
+        """Test that ruff runs once and the unchanged second run reports the same parsed issue from the cache."""
+        results = []
+        _run_ruff_unused_import_check(self.root, results, dry_run=False)
+        _run_ruff_unused_import_check(self.root, results, dry_run=False)
+
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual([status for _, status in results], ["COMPLETED_WITH_WARNINGS", "COMPLETED_WITH_WARNINGS"])
+        reported = [
+            c.kwargs["details"]["unused_imports_details"]
+            for c in mock_log.call_args_list
+            if "unused_imports_details" in (c.kwargs.get("details") or {})
+        ]
+        self.assertEqual(reported, [[("main.py", 1, "`os` imported but unused")]] * 2)
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._detect_project_structure", return_value={"is_package": False})
+    @patch("pyuvstarter._run_command", return_value=(_RUFF_CONCISE_OUTPUT, ""))
+    def test_modified_source_reruns_ruff(self, mock_run, mock_structure, mock_log):
+        """Test that changing a source file invalidates the cached ruff output."""
+        _run_ruff_unused_import_check(self.root, [], dry_run=False)
+        _bump_mtime(self.root / "main.py")
+        _run_ruff_unused_import_check(self.root, [], dry_run=False)
+
+        self.assertEqual(mock_run.call_count, 2)
+
+
+class TestDiscoveryCache(unittest.TestCase):
+    """Test that dependency discovery is skipped for unchanged sources."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        (self.root / "main.py").write_text("import requests\n")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._get_packages_from_pipreqs", return_value={("requests", "requests==2.31.0")})
+    def test_unchanged_sources_reuse_results(self, mock_pipreqs, mock_log):
+        """Test that the second discovery returns the cached result without running pipreqs."""
+        first = discover_dependencies_in_scope(self.root, cache_root=self.root)
+        second = discover_dependencies_in_scope(self.root, cache_root=self.root)
+
+        self.assertEqual(mock_pipreqs.call_count, 1)
+        self.assertEqual(second.all_unique_dependencies, first.all_unique_dependencies)
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._get_packages_from_pipreqs", return_value={("requests", "requests==2.31.0")})
+    def test_changed_sources_or_mode_rerun_discovery(self, mock_pipreqs, mock_log):
+        """Test that editing a source or changing the pipreqs mode misses the cache."""
+        discover_dependencies_in_scope(self.root, cache_root=self.root)
+        _bump_mtime(self.root / "main.py")
+        discover_dependencies_in_scope(self.root, cache_root=self.root)
+        discover_dependencies_in_scope(self.root, cache_root=self.root, pipreqs_mode="no-pin")
+
+        self.assertEqual(mock_pipreqs.call_count, 3)
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._get_packages_from_pipreqs")
+    def test_failed_pipreqs_run_is_not_cached(self, mock_pipreqs, mock_log):
+        """Test that results from a failed pipreqs run are recomputed next time."""
+        def failing_pipreqs(scan_path, ignore_manager, dry_run, mode=None, failures=None, venv_name=None):
+            failures.append("pipreqs exited with code 1")
+            return set()
+        mock_pipreqs.side_effect = failing_pipreqs
+
+        discover_dependencies_in_scope(self.root, cache_root=self.root)
+        discover_dependencies_in_scope(self.root, cache_root=self.root)
+
+        self.assertEqual(mock_pipreqs.call_count, 2)
+
+
+class TestNotebookSystemsCache(unittest.TestCase):
+    """Test that notebook system detection is cached per notebook."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self.notebook = self.root / "analysis.ipynb"
+        self.notebook.write_text(json.dumps({"metadata": {"kernelspec": {}}, "cells": []}))
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._run_command", return_value=("", ""))
+    @patch("pyuvstarter._get_declared_dependencies", return_value={"jupyter", "ipykernel"})
+    @patch("pyuvstarter._detect_notebook_systems", return_value={"jupyter"})
+    def test_unchanged_notebooks_are_not_reinspected(self, mock_detect, mock_declared, mock_run, mock_log):
+        """Test that only new or modified notebooks are inspected on later runs."""
+        self.assertTrue(_ensure_notebook_execution_support(self.root, None, dry_run=False))
+        self.assertTrue(_ensure_notebook_execution_support(self.root, None, dry_run=False))
+        self.assertEqual(mock_detect.call_count, 1)
+
+        _bump_mtime(self.notebook)
+        self.assertTrue(_ensure_notebook_execution_support(self.root, None, dry_run=False))
+        self.assertEqual(mock_detect.call_count, 2)
+        mock_run.assert_not_called()
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._run_command", return_value=("", ""))
+    @patch("pyuvstarter._get_declared_dependencies", return_value=set())
+    def test_systems_from_all_notebooks_are_combined(self, mock_declared, mock_run, mock_log):
+        """Test that systems detected across several notebooks are all installed."""
+        (self.root / "quarto.ipynb").write_text(json.dumps({"metadata": {"quarto": {}}, "cells": []}))
+        (self.root / "polars.ipynb").write_text(json.dumps({
+            "metadata": {"authors": []},
+            "cells": [{"cell_type": "code", "source": ["import polars_notebook\n"]}],
+        }))
+
+        self.assertTrue(_ensure_notebook_execution_support(self.root, None, dry_run=False))
+
+        self.assertEqual(mock_run.call_args[0][0], ["uv", "add", "ipykernel", "jupyter", "polars-notebook", "quarto"])
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._run_command", return_value=("", ""))
+    @patch("pyuvstarter._get_declared_dependencies", return_value=set())
+    def test_packages_can_be_added_without_syncing(self, mock_declared, mock_run, mock_log):
+        """Test that sync=False leaves installation to the caller's later `uv sync`."""
+        self.assertTrue(_ensure_notebook_execution_support(self.root, None, dry_run=False, sync=False))
+
+        self.assertEqual(mock_run.call_args[0][0], ["uv", "add", "--no-sync", "ipykernel", "jupyter"])
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._run_command", return_value=("", ""))
+    @patch("pyuvstarter._get_declared_dependencies", return_value={"polars_notebook", "jupyter"})
+    def test_declared_names_match_after_normalization(self, mock_declared, mock_run, mock_log):
+        """Test that a declared 'polars_notebook' satisfies the required 'polars-notebook'."""
+        (self.root / "polars.ipynb").write_text(json.dumps({
+            "metadata": {},
+            "cells": [{"cell_type": "code", "source": "import polars_notebook\n"}],
+        }))
+
+        self.assertTrue(_ensure_notebook_execution_support(self.root, None, dry_run=False))
+
+        self.assertEqual(mock_run.call_args[0][0], ["uv", "add", "ipykernel"])
+
+
+class TestPyprojectCache(unittest.TestCase):
+    """Test that pyproject.toml is parsed once per version of the file."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.pyproject = Path(self._temp_dir.name) / "pyproject.toml"
+        self.pyproject.write_text('[project]\nname = "demo"\ndependencies = ["requests>=2"]\n')
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_unchanged_file_is_parsed_once(self):
+        """Test that repeated reads of an unchanged file reuse the parsed data."""
+        self.assertIs(_load_pyproject_toml(self.pyproject), _load_pyproject_toml(self.pyproject))
+
+    @patch("pyuvstarter._log_action")
+    def test_modified_file_is_reparsed(self, mock_log):
+        """Test that rewriting the file, as `uv add` does, is picked up."""
+        self.assertEqual(_get_declared_dependencies(self.pyproject), {"requests"})
+        self.pyproject.write_text('[project]\nname = "demo"\ndependencies = ["requests>=2", "numpy"]\n')
+        _bump_mtime(self.pyproject)
+        self.assertEqual(_get_declared_dependencies(self.pyproject), {"requests", "numpy"})
+
+
+class TestProjectVersionCache(unittest.TestCase):
+    """Test that installed distribution versions are looked up once per run."""
+
+    def setUp(self):
+        _installed_distribution_version.cache_clear()
+
+    def tearDown(self):
+        _installed_distribution_version.cache_clear()
+
+    @patch("pyuvstarter.importlib.metadata.version", return_value="1.2.3")
+    def test_metadata_is_queried_once(self, mock_version):
+        """Test that repeated version lookups reuse the first importlib.metadata result."""
+        self.assertEqual(_get_project_version(None, "demo"), "1.2.3")
+        self.assertEqual(_get_project_version(None, "demo"), "1.2.3")
+        mock_version.assert_called_once_with("demo")
+
+
+class TestUvSyncStamp(unittest.TestCase):
+    """Test the stamp that lets an unchanged project skip the final `uv sync`."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self.pyproject = self.root / "pyproject.toml"
+        self.pyproject.write_text('[project]\nname = "demo"\n')
+        (self.root / "uv.lock").write_text("version = 1\n")
+        self.venv = self.root / ".venv"
+        self.site_packages = self.venv / "lib" / "python3.12" / "site-packages"
+        self.site_packages.mkdir(parents=True)
+        (self.venv / "pyvenv.cfg").write_text("home = /usr/bin\n")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _stamp(self):
+        return _compute_uv_sync_stamp(self.root, self.pyproject, self.venv)
+
+    def test_stamp_is_stable_for_unchanged_project(self):
+        """Test that nothing changed means the same stamp."""
+        self.assertIsNotNone(self._stamp())
+        self.assertEqual(self._stamp(), self._stamp())
+
+    def test_dependency_or_venv_changes_change_stamp(self):
+        """Test that editing pyproject.toml or installing into the venv changes the stamp."""
+        before = self._stamp()
+        self.pyproject.write_text('[project]\nname = "demo"\ndependencies = ["requests"]\n')
+        after_pyproject = self._stamp()
+        _bump_mtime(self.site_packages)
+        after_install = self._stamp()
+
+        self.assertEqual(len({before, after_pyproject, after_install}), 3)
+
+    def test_lock_inputs_ignore_venv_changes(self):
+        """Test that a recreated venv changes the stamp but not the pyproject/lock hash used for --frozen."""
+        inputs_before, stamp_before = _compute_uv_lock_inputs_hash(self.root, self.pyproject), self._stamp()
+        _bump_mtime(self.venv / "pyvenv.cfg")
+
+        self.assertEqual(_compute_uv_lock_inputs_hash(self.root, self.pyproject), inputs_before)
+        self.assertNotEqual(self._stamp(), stamp_before)
+
+    def test_missing_lock_or_venv_has_no_stamp(self):
+        """Test that a project without uv.lock or a venv always syncs."""
+        (self.venv / "pyvenv.cfg").unlink()
+        self.assertIsNone(self._stamp())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Unit tests for idempotent .gitignore updates made by the GitIgnore class.
+
+These tests write to a temporary directory only, so they work whether or not `uv` is installed.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pathspec import GitIgnoreSpec
+
+# Import the classes we're testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pyuvstarter import GitIgnore
+
+
+class TestSaveSections(unittest.TestCase):
+    """Test appending commented pattern blocks to .gitignore."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self.gitignore = self.root / ".gitignore"
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_only_missing_patterns_are_appended(self):
+        """Test that existing and repeated patterns are skipped and empty sections omitted."""
+        self.gitignore.write_text("# mine\n.venv/\n", encoding="utf-8")
+
+        GitIgnore(self.root).save_sections({
+            "Environments": [".venv/", "venv/"],
+            "Caches": ["__pycache__/", "venv/"],
+            "Already present": [".venv/"],
+        })
+
+        self.assertEqual(
+            self.gitignore.read_text(encoding="utf-8"),
+            "# mine\n.venv/\n\n# Environments\nvenv/\n\n# Caches\n__pycache__/\n",
+        )
+
+    def test_unchanged_file_is_not_rewritten(self):
+        """Test that the file is left untouched when every pattern already exists."""
+        self.gitignore.write_text(".venv/", encoding="utf-8")
+
+        GitIgnore(self.root).save_sections({"Environments": [".venv/"]})
+
+        self.assertEqual(self.gitignore.read_text(encoding="utf-8"), ".venv/")
+
+    def test_existing_content_is_preserved_byte_for_byte(self):
+        """Test that new blocks are appended without rewriting existing lines."""
+        self.gitignore.write_bytes(b"build/\r\n")
+
+        GitIgnore(self.root).save_sections({"Logs": ["*.log"]})
+
+        self.assertTrue(self.gitignore.read_bytes().startswith(b"build/\r\n"))
+        self.assertIn("# Logs\n*.log", self.gitignore.read_text(encoding="utf-8"))
+
+    def test_save_matches_single_section(self):
+        """Test that save() still appends one commented block."""
+        GitIgnore(self.root).save(["*.log"], comment="Logs")
+
+        self.assertEqual(self.gitignore.read_text(encoding="utf-8"), "# Logs\n*.log\n")
+
+
+class TestIsIgnored(unittest.TestCase):
+    """Test the parent-directory exclusion check in is_ignored."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name).resolve()
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_excluded_directories_are_memoized(self):
+        """Test that each ancestor directory is matched once across many files beneath it."""
+        # match_file returns True for ignored paths; everything under build/ is excluded.
+        with patch.object(GitIgnore, "match_file", autospec=True,
+                          side_effect=lambda self, path: path.startswith("build")) as mock_match:
+            checker = GitIgnore(self.root, manual_patterns=["*.log"], read_gitignore_files=False)
+            ignored = [checker.is_ignored(self.root / "build" / "lib" / f"m{i}.py") for i in range(5)]
+            kept = [checker.is_ignored(self.root / "src" / f"m{i}.py") for i in range(5)]
+
+        self.assertEqual(ignored, [True] * 5)
+        self.assertEqual(kept, [False] * 5)
+        matched_dirs = [c.args[1] for c in mock_match.call_args_list if c.args[1].endswith("/")]
+        self.assertEqual(sorted(matched_dirs), ["build/lib/", "src/"])
+
+    def test_invalidate_cache_clears_memo(self):
+        """Test that invalidating the patterns also forgets memoized directory results."""
+        with patch.object(GitIgnore, "match_file", return_value=True):
+            checker = GitIgnore(self.root, manual_patterns=["*.log"], read_gitignore_files=False)
+            self.assertTrue(checker.is_ignored(self.root / "build" / "m.py"))
+        checker.invalidate_cache()
+        with patch.object(GitIgnore, "match_file", return_value=False):
+            self.assertFalse(checker.is_ignored(self.root / "build" / "m.py"))
+
+    def test_directory_patterns_use_trailing_slash(self):
+        """Test that a directory-only pattern excludes the directory and files re-included beneath it."""
+        spec = GitIgnoreSpec.from_lines(["build/", "!build/keep.py"])
+        (self.root / "build").mkdir()
+        with patch.object(GitIgnore, "match_file", autospec=True,
+                          side_effect=lambda self, path: spec.match_file(path)):
+            checker = GitIgnore(self.root, manual_patterns=["*.log"], read_gitignore_files=False)
+            self.assertTrue(checker.is_ignored(self.root / "build"))
+            self.assertTrue(checker.is_ignored(self.root / "build" / "keep.py"))
+            self.assertFalse(checker.is_ignored(self.root / "src" / "keep.py"))
+
+    def test_known_directory_skips_filesystem_check(self):
+        """Test that is_dir=True applies directory-only patterns even to paths that don't exist."""
+        checker = GitIgnore(self.root, manual_patterns=["cache/"], read_gitignore_files=False)
+        self.assertTrue(checker.is_ignored(self.root / "cache", is_dir=True))
+        self.assertFalse(checker.is_ignored(self.root / "cache"))
+
+
+class TestLazyCompilation(unittest.TestCase):
+    """Test that .gitignore files are read and compiled only when a match is requested."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name).resolve()
+        (self.root / ".gitignore").write_text("*.log\n", encoding="utf-8")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_patterns_compiled_on_first_match_and_after_save(self):
+        """Test that construction does no work and save() makes the next match re-read the file."""
+        checker = GitIgnore(self.root)
+        self.assertNotIn("patterns", checker.__dict__)
+
+        self.assertTrue(checker.is_ignored(self.root / "run.log"))
+        self.assertFalse(checker.is_ignored(self.root / "build" / "out.txt"))
+
+        checker.save(["build/"], "Build output")
+        self.assertTrue(checker.is_ignored(self.root / "build" / "out.txt"))
+
+    def test_filter_paths_matches_is_ignored(self):
+        """Test that the batch filter keeps exactly the paths is_ignored reports as not ignored."""
+        (self.root / ".gitignore").write_text("build/\n!build/keep.py\n*.log\n", encoding="utf-8")
+        checker = GitIgnore(self.root)
+        paths = [self.root / p for p in ("a.py", "run.log", "build/keep.py", "src/b.py", "a.py")]
+        paths.append(self.root.parent / "outside.log")
+
+        self.assertEqual(checker.filter_paths(paths), [p for p in paths if not checker.is_ignored(p)])
+        self.assertEqual(checker.filter_paths(paths), [paths[0], paths[3], paths[4], paths[5]])
+
+    def test_relative_and_unnormalized_paths_match_like_absolute_ones(self):
+        """Test that paths needing resolution are matched the same as the string fast path."""
+        checker = GitIgnore(self.root)
+        self.assertTrue(checker.is_ignored(self.root / "src" / ".." / "run.log"))
+        self.assertFalse(checker.is_ignored(self.root / ".." / "run.log"))
+        self.assertTrue(checker.is_ignored(os.path.relpath(self.root / "run.log")))
+
+
+class TestNestedGitignore(unittest.TestCase):
+    """Test that patterns from nested .gitignore files only apply beneath their own directory."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name).resolve()
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_venv_gitignore_does_not_ignore_project(self):
+        """Test that the '*' written into .venv/.gitignore by `uv venv` only ignores the venv."""
+        (self.root / ".venv").mkdir()
+        (self.root / ".venv" / ".gitignore").write_text("*\n", encoding="utf-8")
+        checker = GitIgnore(self.root)
+
+        self.assertTrue(checker.is_ignored(self.root / ".venv" / "pyvenv.cfg"))
+        self.assertFalse(checker.is_ignored(self.root / "main.py"))
+
+    def test_nested_patterns_are_scoped(self):
+        """Test unanchored, anchored, directory and negated patterns in a nested .gitignore."""
+        (self.root / "sub").mkdir()
+        (self.root / "sub" / ".gitignore").write_text("*.tmp\n/top.txt\nout/\n!keep.tmp\n", encoding="utf-8")
+        checker = GitIgnore(self.root)
+
+        self.assertTrue(checker.is_ignored(self.root / "sub" / "deep" / "a.tmp"))
+        self.assertFalse(checker.is_ignored(self.root / "a.tmp"))
+        self.assertFalse(checker.is_ignored(self.root / "sub" / "keep.tmp"))
+        self.assertTrue(checker.is_ignored(self.root / "sub" / "top.txt"))
+        self.assertFalse(checker.is_ignored(self.root / "sub" / "deep" / "top.txt"))
+        self.assertTrue(checker.is_ignored(self.root / "sub" / "x" / "out" / "f.py"))
+        self.assertFalse(checker.is_ignored(self.root / "out" / "f.py"))
+
+
+class TestPrunedWalk(unittest.TestCase):
+    """Test that ignored directories are pruned while walking."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name).resolve()
+        for rel in ("main.py", "notes.txt", "src/app.py", "build/lib/gen.py", "src/cache/tmp.py"):
+            (self.root / rel).parent.mkdir(parents=True, exist_ok=True)
+            (self.root / rel).write_text("")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_ignored_directories_are_not_descended(self):
+        """Test that excluded directories are removed in place and their files never checked."""
+        ignored = {"build/", "src/cache/"}
+        with patch.object(GitIgnore, "match_file", autospec=True,
+                          side_effect=lambda self, path: path in ignored) as mock_match:
+            checker = GitIgnore(self.root, manual_patterns=["*.log"], read_gitignore_files=False)
+            files = sorted(p.relative_to(self.root).as_posix() for p in checker.iter_unignored_files(suffixes=(".py",)))
+
+        self.assertEqual(files, ["main.py", "src/app.py"])
+        checked = {c.args[1] for c in mock_match.call_args_list}
+        self.assertNotIn("build/lib/", checked)
+        self.assertNotIn("src/cache/tmp.py", checked)
+
+    def test_no_patterns_skips_matching(self):
+        """Test that a project without any .gitignore rules is walked without calling the matcher."""
+        checker = GitIgnore(self.root)
+        with patch.object(GitIgnore, "match_file") as mock_match, patch.object(GitIgnore, "match_files") as mock_batch:
+            files = sorted(p.relative_to(self.root).as_posix() for p in checker.iter_unignored_files(suffixes=(".py",)))
+            self.assertFalse(checker.is_ignored(self.root / "build" / "lib" / "gen.py"))
+
+        self.assertEqual(files, ["build/lib/gen.py", "main.py", "src/app.py", "src/cache/tmp.py"])
+        mock_match.assert_not_called()
+        mock_batch.assert_not_called()
+
+    def test_walk_is_limited_to_start_dir(self):
+        """Test that only the requested subtree is walked."""
+        with patch.object(GitIgnore, "match_file", return_value=False):
+            checker = GitIgnore(self.root, manual_patterns=["*.log"], read_gitignore_files=False)
+            files = sorted(p.relative_to(self.root).as_posix() for p in checker.iter_unignored_files(self.root / "src"))
+
+        self.assertEqual(files, ["src/app.py", "src/cache/tmp.py"])
+
+    def test_filter_dirs_accepts_root_and_nested_paths(self):
+        """Test that filter_dirs builds root-relative directory paths for the root and subdirectories."""
+        with patch.object(GitIgnore, "match_file", autospec=True,
+                          side_effect=lambda self, path: path in {"build/", "src/cache/"}):
+            checker = GitIgnore(self.root, manual_patterns=["*.log"], read_gitignore_files=False)
+            top, nested = ["build", "src"], ["cache", "core"]
+            checker.filter_dirs(self.root, top)
+            checker.filter_dirs(str(self.root / "src"), nested)
+            with self.assertRaises(ValueError):
+                checker.filter_dirs(self.root.parent, [])
+
+        self.assertEqual((top, nested), (["src"], ["core"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Unit tests for the structured JSON log helpers.
+
+These tests exercise the log writer and log bookkeeping directly, without running
+the full setup pipeline, so they work whether or not `uv` is installed.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Import the functions we're testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pyuvstarter
+from pyuvstarter import ProgressTracker, _log_action, _write_log_to_disk
+
+
+class TestWriteLogToDisk(unittest.TestCase):
+    """Test the crash-safe JSON log writer."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.log_path = Path(self._temp_dir.name) / "log.json"
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_unicode_is_written_unescaped(self):
+        """Test that non-ASCII paths and messages are written as UTF-8, not \\u escapes."""
+        log_data = {"project_root": "/home/josé/プロジェクト", "actions": [{"message": "✅ done"}]}
+
+        self.assertTrue(_write_log_to_disk(self.log_path, log_data))
+
+        raw = self.log_path.read_text(encoding="utf-8")
+        self.assertIn("プロジェクト", raw)
+        self.assertNotIn("\\u", raw)
+        self.assertEqual(json.loads(raw), log_data)
+
+    def test_unserializable_data_returns_false(self):
+        """Test that serialization failures are reported rather than raised."""
+        self.assertFalse(_write_log_to_disk(self.log_path, {"bad": object()}))
+
+    def test_json_fallback_matches_orjson(self):
+        """Test that the log reads back the same with and without orjson installed."""
+        log_data = {"overall_status": "SUCCESS", "actions": [{"action": "uv_add", "details": {"count": 2}}]}
+
+        self.assertTrue(_write_log_to_disk(self.log_path, log_data))
+        with patch("pyuvstarter.orjson", None):
+            fallback_path = self.log_path.with_name("fallback.json")
+            self.assertTrue(_write_log_to_disk(fallback_path, log_data))
+
+        self.assertEqual(json.loads(self.log_path.read_text(encoding="utf-8")), log_data)
+        self.assertEqual(json.loads(fallback_path.read_text(encoding="utf-8")), log_data)
+
+
+class TestLogAction(unittest.TestCase):
+    """Test the bookkeeping _log_action keeps alongside the actions list."""
+
+    @patch("pyuvstarter._progress_tracker", None)
+    def test_error_and_warning_actions_are_counted(self):
+        """Test that only ERROR/WARN/FAILED actions count towards the final warning."""
+        with patch.dict(pyuvstarter._log_data_global, {"actions": [], "error_warn_count": 0}, clear=True):
+            _log_action("step_one", "INFO", "started")
+            _log_action("step_two", "warn", "odd")
+            _log_action("step_three", "ERROR", "broke")
+
+            self.assertEqual(pyuvstarter._log_data_global["error_warn_count"], 2)
+            self.assertEqual(len(pyuvstarter._log_data_global["actions"]), 3)
+
+
+class TestSummaryUsesProjectDir(unittest.TestCase):
+    """Test that the end-of-run summary looks for files in the project, not the working directory."""
+
+    def setUp(self):
+        self._project_dir = tempfile.TemporaryDirectory()
+        self._other_dir = tempfile.TemporaryDirectory()
+        self.project = Path(self._project_dir.name)
+        (self.project / "pyproject.toml").write_text("[project]\n")
+        (self.project / ".git").mkdir()
+        # The working directory holds a different file, which must not be listed.
+        (Path(self._other_dir.name) / "uv.lock").write_text("")
+        self._saved_cwd = os.getcwd()
+        os.chdir(self._other_dir.name)
+
+    def tearDown(self):
+        os.chdir(self._saved_cwd)
+        self._project_dir.cleanup()
+        self._other_dir.cleanup()
+
+    @patch("pyuvstarter.get_uv_run_command", return_value="uv run main.py")
+    def test_summary_run_from_another_directory(self, mock_run_cmd):
+        """Test that files and the git hint are based on the project directory."""
+        tracker = ProgressTracker(SimpleNamespace(project_dir=self.project, venv_name=".venv", verbose=False))
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            tracker.show_intelligent_summary()
+
+        summary = output.getvalue()
+        self.assertIn("pyproject.toml", summary)
+        self.assertNotIn("uv.lock — ", summary)
+        self.assertIn("Commit your changes", summary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Unit tests for in-process notebook dependency parsing.
+
+This module tests that notebooks are parsed directly from their JSON (no `jupyter`
+subprocess), and that the script-export + pipreqs path is only used as a fallback for notebooks
+whose code cannot be fully parsed as Python.
+
+Tests are designed to be platform-independent using mocks, so they work reliably
+whether or not `jupyter`, `uv`, or `pipreqs` are installed.
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Import the functions we're testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pyuvstarter
+from pyuvstarter import (
+    _base_pkg,
+    _detect_notebook_systems,
+    _find_all_notebooks,
+    _load_notebook_cells,
+    _notebook_code_source,
+    _parse_notebook_manually,
+    discover_dependencies_in_scope,
+    generate_discovery_summary,
+)
+
+
+def _write_notebook(path: Path, cell_sources: list) -> Path:
+    """Writes a minimal notebook with one code cell per entry in cell_sources."""
+    cells = [{"cell_type": "code", "source": source} for source in cell_sources]
+    path.write_text(json.dumps({"cells": cells}), encoding="utf-8")
+    return path
+
+
+class TestParseNotebookManually(unittest.TestCase):
+    """Test the in-process JSON + AST notebook parser."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_imports_and_install_commands_are_discovered(self):
+        """Test that imports and `!pip install` specifiers are both collected."""
+        nb = _write_notebook(self.root / "nb.ipynb", [
+            ["import numpy as np\n", "from pandas import DataFrame\n"],
+            "!pip install requests==2.31.0",
+        ])
+        packages, fully_parsed = _parse_notebook_manually(nb)
+
+        self.assertTrue(fully_parsed)
+        self.assertIn(("numpy", "numpy"), packages)
+        self.assertIn(("pandas", "pandas"), packages)
+        self.assertIn(("requests", "requests==2.31.0"), packages)
+
+    def test_cells_are_parsed_independently(self):
+        """Test that a syntax error in one cell doesn't hide imports from other cells."""
+        nb = _write_notebook(self.root / "nb.ipynb", [
+            ["from sklearn.model_selection import (\n", "    train_test_split,\n", ")\n"],
+            "result = (\n",
+            "import matplotlib.pyplot as plt\n",
+        ])
+        packages, fully_parsed = _parse_notebook_manually(nb)
+
+        self.assertFalse(fully_parsed)
+        self.assertIn(("scikit-learn", "sklearn"), packages)
+        self.assertIn(("matplotlib", "matplotlib"), packages)
+
+    def test_nested_imports_found_and_relative_imports_skipped(self):
+        """Test that imports inside blocks are found and relative imports aren't treated as packages."""
+        nb = _write_notebook(self.root / "nb.ipynb", [
+            "try:\n    import yaml\nexcept ImportError:\n    yaml = None\n",
+            "def load():\n    from bs4 import BeautifulSoup\n    return BeautifulSoup\n",
+            "from .helpers import util\n",
+        ])
+        packages, fully_parsed = _parse_notebook_manually(nb)
+
+        self.assertTrue(fully_parsed)
+        self.assertEqual({canonical for canonical, _ in packages}, {"pyyaml", "beautifulsoup4"})
+
+    def test_shell_only_and_continued_install_cells(self):
+        """Test that shell-only cells don't request the fallback and `\\` continuations are joined."""
+        nb = _write_notebook(self.root / "nb.ipynb", [
+            ["!pip install \\\n", "    httpx  # client\n"],
+            ["import numpy\n", "%matplotlib inline\n", "import scipy\n"],
+        ])
+        packages, fully_parsed = _parse_notebook_manually(nb)
+
+        self.assertTrue(fully_parsed)
+        self.assertEqual(packages, {("httpx", "httpx"), ("numpy", "numpy"), ("scipy", "scipy")})
+
+    def test_stdlib_imports_are_ignored(self):
+        """Test that standard library imports are not reported as dependencies."""
+        nb = _write_notebook(self.root / "nb.ipynb", ["import os\nimport json\n"])
+        packages, fully_parsed = _parse_notebook_manually(nb)
+
+        self.assertTrue(fully_parsed)
+        self.assertEqual(packages, set())
+
+    def test_unreadable_notebook_does_not_request_fallback(self):
+        """Test that invalid JSON is reported as parsed, since the fallback cannot help either."""
+        nb = self.root / "broken.ipynb"
+        nb.write_text("{not json", encoding="utf-8")
+        packages, fully_parsed = _parse_notebook_manually(nb)
+
+        self.assertTrue(fully_parsed)
+        self.assertEqual(packages, set())
+
+
+class TestBasePkg(unittest.TestCase):
+    """Test base package name extraction from specifiers."""
+
+    def test_strips_extras_versions_and_whitespace(self):
+        """Test that extras, version operators and surrounding whitespace are removed."""
+        self.assertEqual(_base_pkg("requests[security]>=2.25"), "requests")
+        self.assertEqual(_base_pkg("  Django ~= 4.2"), "django")
+        self.assertEqual(_base_pkg("pandas!=1.0"), "pandas")
+        self.assertEqual(_base_pkg("zope.interface==6.0"), "zope.interface")
+
+    def test_invalid_specifier_returns_empty(self):
+        """Test that specifiers without a leading name produce an empty string."""
+        self.assertEqual(_base_pkg("==1.0"), "")
+        self.assertEqual(_base_pkg(""), "")
+
+
+class TestNotebookCodeSource(unittest.TestCase):
+    """Test in-process export of notebook code cells to a script."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_magics_and_invalid_cells_are_commented_out(self):
+        """Test that the exported script is valid Python and keeps the valid imports."""
+        nb = _write_notebook(self.root / "nb.ipynb", [
+            ["%matplotlib inline\n", "import numpy as np\n"],
+            "%%bash\nls -la | grep foo\n",
+            "!pip install requests\nimport requests\n",
+        ])
+        script = _notebook_code_source(nb)
+
+        compile(script, "nb.py", "exec")
+        self.assertIn("\nimport numpy as np", script)
+        self.assertIn("# %%bash", script)
+        self.assertIn("# ls -la | grep foo", script)
+        self.assertIn("# !pip install requests", script)
+
+    def test_invalid_json_raises(self):
+        """Test that a corrupt notebook raises so the caller can log and skip it."""
+        nb = self.root / "broken.ipynb"
+        nb.write_text("{not json", encoding="utf-8")
+        with self.assertRaises(ValueError):
+            _notebook_code_source(nb)
+
+
+class TestLoadNotebookCells(unittest.TestCase):
+    """Test reading notebook cells with and without streaming."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    @unittest.skipIf(pyuvstarter.ijson is None, "ijson is not installed")
+    @patch("pyuvstarter._NOTEBOOK_STREAM_MIN_BYTES", 0)
+    def test_streamed_cells_match_json_load(self):
+        """Test that streaming keeps code sources and drops outputs."""
+        nb = self.root / "nb.ipynb"
+        nb.write_text(json.dumps({"cells": [
+            {"cell_type": "markdown", "source": "# Title"},
+            {"cell_type": "code", "source": ["import numpy\n", "x = 1\n"],
+             "outputs": [{"data": {"image/png": "A" * 1000}}], "metadata": {"cells": []}},
+            {"cell_type": "code", "source": "import pandas"},
+        ], "metadata": {}}), encoding="utf-8")
+
+        self.assertEqual(_load_notebook_cells(nb), [
+            {"cell_type": "markdown", "source": "# Title"},
+            {"cell_type": "code", "source": ["import numpy\n", "x = 1\n"]},
+            {"cell_type": "code", "source": "import pandas"},
+        ])
+
+    @patch("pyuvstarter._NOTEBOOK_STREAM_MIN_BYTES", 0)
+    def test_malformed_notebooks(self):
+        """Test that non-object notebooks and non-list cells return None, and missing cells []."""
+        cases = {"[]": None, '{"cells": {"item": {}}}': None, '{"metadata": {}}': []}
+        for content, expected in cases.items():
+            nb = self.root / "nb.ipynb"
+            nb.write_text(content, encoding="utf-8")
+            self.assertEqual(_load_notebook_cells(nb), expected, content)
+
+
+    def test_invalid_utf8_is_decoded_leniently(self):
+        """Test that undecodable bytes are dropped rather than failing the whole notebook."""
+        nb = self.root / "nb.ipynb"
+        nb.write_bytes(b'{"cells": [{"cell_type": "code", "source": "import numpy # \xff"}]}')
+
+        self.assertEqual(_load_notebook_cells(nb), [{"cell_type": "code", "source": "import numpy # "}])
+
+
+class TestDetectNotebookSystems(unittest.TestCase):
+    """Test detection of the notebook systems a notebook needs to run."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_metadata_and_cells_are_inspected(self):
+        """Test that kernelspec metadata and polars_notebook imports are both detected."""
+        nb = self.root / "nb.ipynb"
+        nb.write_text(json.dumps({
+            "metadata": {"kernelspec": {"name": "python3"}},
+            "cells": [{"cell_type": "code", "source": ["import polars_notebook as pn\n"]}],
+        }), encoding="utf-8")
+
+        self.assertEqual(_detect_notebook_systems(nb), {"jupyter", "polars-notebook"})
+
+    def test_string_sources_and_magics(self):
+        """Test that single-string cell sources are scanned line by line for magics."""
+        nb = self.root / "nb.ipynb"
+        nb.write_text(json.dumps({
+            "metadata": {"authors": []},
+            "cells": [{"cell_type": "code", "source": "x = 1\n%matplotlib inline"}],
+        }), encoding="utf-8")
+
+        self.assertEqual(_detect_notebook_systems(nb), {"jupyter"})
+
+    @patch("pyuvstarter._log_action")
+    def test_unreadable_notebook_detects_nothing(self, mock_log):
+        """Test that corrupt or non-object notebooks are logged and skipped."""
+        for content in ("{not json", "[]"):
+            nb = self.root / "nb.ipynb"
+            nb.write_text(content, encoding="utf-8")
+            self.assertEqual(_detect_notebook_systems(nb), set())
+
+
+class TestFindAllNotebooks(unittest.TestCase):
+    """Test notebook discovery when no .gitignore rules are available."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_ignored_directories_are_pruned(self):
+        """Test that notebooks in environments, VCS metadata and checkpoints are not returned."""
+        for sub in ("analysis", ".venv/share", ".git", "node_modules/pkg", ".ipynb_checkpoints"):
+            (self.root / sub).mkdir(parents=True)
+            _write_notebook(self.root / sub / "nb.ipynb", [])
+        _write_notebook(self.root / "top.ipynb", [])
+        (self.root / "analysis" / "notes.txt").write_text("")
+
+        found = _find_all_notebooks(self.root, None)
+
+        self.assertEqual(sorted(found), sorted([self.root / "top.ipynb", self.root / "analysis" / "nb.ipynb"]))
+
+    def test_custom_venv_name_is_pruned(self):
+        """Test that a virtual environment with a configured, non-default name is not scanned."""
+        (self.root / "myenv" / "share").mkdir(parents=True)
+        _write_notebook(self.root / "myenv" / "share" / "nb.ipynb", [])
+        _write_notebook(self.root / "top.ipynb", [])
+
+        self.assertEqual(_find_all_notebooks(self.root, None, venv_name="myenv"), [self.root / "top.ipynb"])
+
+
+class TestNotebookDiscoveryStrategy(unittest.TestCase):
+    """Test that discovery prefers in-process parsing over the pipreqs fallback."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    @patch("pyuvstarter._get_packages_from_pipreqs", return_value=set())
+    @patch("pyuvstarter._convert_notebooks_to_py", return_value={})
+    def test_parsable_notebooks_skip_fallback(self, mock_convert, mock_pipreqs):
+        """Test that the script-export fallback is never invoked when every notebook parses directly."""
+        _write_notebook(self.root / "a.ipynb", ["import scipy\n"])
+        _write_notebook(self.root / "b.ipynb", ["import pandas\n"])
+
+        result = discover_dependencies_in_scope(self.root)
+
+        mock_convert.assert_not_called()
+        self.assertEqual(result.notebooks_found_count, 2)
+        self.assertEqual(result.notebooks_parsed_count, 2)
+        self.assertEqual(result.notebooks_fallback_count, 0)
+        self.assertEqual({dep[0] for dep in result.all_unique_dependencies}, {"scipy", "pandas"})
+
+    @patch("pyuvstarter._get_packages_from_pipreqs", return_value=set())
+    @patch("pyuvstarter._convert_notebooks_to_py", return_value={})
+    def test_unparsable_notebook_uses_fallback(self, mock_convert, mock_pipreqs):
+        """Test that only notebooks with non-Python syntax are handed to the fallback."""
+        _write_notebook(self.root / "clean.ipynb", ["import scipy\n"])
+        magic_nb = _write_notebook(self.root / "magic.ipynb", ["%%time\nimport pandas\nx = (\n"])
+
+        result = discover_dependencies_in_scope(self.root)
+
+        mock_convert.assert_called_once()
+        self.assertEqual(mock_convert.call_args[0][0], [magic_nb])
+        self.assertEqual(result.notebooks_parsed_count, 1)
+        self.assertEqual(result.notebooks_fallback_count, 1)
+
+    @patch("pyuvstarter._get_packages_from_pipreqs")
+    def test_fallback_and_scripts_share_one_pipreqs_run(self, mock_pipreqs):
+        """Test that project scripts and exported notebooks are analyzed by a single pipreqs run."""
+        (self.root / "pkg").mkdir()
+        (self.root / "pkg" / "app.py").write_text("import flask\n")
+        (self.root / ".venv").mkdir()
+        (self.root / ".venv" / "site.py").write_text("import ignored\n")
+        _write_notebook(self.root / "magic.ipynb", ["%%time\nimport pandas\nx = (\n"])
+
+        scanned = []
+        def fake_pipreqs(scan_path, ignore_manager, dry_run, mode=None, failures=None, venv_name=None):
+            scanned.extend(sorted(p.relative_to(scan_path).as_posix() for p in scan_path.rglob("*") if p.is_file()))
+            return {("flask", "flask")}
+        mock_pipreqs.side_effect = fake_pipreqs
+
+        result = discover_dependencies_in_scope(self.root)
+
+        mock_pipreqs.assert_called_once()
+        self.assertEqual(scanned, ["notebooks/magic_0.py", "scripts/magic.ipynb", "scripts/pkg/app.py"])
+        self.assertEqual(result.notebooks_converted_count, 1)
+        self.assertIn(("flask", "flask"), result.all_unique_dependencies)
+        # The combined run's dependencies are reported as coming from scripts and exported notebooks.
+        self.assertIn("Found 1 dependencies in .py scripts + 1 exported notebook(s).", generate_discovery_summary(result))
+
+
+if __name__ == "__main__":
+    unittest.main()
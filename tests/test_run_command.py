@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Unit tests for the subprocess helpers used to invoke `uv` and other tools.
+
+Tests mock `subprocess.run` so they work reliably whether or not `uv` is installed.
+"""
+
+import concurrent.futures
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Import the functions we're testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import pyuvstarter
+from pyuvstarter import (
+    _command_exists,
+    _get_packages_from_pipreqs,
+    _remember_executable_path,
+    _run_command,
+    _run_ruff_unused_import_check,
+)
+
+
+def _completed(stdout: str = "") -> MagicMock:
+    """Builds a fake CompletedProcess with the given stdout."""
+    return MagicMock(returncode=0, stdout=stdout, stderr="")
+
+
+class TestResolvedExecutables(unittest.TestCase):
+    """Test that verified executables are launched by absolute path."""
+
+    def setUp(self):
+        self._saved = dict(pyuvstarter._resolved_executables)
+        pyuvstarter._resolved_executables.clear()
+
+    def tearDown(self):
+        pyuvstarter._resolved_executables.clear()
+        pyuvstarter._resolved_executables.update(self._saved)
+
+    @patch("pyuvstarter.shutil.which", return_value="/opt/bin/uv")
+    def test_remember_executable_path_caches_resolved_path(self, mock_which):
+        """Test that a found command is cached and its path returned."""
+        self.assertEqual(_remember_executable_path("uv"), "/opt/bin/uv")
+        self.assertEqual(pyuvstarter._resolved_executables, {"uv": "/opt/bin/uv"})
+
+    @patch("pyuvstarter.shutil.which", return_value=None)
+    def test_remember_executable_path_ignores_missing_command(self, mock_which):
+        """Test that a missing command is not cached."""
+        self.assertIsNone(_remember_executable_path("uv"))
+        self.assertEqual(pyuvstarter._resolved_executables, {})
+
+    @patch("pyuvstarter.shutil.which", side_effect=[None, "/opt/bin/uv"])
+    def test_command_exists_only_memoizes_found_commands(self, mock_which):
+        """Test that a missing command is probed again but a found one is not."""
+        self.assertFalse(_command_exists("uv"))
+        self.assertTrue(_command_exists("uv"))
+        self.assertTrue(_command_exists("uv"))
+        self.assertEqual(mock_which.call_count, 2)
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter.subprocess.run", return_value=_completed("uv 0.8.0"))
+    def test_run_command_uses_cached_path(self, mock_run, mock_log):
+        """Test that _run_command executes the cached absolute path."""
+        pyuvstarter._resolved_executables["uv"] = "/opt/bin/uv"
+
+        stdout, _ = _run_command(["uv", "--version"], "test_uv_version", work_dir=Path.cwd())
+
+        self.assertEqual(stdout, "uv 0.8.0")
+        self.assertEqual(mock_run.call_args[0][0], ["/opt/bin/uv", "--version"])
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter.subprocess.run", return_value=_completed())
+    def test_run_command_leaves_uncached_commands_alone(self, mock_run, mock_log):
+        """Test that commands without a cached path are executed as given."""
+        _run_command(["git", "status"], "test_git_status", work_dir=Path.cwd())
+
+        self.assertEqual(mock_run.call_args[0][0], ["git", "status"])
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter.subprocess.run", return_value=_completed())
+    def test_logged_command_is_shell_quoted(self, mock_run, mock_log):
+        """Test that arguments with spaces are quoted in the logged command string."""
+        _run_command(["uv", "add", "my pkg"], "test_quoting", work_dir=Path.cwd())
+
+        success_details = [c.kwargs["details"] for c in mock_log.call_args_list if c.kwargs.get("details")]
+        self.assertEqual(success_details[0]["command"], "uv add 'my pkg'")
+        self.assertEqual(success_details[0]["command_list"], ["uv", "add", "my pkg"])
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter.subprocess.run", side_effect=subprocess.CalledProcessError(2, ["uv", "add"], "", "boom"))
+    def test_run_command_reraises_failures(self, mock_run, mock_log):
+        """Test that failures still propagate as CalledProcessError."""
+        with self.assertRaises(subprocess.CalledProcessError):
+            _run_command(["uv", "add", "nope"], "test_uv_add", work_dir=Path.cwd())
+
+
+class TestPipreqsOutputParsing(unittest.TestCase):
+    """Test parsing of the requirements printed by `pipreqs --print`."""
+
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._run_command")
+    def test_comments_and_blank_lines_are_skipped(self, mock_run, mock_log):
+        """Test that each requirement line is kept verbatim and keyed by its canonical name."""
+        mock_run.return_value = ("# generated\n\n  numpy==1.26.4  \r\nPyYAML==6.0.1\nrequests[socks]>=2\n", "")
+
+        packages = _get_packages_from_pipreqs(Path.cwd(), None, dry_run=False)
+
+        self.assertEqual(packages, {
+            ("numpy", "numpy==1.26.4"),
+            ("pyyaml", "PyYAML==6.0.1"),
+            ("requests", "requests[socks]>=2"),
+        })
+
+
+class TestRuffOutputParsing(unittest.TestCase):
+    """Test parsing of the diagnostics printed by `ruff check --output-format=concise`."""
+
+    @patch("pyuvstarter._save_cache")
+    @patch("pyuvstarter._load_cache", return_value={})
+    @patch("pyuvstarter._detect_project_structure", return_value={"is_package": False})
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._run_command")
+    def test_unused_imports_are_reported(self, mock_run, mock_log, mock_structure, mock_load, mock_save):
+        """Test that F401 lines are collected with project-relative paths and summary lines are ignored."""
+        mock_run.return_value = (
+            "main.py:1:8: F401 [*] `os` imported but unused\r\n"
+            "pkg/util.py:3:20: F401 `sys` imported but unused\n"
+            f"{Path.cwd() / 'tools' / 'cli.py'}:2:1: F401 `re` imported but unused\n"
+            "Found 3 errors.\n",
+            "",
+        )
+        results = []
+
+        _run_ruff_unused_import_check(Path.cwd(), results, dry_run=True)
+
+        self.assertEqual(results, [("ruff_import_analysis", "COMPLETED_WITH_WARNINGS")])
+        warning = next(c for c in mock_log.call_args_list if c.args[1] == "WARN")
+        self.assertEqual(warning.kwargs["details"]["unused_imports_details"], [
+            ("main.py", 1, "`os` imported but unused"),
+            ("pkg/util.py", 3, "`sys` imported but unused"),
+            ("tools/cli.py", 2, "`re` imported but unused"),
+        ])
+
+    @patch("pyuvstarter._detect_project_structure", return_value={"is_package": False})
+    @patch("pyuvstarter._log_action")
+    @patch("pyuvstarter._run_command")
+    def test_background_output_is_used(self, mock_run, mock_log, mock_structure):
+        """Test that output from a check started earlier is used instead of running ruff again."""
+        ruff_output = concurrent.futures.Future()
+        ruff_output.set_result("main.py:1:8: F401 [*] `os` imported but unused\n")
+        results = []
+
+        _run_ruff_unused_import_check(Path.cwd(), results, dry_run=True, ruff_output=ruff_output)
+
+        mock_run.assert_not_called()
+        self.assertEqual(results, [("ruff_import_analysis", "COMPLETED_WITH_WARNINGS")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Unit tests for the VS Code configuration helpers.
+
+These tests write into a temporary project directory and do not run any external tools.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Import the functions we're testing
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from pyuvstarter import _configure_vscode_settings, _ensure_vscode_launch_json
+
+
+class TestVSCodeFilesAreStable(unittest.TestCase):
+    """Test that rerunning the VS Code setup leaves up-to-date files untouched."""
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self.python = self.root / ".venv" / "bin" / "python"
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def _mtime_after_second_run(self, configure, file_name: str) -> tuple:
+        """Runs `configure` twice, zeroing the file's mtime in between, and returns (mtime_ns, data)."""
+        configure(self.root, self.python, dry_run=False)
+        path = self.root / ".vscode" / file_name
+        os.utime(path, ns=(0, 0))
+        configure(self.root, self.python, dry_run=False)
+        return path.stat().st_mtime_ns, json.loads(path.read_text(encoding="utf-8"))
+
+    @patch("pyuvstarter._log_action")
+    def test_unchanged_settings_are_not_rewritten(self, mock_log):
+        """Test that settings.json is only written when the interpreter path changes."""
+        mtime_ns, data = self._mtime_after_second_run(_configure_vscode_settings, "settings.json")
+
+        self.assertEqual(mtime_ns, 0)
+        self.assertEqual(data["python.defaultInterpreterPath"], "${workspaceFolder}/.venv/bin/python")
+
+    @patch("pyuvstarter._log_action")
+    def test_launch_config_is_added_once(self, mock_log):
+        """Test that a second run recognises the launch config written by the first."""
+        mtime_ns, data = self._mtime_after_second_run(_ensure_vscode_launch_json, "launch.json")
+
+        self.assertEqual(mtime_ns, 0)
+        self.assertEqual(len(data["configurations"]), 1)
+
+    @patch("pyuvstarter._log_action")
+    def test_writes_leave_no_temporary_files(self, mock_log):
+        """Test that the atomic writes rename their temporary files into place."""
+        _configure_vscode_settings(self.root, self.python, dry_run=False)
+        _ensure_vscode_launch_json(self.root, self.python, dry_run=False)
+
+        self.assertEqual(sorted(p.name for p in (self.root / ".vscode").iterdir()), ["launch.json", "settings.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()